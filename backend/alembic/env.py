@@ -16,6 +16,9 @@ from src.modules.job_positions.infrastructure.job_position import JobPositionMod
 from src.modules.authors.infrastructure.author import AuthorModel
 from src.modules.scopus_accounts.infrastructure.scopus_account import ScopusAccountModel
 from src.modules.publications.infrastructure.publication_cache_model import PublicationCacheModel
+from src.modules.publications.infrastructure.publication_cache_refresh_model import PublicationCacheRefreshModel
+from src.modules.publications.infrastructure.author_subject_area_cache_model import AuthorSubjectAreaCacheModel
+from src.modules.publications.infrastructure.scopus_api_key_quota_model import ScopusApiKeyQuotaModel
 from src.modules.certificates.infrastructure.report_metadata_model import ReportMetadataModel
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,7 @@
+"""
+Benchmarks de rendimiento del backend.
+
+No forman parte de las pruebas: se ejecutan a mano desde `backend/`, p. ej.
+`python -m benchmarks.bench_sjr_load data/df_sjr_24_04_2025.csv`. Sin CSV,
+los de SJR generan uno sintético (ver `tests/sjr_data.py`).
+"""
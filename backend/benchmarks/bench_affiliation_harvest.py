@@ -0,0 +1,140 @@
+"""
+Actualización de la caché de toda la institución: una búsqueda por cuenta vs
+una sola búsqueda AF-ID.
+
+Contra el servidor local de `scopus_standin` (400 cuentas de la EPN y 6.000
+publicaciones, muchas con varios coautores de la institución), compara la
+actualización completa de cada cuenta con `AU-ID(...)` (8 a la vez) con la
+cosecha `PublicationService.harvest_affiliation`, ambas con el limitador de
+tasa de producción. Informa llamadas a la API, tiempo total, publicaciones
+guardadas y escrituras en la caché.
+
+La caché y las cuentas son implementaciones en memoria (sólo los métodos que
+usa el servicio): el benchmark mide el tráfico con Scopus, no la BD.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_affiliation_harvest [--latency S] [--rate N]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from benchmarks.common import scopus_standin
+from src.modules.publications.application.publication_service import PublicationService
+from src.modules.publications.domain.publication import Publication
+from src.modules.publications.domain.publication_cache_repository import CacheRefreshState
+from src.modules.publications.infrastructure.scopus_publication_repository import ScopusPublicationRepository
+from src.modules.publications.infrastructure.sjr_file_repository import SJRFileRepository
+from src.modules.scopus_accounts.domain.scopus_account import ScopusAccount
+from src.shared.http_client import create_http_client
+from src.shared.rate_limiter import AdaptiveRateLimiter
+
+N_ACCOUNTS = 400
+
+
+class _MemoryCache:
+    """Caché de publicaciones en memoria: un registro por publicación, como la tabla."""
+
+    def __init__(self):
+        self.rows: Dict[str, Tuple[UUID, Publication]] = {}
+        self.states: Dict[UUID, CacheRefreshState] = {}
+        self.writes = 0
+
+    async def save_publications(self, publications: List[Publication], scopus_account_id: UUID) -> int:
+        return await self.save_publications_by_account({scopus_account_id: publications})
+
+    async def save_publications_by_account(self, publications_by_account: Dict[UUID, List[Publication]]) -> int:
+        self.writes += 1
+        saved = 0
+        for account_id, publications in publications_by_account.items():
+            for publication in publications:
+                owner = self.rows.get(publication.scopus_id, (account_id,))[0]
+                if owner == account_id:
+                    self.rows[publication.scopus_id] = (account_id, publication)
+                    saved += 1
+        return saved
+
+    async def get_owner_accounts(self, scopus_ids: List[str]) -> Dict[str, UUID]:
+        return {scopus_id: self.rows[scopus_id][0] for scopus_id in scopus_ids if scopus_id in self.rows}
+
+    async def get_by_scopus_account(self, scopus_account_id: UUID) -> List[Publication]:
+        return [publication for owner, publication in self.rows.values() if owner == scopus_account_id]
+
+    async def delete_missing(self, scopus_account_id: UUID, keep_scopus_ids: List[str]) -> int:
+        return 0
+
+    async def get_refresh_state(self, scopus_account_id: UUID) -> Optional[CacheRefreshState]:
+        return self.states.get(scopus_account_id)
+
+    async def mark_refreshed(self, scopus_account_id: UUID, refreshed_at: datetime, full: bool) -> None:
+        state = self.states.get(scopus_account_id)
+        full_refreshed_at = refreshed_at if full or state is None else state.full_refreshed_at
+        self.states[scopus_account_id] = CacheRefreshState(scopus_account_id, refreshed_at, full_refreshed_at)
+
+    async def mark_harvested(self, scopus_account_ids: List[UUID], harvested_at: datetime) -> None:
+        for account_id in scopus_account_ids:
+            if account_id in self.states:
+                self.states[account_id] = replace(self.states[account_id], harvested_at=harvested_at)
+
+
+class _MemoryAccounts:
+    def __init__(self, accounts: List[ScopusAccount]):
+        self._accounts = accounts
+
+    async def get_all(self) -> List[ScopusAccount]:
+        return self._accounts
+
+
+async def _run(base_url: str, mode: str, rate: float) -> str:
+    accounts = [ScopusAccount(uuid.uuid4(), str(57000000000 + i), uuid.uuid4()) for i in range(N_ACCOUNTS)]
+    client = create_http_client()
+    try:
+        repository = ScopusPublicationRepository(
+            "benchmark", http_client=client, rate_limiter=AdaptiveRateLimiter(max_rate=rate, burst=int(rate))
+        )
+        repository._base_url = base_url
+        cache = _MemoryCache()
+        # Sin dataset SJR: el enriquecimiento no encuentra revistas
+        service = PublicationService(repository, cache, SJRFileRepository("", autoload=False), _MemoryAccounts(accounts))
+
+        await client.get(f"{base_url}/stats")
+        started = time.perf_counter()
+        if mode == "por cuenta":
+            semaphore = asyncio.Semaphore(8)
+
+            async def refresh(account: ScopusAccount) -> None:
+                async with semaphore:
+                    await service._refresh_cache(account, full=True)
+
+            await asyncio.gather(*(refresh(account) for account in accounts))
+        else:
+            await service.harvest_affiliation()
+        elapsed = time.perf_counter() - started
+        calls = (await client.get(f"{base_url}/stats")).json()["calls"]
+    finally:
+        await client.aclose()
+    return f"{mode:11} {calls:9} {elapsed:10.1f} {len(cache.rows):13} {cache.writes:10}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.15, help="Segundos por respuesta")
+    parser.add_argument(
+        "--rate", type=float, default=9.0, help="Peticiones/s del limitador (SCOPUS_MAX_REQUESTS_PER_SECOND)"
+    )
+    parser.add_argument("--port", type=int, default=8953)
+    args = parser.parse_args()
+
+    with scopus_standin(args.port, STANDIN_DATASET="affiliation", STANDIN_LATENCY=str(args.latency)) as base_url:
+        print(f"{'':11} {'llamadas':>9} {'total (s)':>10} {'publicaciones':>13} {'escrituras':>10}")
+        for mode in ("por cuenta", "AF-ID"):
+            print(asyncio.run(_run(base_url, mode, args.rate)))
+
+
+if __name__ == "__main__":
+    main()
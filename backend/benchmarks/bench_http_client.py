@@ -0,0 +1,111 @@
+"""
+Latencia por llamada a Scopus: cliente HTTP por llamada vs cliente compartido con pool.
+
+Consulta las áreas temáticas de un autor (`ScopusAuthorSubjectAreaRepository`)
+contra el servidor local de `scopus_standin`, primero abriendo un cliente por
+llamada (comportamiento anterior, sin cliente compartido) y luego con el
+cliente del proceso (`create_http_client`), en serie y en ráfaga concurrente.
+
+Con `--certfile/--keyfile` el servidor usa HTTPS y cada cliente nuevo paga
+también el handshake TLS. Sirve un certificado autofirmado para 'localhost':
+    openssl req -x509 -newkey rsa:2048 -nodes -days 1 -subj /CN=localhost \
+        -addext subjectAltName=DNS:localhost -keyout key.pem -out cert.pem
+
+Uso (desde backend/):
+    python -m benchmarks.bench_http_client [--calls N] [--certfile C --keyfile K] [--http2]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import Optional
+
+import certifi
+from httpx import AsyncClient
+
+from benchmarks.common import scopus_standin
+from src.modules.publications.infrastructure.scopus_author_subject_area_repository import (
+    ScopusAuthorSubjectAreaRepository,
+)
+from src.shared.http_client import create_http_client
+
+EXPECTED_AREAS = ["Computer Science", "Engineering"]
+
+
+def _repository(base_url: str, client: Optional[AsyncClient]) -> ScopusAuthorSubjectAreaRepository:
+    repository = ScopusAuthorSubjectAreaRepository("benchmark", http_client=client)
+    repository._base_url = base_url
+    return repository
+
+
+async def _sequential(base_url: str, client: Optional[AsyncClient], calls: int) -> str:
+    repository = _repository(base_url, client)
+    for _ in range(10):
+        await repository.get_subject_areas_by_scopus_id("1")
+    latencies = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        areas = await repository.get_subject_areas_by_scopus_id("1")
+        latencies.append((time.perf_counter() - started) * 1e3)
+    assert areas == EXPECTED_AREAS, areas
+    latencies.sort()
+    return (
+        f"media {statistics.mean(latencies):6.2f} ms  p50 {latencies[len(latencies) // 2]:6.2f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99)]:6.2f} ms"
+    )
+
+
+async def _burst(base_url: str, client: Optional[AsyncClient], calls: int) -> str:
+    repository = _repository(base_url, client)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(repository.get_subject_areas_by_scopus_id("1") for _ in range(calls)))
+    assert all(areas == EXPECTED_AREAS for areas in results)
+    return f"{calls} llamadas a la vez: {(time.perf_counter() - started) * 1e3:6.0f} ms"
+
+
+async def _run(base_url: str, args: argparse.Namespace) -> None:
+    shared = create_http_client(
+        max_connections=args.max_connections,
+        max_keepalive_connections=args.max_connections,
+        http2=args.http2
+    )
+    try:
+        print(f"{'cliente por llamada':22} {await _sequential(base_url, None, args.calls)}")
+        print(f"{'cliente compartido':22} {await _sequential(base_url, shared, args.calls)}")
+        print(f"{'cliente por llamada':22} {await _burst(base_url, None, args.calls)}")
+        print(f"{'cliente compartido':22} {await _burst(base_url, shared, args.calls)}")
+    finally:
+        await shared.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--port", type=int, default=8951)
+    parser.add_argument("--max-connections", type=int, default=20)
+    parser.add_argument("--http2", action="store_true", help="HTTP/2 en el cliente compartido (requiere 'h2')")
+    parser.add_argument("--certfile", help="Certificado del servidor local (activa HTTPS)")
+    parser.add_argument("--keyfile", help="Clave privada del certificado")
+    args = parser.parse_args()
+
+    bundle = None
+    if args.certfile:
+        # Los clientes (también los temporales de cada llamada) confían en el certificado
+        # local; se agrega a las CA de certifi para que crear un cliente cueste lo mismo
+        bundle = tempfile.NamedTemporaryFile("w", suffix=".pem", delete=False)
+        with bundle, open(certifi.where()) as cas, open(args.certfile) as local:
+            bundle.write(cas.read() + "\n" + local.read())
+        os.environ["SSL_CERT_FILE"] = bundle.name
+    try:
+        with scopus_standin(args.port, args.certfile, args.keyfile, STANDIN_LATENCY="0") as base_url:
+            print(f"Servidor local: {base_url}")
+            asyncio.run(_run(base_url, args))
+    finally:
+        if bundle is not None:
+            os.unlink(bundle.name)
+
+
+if __name__ == "__main__":
+    main()
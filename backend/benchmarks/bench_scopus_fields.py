@@ -0,0 +1,109 @@
+"""
+Búsqueda de Scopus con `view=COMPLETE` vs proyección de campos (`field=`).
+
+Descarga todas las publicaciones de un autor grande desde el servidor local de
+`scopus_standin` (entradas completas: resumen, palabras clave y listas largas
+de autores) con y sin `SCOPUS_SEARCH_FIELD_PROJECTION`, e informa los bytes
+recibidos, el tiempo de decodificar el JSON y la latencia de extremo a
+extremo con un enlace de ancho de banda limitado. Comprueba además que las
+publicaciones transformadas (incluida la filiación EPN) son idénticas.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_scopus_fields [--publications N] [--bandwidth BYTES_S] [--latency S]
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.common import scopus_standin
+from src.modules.publications.application.publication_service import PublicationService
+from src.modules.publications.infrastructure.scopus_publication_repository import (
+    PAGE_SIZE,
+    SEARCH_FIELDS,
+    ScopusPublicationRepository,
+)
+from src.shared.http_client import create_http_client
+
+AUTHOR_ID = "57000000001"
+
+
+async def _page_bodies(client: httpx.AsyncClient, base_url: str, total: int, projected: bool) -> List[bytes]:
+    params = {"query": f"AU-ID({AUTHOR_ID})", "count": PAGE_SIZE, "view": "COMPLETE"}
+    if projected:
+        params["field"] = ",".join(SEARCH_FIELDS)
+    return [
+        (await client.get(f"{base_url}/content/search/scopus", params={**params, "start": start})).content
+        for start in range(0, total, PAGE_SIZE)
+    ]
+
+
+async def _measure(base_url: str, total: int, projected: bool) -> Dict:
+    client = create_http_client()
+    try:
+        bodies = await _page_bodies(client, base_url, total, projected)
+        started = time.perf_counter()
+        for body in bodies:
+            json.loads(body)
+        parse_seconds = time.perf_counter() - started
+
+        repository = ScopusPublicationRepository("benchmark", http_client=client, field_projection=projected)
+        repository._base_url = base_url
+        await client.get(f"{base_url}/stats")
+        started = time.perf_counter()
+        raws = await repository.get_publications_by_scopus_id(AUTHOR_ID)
+        elapsed = time.perf_counter() - started
+        assert repository._projection_works is not False, "La proyección se desactivó durante la prueba"
+        stats = (await client.get(f"{base_url}/stats")).json()
+    finally:
+        await client.aclose()
+
+    service = PublicationService.__new__(PublicationService)
+    publications = [service._transform_raw_publication(raw, AUTHOR_ID) for raw in raws]
+    return {
+        "bytes": stats["bytes"],
+        "calls": stats["calls"],
+        "parse_seconds": parse_seconds,
+        "seconds": elapsed,
+        "publications": publications,
+    }
+
+
+async def _run(base_url: str, total: int) -> None:
+    complete = await _measure(base_url, total, projected=False)
+    projected = await _measure(base_url, total, projected=True)
+
+    print(f"{'':14} {'MB recibidos':>12} {'llamadas':>9} {'JSON (ms)':>10} {'total (s)':>10}")
+    for name, result in (("view=COMPLETE", complete), ("field=", projected)):
+        print(
+            f"{name:14} {result['bytes'] / 2**20:12.2f} {result['calls']:9} "
+            f"{result['parse_seconds'] * 1e3:10.1f} {result['seconds']:10.2f}"
+        )
+    identical = complete["publications"] == projected["publications"]
+    epn = sum(1 for publication in projected["publications"] if publication.is_epn_affiliated)
+    print(f"Publicaciones idénticas: {'sí' if identical else 'NO'} ({len(projected['publications'])}, {epn} con filiación EPN)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--publications", type=int, default=1200)
+    parser.add_argument("--bandwidth", type=float, default=1_250_000, help="Bytes/s del enlace (10 Mbit/s)")
+    parser.add_argument("--latency", type=float, default=0.15, help="Segundos por respuesta")
+    parser.add_argument("--port", type=int, default=8952)
+    args = parser.parse_args()
+
+    env = {
+        "STANDIN_DATASET": "author",
+        "STANDIN_TOTAL": str(args.publications),
+        "STANDIN_LATENCY": str(args.latency),
+        "STANDIN_BANDWIDTH": str(args.bandwidth),
+    }
+    with scopus_standin(args.port, **env) as base_url:
+        asyncio.run(_run(base_url, args.publications))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Enriquecimiento SJR de un autor: consulta por publicación vs por lotes.
+
+Simula un autor con muchas publicaciones repartidas en pocas revistas (con
+frecuencias tipo Zipf y parte sin Sourceid) y compara el enriquecimiento
+anterior, una consulta `get_journal_data` por publicación, con
+`enrich_with_sjr`, que resuelve todas con `get_journal_data_many`.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_sjr_batch [CSV] [--journals N] [--publications N]
+"""
+import argparse
+import copy
+import random
+import time
+from typing import Callable, List
+
+from benchmarks.common import add_sjr_csv_arguments, resolve_sjr_csv
+from src.modules.publications.application.sjr_enrichment import enrich_with_sjr
+from src.modules.publications.domain.publication_cache_repository import CachedSJRFields
+from src.modules.publications.infrastructure import sjr_file_repository
+from src.modules.publications.infrastructure.sjr_file_repository import SJRFileRepository
+
+
+def _author_publications(repository: SJRFileRepository, count: int, journals: int = 180) -> List[CachedSJRFields]:
+    indexes = repository.export_indexes()
+    rng = random.Random(1)
+    source_ids = rng.sample(sorted(indexes['sourceid_titles']), journals)
+    weights = [1 / (rank + 1) for rank in range(journals)]
+    # Años del dataset y alguno posterior (se limita al último disponible)
+    years = list(indexes['years']) + [repository.get_max_available_year() + 1]
+    publications = []
+    for i in range(count):
+        source_id = rng.choices(source_ids, weights)[0]
+        normalized_title = indexes['sourceid_titles'][source_id]
+        publications.append(CachedSJRFields(
+            scopus_id=str(i),
+            source_id=source_id if rng.random() > 0.2 else None,
+            year=rng.choice(years),
+            source_title=indexes['journal_titles'].get(normalized_title, normalized_title)
+        ))
+    return publications
+
+
+def _per_publication(repository: SJRFileRepository, items: List[CachedSJRFields]) -> List[CachedSJRFields]:
+    """Enriquecimiento anterior: una consulta por publicación."""
+    for item in items:
+        item.subject_areas, item.categories_with_quartiles, item.sjr_year_used = repository.get_journal_data(
+            item.source_id, item.year, item.source_title
+        )
+        item.sjr_edition = repository.get_edition_for_year(item.year)
+    return items
+
+
+def _best_ms(enrich: Callable[[List[CachedSJRFields]], object], publications: List[CachedSJRFields], runs: int,
+             cold: bool = False) -> float:
+    timings = []
+    for _ in range(runs):
+        items = copy.deepcopy(publications)
+        if cold:
+            sjr_file_repository._normalize_journal_name.cache_clear()
+        started = time.perf_counter()
+        enrich(items)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_sjr_csv_arguments(parser)
+    parser.add_argument("--publications", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    repository = SJRFileRepository(resolve_sjr_csv(args))
+    publications = _author_publications(repository, args.publications)
+
+    def fields(items):
+        return [(i.subject_areas, i.categories_with_quartiles, i.sjr_year_used, i.sjr_edition) for i in items]
+
+    by_publication = _per_publication(repository, copy.deepcopy(publications))
+    by_batch = enrich_with_sjr(repository, copy.deepcopy(publications))
+    assert fields(by_publication) == fields(by_batch), "Los dos enriquecimientos difieren"
+
+    def per_publication(items):
+        return _per_publication(repository, items)
+
+    def batch(items):
+        return enrich_with_sjr(repository, items)
+
+    print(f"{args.publications} publicaciones, {sum(1 for i in by_batch if i.categories_with_quartiles)} con categorías")
+    print(f"{'':28} {'por publicación':>16} {'por lotes':>10}")
+    print(f"{'nombres ya normalizados (ms)':28} {_best_ms(per_publication, publications, args.runs):16.2f} "
+          f"{_best_ms(batch, publications, args.runs):10.2f}")
+    print(f"{'caché de nombres vacía (ms)':28} {_best_ms(per_publication, publications, 5, cold=True):16.2f} "
+          f"{_best_ms(batch, publications, 5, cold=True):10.2f}")
+
+
+if __name__ == "__main__":
+    main()
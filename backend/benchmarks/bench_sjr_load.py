@@ -0,0 +1,102 @@
+"""
+Tiempo de carga del dataset SJR con cada lector.
+
+Compara el lector original fila por fila (`iterrows`), el columnar con pandas,
+el lector en streaming y la lectura del snapshot binario. Cada carga se mide
+en un intérprete nuevo, para que no comparta cachés con las demás: tiempo de
+importación y de carga, RSS máximo del proceso y si llegó a importar pandas
+(Linux: `/proc/self/status`).
+
+Uso (desde backend/):
+    python -m benchmarks.bench_sjr_load [CSV] [--journals N] [--repeat N]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import add_sjr_csv_arguments, resolve_sjr_csv
+
+LOADERS = ("iterrows", "pandas", "stream", "snapshot")
+
+
+def _peak_rss_mb() -> float:
+    # VmHWM y no ru_maxrss: éste conserva el máximo del proceso padre tras exec
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _load(loader: str, csv_path: str) -> dict:
+    """Carga el CSV con un lector (en el proceso actual) y devuelve las mediciones."""
+    imported = time.perf_counter()
+    from src.modules.publications.infrastructure.sjr_file_repository import SJRFileRepository
+
+    if loader == "iterrows":
+        from tests.sjr_data import legacy_sjr_caches
+        import pandas  # noqa: F401  (su importación cuenta como parte del lector)
+        started = time.perf_counter()
+        legacy_sjr_caches(csv_path, SJRFileRepository(csv_path, autoload=False).normalize_journal_name)
+    else:
+        repository = SJRFileRepository(
+            csv_path,
+            autoload=False,
+            use_snapshot=loader == "snapshot",
+            csv_parser="stream" if loader == "stream" else "pandas"
+        )
+        started = time.perf_counter()
+        assert repository.load()
+    finished = time.perf_counter()
+    return {
+        # El lector con pandas lo importa al cargar: se suma a la carga
+        "import_seconds": started - imported,
+        "load_seconds": finished - started,
+        "peak_rss_mb": _peak_rss_mb(),
+        "pandas_imported": "pandas" in sys.modules,
+    }
+
+
+def _measure(loader: str, csv_path: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_sjr_load", "--run", loader, csv_path],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_sjr_csv_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=3, help="Cargas por lector (se informa la mediana)")
+    parser.add_argument("--loaders", nargs="+", choices=LOADERS, default=list(LOADERS))
+    parser.add_argument("--run", choices=LOADERS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(_load(args.run, args.csv_path)))
+        return
+
+    csv_path = resolve_sjr_csv(args)
+    if "snapshot" in args.loaders:
+        # El snapshot se escribe (junto al CSV) la primera vez que se procesa
+        from src.modules.publications.infrastructure.sjr_file_repository import SJRFileRepository
+        SJRFileRepository(csv_path, use_snapshot=True)
+
+    print(f"{'lector':10} {'import (s)':>10} {'carga (s)':>10} {'mín (s)':>10} {'RSS máx (MB)':>13} {'pandas':>7}")
+    for loader in args.loaders:
+        runs = [_measure(loader, csv_path) for _ in range(args.repeat)]
+        loads = [run["load_seconds"] for run in runs]
+        print(
+            f"{loader:10} {statistics.median(run['import_seconds'] for run in runs):10.2f} "
+            f"{statistics.median(loads):10.2f} {min(loads):10.2f} "
+            f"{statistics.median(run['peak_rss_mb'] for run in runs):13.0f} "
+            f"{'sí' if runs[0]['pandas_imported'] else 'no':>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
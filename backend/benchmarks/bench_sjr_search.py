@@ -0,0 +1,83 @@
+"""
+Latencia de la búsqueda de revistas (`GET /sjr/journals?q=...`).
+
+Mide `search_journals` (lo que atiende el endpoint) con el backend en memoria
+y con el índice mapeable, sobre un CSV sintético grande con muchos años por
+revista: mediana, p99 y máximo por consulta, y la primera consulta de cada
+backend por separado (arma el directorio de revistas).
+
+Uso (desde backend/):
+    python -m benchmarks.bench_sjr_search [CSV] [--journals N] [--years N] [--limit N]
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from benchmarks.common import add_sjr_csv_arguments
+from tests.sjr_data import TITLE_WORDS, write_sjr_csv
+
+
+def _queries(count: int, seed: int = 3) -> List[str]:
+    """Prefijos de palabras de los títulos sintéticos, de una y dos palabras."""
+    rng = random.Random(seed)
+    words = [word for word in TITLE_WORDS if len(word) > 2]
+    queries = []
+    for _ in range(count):
+        word = rng.choice(words)
+        query = word[:rng.randint(2, len(word))]
+        if rng.random() < 0.3:
+            query = f"{word} {rng.choice(words)[:2]}"
+        queries.append(query)
+    return queries
+
+
+def _measure(repository, queries: List[str], limit: int) -> str:
+    started = time.perf_counter()
+    repository.search_journals(queries[0], limit=limit)
+    first_ms = (time.perf_counter() - started) * 1e3
+
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        repository.search_journals(query, limit=limit)
+        latencies.append((time.perf_counter() - started) * 1e3)
+    latencies.sort()
+    return (
+        f"{first_ms:11.1f} {statistics.median(latencies):9.2f} "
+        f"{latencies[int(len(latencies) * 0.99)]:9.2f} {latencies[-1]:9.2f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_sjr_csv_arguments(parser)
+    parser.set_defaults(journals=30000)
+    parser.add_argument("--years", type=int, default=26, help="Años del CSV sintético")
+    parser.add_argument("--limit", type=int, default=50, help="Resultados por consulta")
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    csv_path = args.csv_path
+    if not csv_path:
+        directory = Path(tempfile.mkdtemp(prefix="sjr_bench_"))
+        csv_path = str(write_sjr_csv(
+            directory / "sjr.csv", n_journals=args.journals, years=range(2024 - args.years, 2024)
+        ))
+        print(f"CSV sintético: {csv_path} ({args.journals} revistas, {args.years} años)")
+
+    from src.modules.publications.infrastructure.sjr_file_repository import SJRFileRepository
+    from src.modules.publications.infrastructure.sjr_mmap_repository import SJRMmapRepository
+
+    queries = _queries(args.queries)
+    print(f"{'backend':8} {'1ª (ms)':>11} {'p50 (ms)':>9} {'p99 (ms)':>9} {'máx (ms)':>9}")
+    for name, repository_class in (("memory", SJRFileRepository), ("mmap", SJRMmapRepository)):
+        repository = repository_class(csv_path)
+        print(f"{name:8} {_measure(repository, queries, args.limit)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Memoria por worker y latencia de consulta: índice SJR en memoria vs mapeado.
+
+Levanta varios procesos, como los workers de uvicorn/gunicorn, que cargan el
+mismo dataset con `SJRFileRepository` (diccionarios en el heap de cada proceso)
+o con `SJRMmapRepository` (páginas compartidas del archivo `.mmap`). Informa,
+por worker, el RSS y el PSS que añade la carga (el PSS reparte las páginas
+compartidas entre los procesos que las usan) y la latencia de `get_journal_data`.
+
+Requiere Linux (`/proc/self/smaps_rollup`).
+
+Uso (desde backend/):
+    python -m benchmarks.bench_sjr_workers [CSV] [--journals N] [--workers N] [--lookups N]
+"""
+import argparse
+import multiprocessing
+import random
+import statistics
+import time
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.common import add_sjr_csv_arguments, resolve_sjr_csv
+
+Lookup = Tuple[Optional[str], int, str]
+
+
+def _memory_mb() -> Dict[str, float]:
+    memory = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            key, *values = line.split()
+            if key in ("Rss:", "Pss:"):
+                memory[key[:-1]] = int(values[0]) / 1024
+    return memory
+
+
+def _worker(kind: str, csv_path: str, lookups: List[Lookup], barrier, results) -> None:
+    # Las dependencias comunes se importan antes de medir, en ambos casos
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+    from src.modules.publications.infrastructure.sjr_file_repository import SJRFileRepository
+    from src.modules.publications.infrastructure.sjr_mmap_repository import SJRMmapRepository
+
+    before = _memory_mb()
+    repository_class = SJRMmapRepository if kind == "mmap" else SJRFileRepository
+    repository = repository_class(csv_path)
+    assert repository.is_ready
+
+    latencies = []
+    for source_id, year, title in lookups:
+        started = time.perf_counter()
+        repository.get_journal_data(source_id, year, title)
+        latencies.append(time.perf_counter() - started)
+
+    # Todos los workers vivos a la vez: el PSS reparte las páginas compartidas
+    barrier.wait()
+    after = _memory_mb()
+    barrier.wait()
+    results.put((
+        after["Rss"] - before["Rss"],
+        after["Pss"] - before["Pss"],
+        statistics.median(latencies) * 1e6,
+        statistics.mean(latencies) * 1e6,
+    ))
+
+
+def _sample_lookups(csv_path: str, count: int) -> List[Lookup]:
+    """Consultas mixtas: por Sourceid, sólo por título y sin resultado."""
+    from src.modules.publications.infrastructure.sjr_file_repository import SJRFileRepository
+
+    # Construye además el snapshot y el índice mapeable que cargan los workers
+    from src.modules.publications.infrastructure.sjr_mmap_repository import SJRMmapRepository
+    assert SJRMmapRepository(csv_path).is_ready
+
+    repository = SJRFileRepository(csv_path)
+    by_sourceid = [key for key, _ in repository.iter_entries('sourceid')]
+    by_name = [key for key, _ in repository.iter_entries('name')]
+    rng = random.Random(0)
+    lookups = []
+    for i in range(count):
+        if i % 10 < 7:
+            source_id, year = rng.choice(by_sourceid)
+            lookups.append((source_id, year, ""))
+        elif i % 10 < 9:
+            title, year = rng.choice(by_name)
+            lookups.append((None, year, title))
+        else:
+            lookups.append(("0", rng.choice(by_sourceid)[1], "sin coincidencia"))
+    return lookups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_sjr_csv_arguments(parser)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--lookups", type=int, default=20000, help="Consultas por worker")
+    args = parser.parse_args()
+
+    csv_path = resolve_sjr_csv(args)
+    lookups = _sample_lookups(csv_path, args.lookups)
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'índice':8} {'RSS/worker (MB)':>16} {'PSS/worker (MB)':>16} {'p50 (µs)':>9} {'media (µs)':>11}")
+    for kind in ("memory", "mmap"):
+        barrier = context.Barrier(args.workers)
+        results = context.Queue()
+        workers = [
+            context.Process(target=_worker, args=(kind, csv_path, lookups, barrier, results))
+            for _ in range(args.workers)
+        ]
+        for worker in workers:
+            worker.start()
+        measured = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+        rss, pss, p50, mean = (statistics.mean(values) for values in zip(*measured))
+        print(f"{kind:8} {rss:16.1f} {pss:16.1f} {p50:9.1f} {mean:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Utilidades compartidas por los benchmarks."""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+import httpx
+
+from tests.sjr_data import write_sjr_csv
+
+
+def add_sjr_csv_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("csv_path", nargs="?", help="CSV de SJR (por defecto, uno sintético)")
+    parser.add_argument(
+        "--journals", type=int, default=20000,
+        help="Revistas del CSV sintético (unas 7 filas por revista)"
+    )
+
+
+def resolve_sjr_csv(args: argparse.Namespace) -> str:
+    """CSV indicado, o uno sintético nuevo en un directorio temporal."""
+    if args.csv_path:
+        return args.csv_path
+    directory = Path(tempfile.mkdtemp(prefix="sjr_bench_"))
+    path = write_sjr_csv(directory / "sjr.csv", n_journals=args.journals)
+    print(f"CSV sintético: {path} ({path.stat().st_size / 2**20:.1f} MB)")
+    return str(path)
+
+
+@contextmanager
+def scopus_standin(
+    port: int,
+    certfile: Optional[str] = None,
+    keyfile: Optional[str] = None,
+    **env: str
+) -> Iterator[str]:
+    """
+    Levanta `benchmarks.scopus_standin` con uvicorn en un proceso aparte (para
+    que no compita por el event loop del cliente medido).
+
+    Args:
+        port: Puerto local
+        certfile / keyfile: Certificado (para 'localhost') para servir por HTTPS
+        env: Configuración del servidor (`STANDIN_*`)
+
+    Yields:
+        URL base del servidor
+    """
+    command = [
+        sys.executable, "-m", "uvicorn", "benchmarks.scopus_standin:app",
+        "--port", str(port), "--log-level", "warning", "--no-access-log",
+    ]
+    base_url = f"http://127.0.0.1:{port}"
+    if certfile:
+        command += ["--ssl-certfile", certfile, "--ssl-keyfile", keyfile]
+        # El certificado local se emite para 'localhost'
+        base_url = f"https://localhost:{port}"
+    server = subprocess.Popen(command, env={**os.environ, **env})
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                httpx.get(f"{base_url}/stats", verify=False)
+                break
+            except httpx.TransportError:
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("No se pudo levantar el servidor local de Scopus")
+                time.sleep(0.2)
+        yield base_url
+    finally:
+        server.terminate()
+        server.wait()
@@ -0,0 +1,183 @@
+"""
+Servidor local que imita las respuestas de la API de Scopus usadas por los benchmarks.
+
+Aplicación ASGI mínima (se levanta con uvicorn, ver `common.scopus_standin`):
+
+- `/content/author/author_id/{id}`: áreas temáticas de un autor.
+- `/content/search/scopus`: búsqueda `AU-ID(...)` o `AF-ID(...)`, paginada
+  por `start` o `cursor`, con proyección opcional `field=`.
+- `/stats`: llamadas y bytes servidos desde la consulta anterior.
+
+Configuración por variables de entorno:
+
+- `STANDIN_DATASET`: `author` (un autor con `STANDIN_TOTAL` publicaciones
+  completas, como `view=COMPLETE`) o `affiliation` (400 autores de la
+  institución y 6.000 publicaciones compartidas entre ellos).
+- `STANDIN_LATENCY`: segundos de espera por respuesta.
+- `STANDIN_BANDWIDTH`: bytes por segundo del enlace simulado (0 = sin límite).
+"""
+import asyncio
+import json
+import os
+import random
+import re
+from typing import Dict, List
+from urllib.parse import parse_qs
+
+EPN_AFFILIATION_ID = "60072054"
+AUTHOR_ID = "57000000001"
+
+LATENCY = float(os.getenv("STANDIN_LATENCY", "0.15"))
+BANDWIDTH = float(os.getenv("STANDIN_BANDWIDTH", "0"))
+DATASET = os.getenv("STANDIN_DATASET", "author")
+TOTAL = int(os.getenv("STANDIN_TOTAL", "1200"))
+
+SUBJECT_AREAS = json.dumps({"author-retrieval-response": [{"subject-areas": {"subject-area": [
+    {"@abbrev": "COMP", "$": "Computer Science"},
+    {"@abbrev": "ENGI", "$": "Engineering"},
+]}}]}).encode()
+
+_rng = random.Random(7)
+_WORDS = [
+    "analysis", "model", "network", "data", "learning", "system", "energy", "control", "design", "method",
+    "water", "quito", "andes", "signal", "power", "structure", "optimization", "sensor", "soil", "climate",
+]
+
+
+def _text(words: int) -> str:
+    return " ".join(_rng.choice(_WORDS) for _ in range(words))
+
+
+def _complete_entry(i: int) -> Dict:
+    """Entrada de búsqueda con todos los campos de `view=COMPLETE`."""
+    n_authors = _rng.choice([3, 4, 5, 6, 8, 12, 25, 150])
+    afids = [EPN_AFFILIATION_ID, "60000001", "60000002", "60000003"]
+    authors = [{
+        "@_fa": "true", "@seq": str(k + 1),
+        "author-url": f"https://api.elsevier.com/content/author/author_id/{5700000000 + k}",
+        "authid": AUTHOR_ID if k == 0 else str(5700000000 + k),
+        "authname": _text(2), "surname": _text(1), "given-name": _text(1), "initials": "A.B.",
+        "afid": [{"@_fa": "true", "$": _rng.choice(afids)}],
+    } for k in range(n_authors)]
+    return {
+        "@_fa": "true",
+        "link": [{"@_fa": "true", "@ref": ref, "@href": f"https://www.scopus.com/{ref}/{i}"}
+                 for ref in ("self", "author-affiliation", "scopus", "scopus-citedby")],
+        "prism:url": f"https://api.elsevier.com/content/abstract/scopus_id/{i}",
+        "dc:identifier": f"SCOPUS_ID:{i}", "eid": f"2-s2.0-{i}", "dc:title": _text(12), "dc:creator": _text(2),
+        "prism:publicationName": _text(4), "prism:issn": "12345678", "prism:eIssn": "87654321",
+        "prism:volume": "12", "prism:issueIdentifier": "3", "prism:pageRange": "1-10",
+        "prism:coverDate": f"{2000 + i % 24}-01-01", "prism:coverDisplayDate": "January 2020",
+        "prism:doi": f"10.1000/{i}", "dc:description": _text(220), "citedby-count": "4",
+        "affiliation": [{
+            "@_fa": "true", "affiliation-url": f"https://api.elsevier.com/content/affiliation/affiliation_id/{afid}",
+            "afid": afid, "affilname": _text(4), "affiliation-city": "Quito", "affiliation-country": "Ecuador",
+        } for afid in afids],
+        "pubmed-id": "123", "prism:aggregationType": "Journal", "subtype": "ar", "subtypeDescription": "Article",
+        "author-count": {"@limit": "100", "@total": str(n_authors), "$": str(n_authors)}, "author": authors,
+        "authkeywords": " | ".join(_text(2) for _ in range(8)), "article-number": str(i),
+        "source-id": str(20000 + i % 300), "fund-acr": "X", "fund-no": "undefined", "fund-sponsor": _text(5),
+        "openaccess": "0", "openaccessFlag": False, "freetoread": {"value": [{"$": "all"}]},
+    }
+
+
+def _affiliation_documents(n_authors: int = 400, n_documents: int = 6000) -> List[Dict]:
+    """Publicaciones de la institución con 1 a 5 coautores de ella y coautores externos."""
+    authors = [str(57000000000 + i) for i in range(n_authors)]
+    documents = []
+    for i in range(n_documents):
+        internal = _rng.sample(authors, _rng.choice([1, 1, 2, 2, 3, 4, 5]))
+        external = [str(80000000000 + _rng.randrange(10 ** 6)) for _ in range(_rng.choice([0, 2, 5]))]
+        documents.append({
+            "dc:identifier": f"SCOPUS_ID:{i}", "eid": f"2-s2.0-{i}", "dc:title": f"T{i}",
+            "prism:coverDate": f"{2000 + i % 25}-01-01", "source-id": str(20000 + i % 300),
+            "prism:publicationName": f"J{i % 300}", "subtypeDescription": "Article",
+            "author": (
+                [{"authid": a, "afid": [{"$": EPN_AFFILIATION_ID}]} for a in internal]
+                + [{"authid": a, "afid": [{"$": "60000001"}]} for a in external]
+            ),
+            "affiliation": [
+                {"afid": EPN_AFFILIATION_ID, "affilname": "Escuela Politécnica Nacional"},
+                {"afid": "60000001", "affilname": "Otra"},
+            ],
+        })
+    return documents
+
+
+def _project(entry: Dict, fields: set) -> Dict:
+    """Aplica `field=` como la API: sólo los campos pedidos, también dentro de autores y afiliaciones."""
+    projected = {key: value for key, value in entry.items() if key in fields}
+    if "authid" in fields or "afid" in fields:
+        projected["author"] = [
+            {key: value for key, value in author.items() if key in fields or key in ("@_fa", "@seq")}
+            for author in entry.get("author", [])
+        ]
+    if "affilname" in fields or "afid" in fields:
+        projected["affiliation"] = [
+            {key: value for key, value in affiliation.items() if key in fields or key == "@_fa"}
+            for affiliation in entry.get("affiliation", [])
+        ]
+    return projected
+
+
+if DATASET == "affiliation":
+    DOCUMENTS = _affiliation_documents()
+else:
+    DOCUMENTS = [_complete_entry(i) for i in range(TOTAL)]
+BY_AUTHOR: Dict[str, List[Dict]] = {}
+for _document in DOCUMENTS:
+    for _author in _document["author"]:
+        BY_AUTHOR.setdefault(_author["authid"], []).append(_document)
+
+stats = {"calls": 0, "bytes": 0}
+
+
+def _search(query: Dict[str, str]) -> Dict:
+    match = re.match(r"(AU|AF)-ID\((\d+)\)", query.get("query", ""))
+    if match is None:
+        results = []
+    elif match.group(1) == "AF":
+        results = DOCUMENTS if match.group(2) == EPN_AFFILIATION_ID else []
+    else:
+        results = BY_AUTHOR.get(match.group(2), [])
+
+    count = int(query.get("count", 25))
+    search_results = {"opensearch:totalResults": str(len(results))}
+    if "cursor" in query:
+        start = 0 if query["cursor"] == "*" else int(query["cursor"][1:])
+        following = min(start + count, len(results))
+        search_results["cursor"] = {
+            "@current": query["cursor"],
+            "@next": f"c{following}" if following < len(results) else query["cursor"],
+        }
+    else:
+        start = int(query.get("start", 0))
+
+    entries = results[start:start + count]
+    if "field" in query:
+        fields = set(query["field"].split(","))
+        entries = [_project(entry, fields) for entry in entries]
+    search_results["entry"] = entries or [{"error": "Result set was empty"}]
+    return {"search-results": search_results}
+
+
+async def app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    query = {key: values[0] for key, values in parse_qs(scope["query_string"].decode()).items()}
+    path = scope["path"]
+    if path == "/stats":
+        body = json.dumps(stats).encode()
+        stats.update(calls=0, bytes=0)
+    else:
+        if path.startswith("/content/author/author_id/"):
+            body = SUBJECT_AREAS
+        else:
+            body = json.dumps(_search(query)).encode()
+        stats["calls"] += 1
+        stats["bytes"] += len(body)
+        delay = LATENCY + (len(body) / BANDWIDTH if BANDWIDTH > 0 else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": body})
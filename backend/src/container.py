@@ -1,10 +1,33 @@
-from functools import lru_cache
+from contextlib import contextmanager
+from functools import lru_cache, partial
 import os
 from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
+from httpx import AsyncClient
+from sqlalchemy.orm import Session
 
 # Importamos componentes compartidos
 from .shared.database import db_config
+from .shared.api_key_pool import ApiKeyPool
+from .shared.http_client import create_http_client
+from .shared.rate_limiter import AdaptiveRateLimiter
+from .shared.single_flight import SingleFlight
+from .shared.ttl_cache import TTLCache
+from .modules.publications.infrastructure.sjr_file_repository import SJRFileRepository
+from .modules.publications.infrastructure.sjr_mmap_repository import SJRMmapRepository
+from .modules.publications.infrastructure.sjr_edition_registry import SJREdition, SJREditionRegistry
+from .modules.publications.infrastructure.sjr_reloader import SJRReloader
+from .modules.publications.infrastructure.sjr_reenrichment_job import SJRReenrichmentJob
+from .modules.publications.infrastructure.affiliation_harvest_job import AffiliationHarvestJob
+from .modules.publications.infrastructure.scopus_publication_repository import ScopusPublicationRepository
+from .modules.publications.infrastructure.db_publication_cache_repository import DBPublicationCacheRepository
+from .modules.publications.infrastructure.scopus_author_subject_area_repository import ScopusAuthorSubjectAreaRepository
+from .modules.publications.infrastructure.db_author_subject_area_cache_repository import DBAuthorSubjectAreaCacheRepository
+from .modules.publications.infrastructure.db_scopus_api_key_quota_store import DBScopusApiKeyQuotaStore
+from .modules.publications.application.publication_service import PublicationService
+from .modules.publications.application.subject_area_service import SubjectAreaService
+from .modules.scopus_accounts.infrastructure.db_scopus_account_repository import DBScopusAccountRepository
 # from src.shared.scopus_client import ScopusApiClient
 
 load_dotenv()
@@ -21,12 +44,96 @@ class Settings:
 
     # Scopus & External APIs
     SCOPUS_API_KEY: str = os.getenv("SCOPUS_API_KEY", "")
+    # Pool de API keys separadas por comas (cada una con su cuota); vacío = sólo SCOPUS_API_KEY
+    SCOPUS_API_KEYS: str = os.getenv("SCOPUS_API_KEYS", "")
+    # Cada cuántos segundos se guarda en BD la cuota restante de cada key
+    SCOPUS_KEY_QUOTA_PERSIST_SECONDS: float = float(os.getenv("SCOPUS_KEY_QUOTA_PERSIST_SECONDS", "60"))
+    # Pool de conexiones del cliente HTTP compartido (Scopus)
+    SCOPUS_HTTP_MAX_CONNECTIONS: int = int(os.getenv("SCOPUS_HTTP_MAX_CONNECTIONS", "20"))
+    SCOPUS_HTTP_MAX_KEEPALIVE: int = int(os.getenv("SCOPUS_HTTP_MAX_KEEPALIVE", "20"))
+    # Segundos que una conexión inactiva permanece abierta para reutilizarse
+    SCOPUS_HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("SCOPUS_HTTP_KEEPALIVE_EXPIRY", "30"))
+    # HTTP/2 (requiere el paquete opcional 'h2'; sin él se usa HTTP/1.1)
+    SCOPUS_HTTP2: bool = os.getenv("SCOPUS_HTTP2", "False").lower() == "true"
+    # Páginas de resultados de Scopus que se piden en paralelo por autor
+    SCOPUS_MAX_CONCURRENT_PAGES: int = int(os.getenv("SCOPUS_MAX_CONCURRENT_PAGES", "4"))
+    # Reintentos por página ante errores transitorios (red, 429, 5xx)
+    SCOPUS_PAGE_RETRIES: int = int(os.getenv("SCOPUS_PAGE_RETRIES", "3"))
+    # Total de resultados a partir del cual se pagina con cursor: la API no admite
+    # desplazamientos (`start`) más allá de 5000
+    SCOPUS_CURSOR_THRESHOLD: int = int(os.getenv("SCOPUS_CURSOR_THRESHOLD", "5000"))
+    # Pedir a Scopus Search sólo los campos que se procesan (`field=`), sin
+    # resúmenes ni palabras clave; False = registro completo de view=COMPLETE.
+    # Desactivado hasta verificar con la API real que `field=` conserva el `afid`
+    # de cada autor (si una página llega sin ellos, se vuelve al registro completo)
+    SCOPUS_SEARCH_FIELD_PROJECTION: bool = os.getenv("SCOPUS_SEARCH_FIELD_PROJECTION", "False").lower() == "true"
+    # Al vencer la caché de una cuenta, pedir sólo los documentos incorporados a
+    # Scopus desde su última actualización (ORIG-LOAD-DATE); cada
+    # SCOPUS_FULL_RECONCILE_DAYS días se descarga todo (bajas y correcciones)
+    SCOPUS_INCREMENTAL_REFRESH: bool = os.getenv("SCOPUS_INCREMENTAL_REFRESH", "True").lower() == "true"
+    SCOPUS_FULL_RECONCILE_DAYS: int = int(os.getenv("SCOPUS_FULL_RECONCILE_DAYS", "7"))
+    # Cosecha por institución: una sola búsqueda AF-ID(EPN) reparte las publicaciones
+    # entre todas las cuentas registradas. Cada cuántas horas (0 = sólo a demanda)
+    SCOPUS_HARVEST_INTERVAL_HOURS: float = float(os.getenv("SCOPUS_HARVEST_INTERVAL_HOURS", "0"))
+    SCOPUS_HARVEST_BATCH_SIZE: int = int(os.getenv("SCOPUS_HARVEST_BATCH_SIZE", "1000"))
+    # Autores por petición a Author Retrieval (máximo de la API: 25)
+    SCOPUS_AUTHOR_BATCH_SIZE: int = int(os.getenv("SCOPUS_AUTHOR_BATCH_SIZE", "25"))
+    # Caché de áreas temáticas de autores: validez en BD (horas) y de la capa en
+    # memoria de cada worker (segundos, 0 = sin capa en memoria)
+    SUBJECT_AREA_CACHE_HOURS: int = int(os.getenv("SUBJECT_AREA_CACHE_HOURS", "168"))
+    SUBJECT_AREA_MEMORY_TTL_SECONDS: float = float(os.getenv("SUBJECT_AREA_MEMORY_TTL_SECONDS", "600"))
+    # Límite de peticiones a Scopus del proceso por API key (las llamadas que usan
+    # una key comparten su cuota); la tasa se ajusta con X-RateLimit-* y los 429
+    SCOPUS_MAX_REQUESTS_PER_SECOND: float = float(os.getenv("SCOPUS_MAX_REQUESTS_PER_SECOND", "9"))
+    SCOPUS_RATE_BURST: int = int(os.getenv("SCOPUS_RATE_BURST", "9"))
+    # Pausa global máxima (segundos) ante un Retry-After o la cuota agotada
+    SCOPUS_MAX_PAUSE_SECONDS: float = float(os.getenv("SCOPUS_MAX_PAUSE_SECONDS", "60"))
 
     # Rutas de Archivos (Data estática)
     BASE_DIR = Path(__file__).resolve().parent.parent
     DATA_DIR = BASE_DIR / "data"
     SJR_CSV_PATH: str = os.getenv("SJR_CSV_PATH", str(DATA_DIR / "df_sjr_24_04_2025.csv"))
     AREAS_CSV_PATH: str = os.getenv("AREAS_CSV_PATH", str(DATA_DIR / "areas_categories.csv"))
+    # Snapshot binario de los índices SJR junto al CSV (evita reprocesarlo en cada arranque)
+    SJR_SNAPSHOT_ENABLED: bool = os.getenv("SJR_SNAPSHOT_ENABLED", "True").lower() == "true"
+    # Backend del índice SJR: "memory" (diccionarios por proceso) o
+    # "mmap" (archivo de sólo lectura compartido entre todos los workers)
+    SJR_INDEX_BACKEND: str = os.getenv("SJR_INDEX_BACKEND", "memory").lower()
+    # Varias ediciones SJR a la vez, de la más antigua a la más nueva:
+    # "nombre=ruta,nombre=ruta" (rutas relativas a DATA_DIR). Vacío = sólo SJR_CSV_PATH.
+    # Para cada año se usa la edición más nueva que lo contiene.
+    SJR_EDITIONS: str = os.getenv("SJR_EDITIONS", "")
+    # Similitud mínima (Jaccard de trigramas, 0-1) para el fallback aproximado por título
+    # cuando fallan el Sourceid y el nombre exacto. Desactivado por defecto (0): puede
+    # confundir revistas parecidas; las publicaciones así resueltas llevan sjr_fuzzy_match.
+    # Sólo backend "memory".
+    SJR_FUZZY_THRESHOLD: float = float(os.getenv("SJR_FUZZY_THRESHOLD", "0"))
+    # Re-aplicar el SJR a la caché de publicaciones tras cada recarga (sin consultar Scopus)
+    SJR_REENRICH_ON_RELOAD: bool = os.getenv("SJR_REENRICH_ON_RELOAD", "True").lower() == "true"
+    # Publicaciones por lote en la re-aplicación del SJR
+    SJR_REENRICH_BATCH_SIZE: int = int(os.getenv("SJR_REENRICH_BATCH_SIZE", "1000"))
+    # Lector del CSV de SJR cuando no hay snapshot vigente: "pandas" (columnar) o
+    # "stream" (una sola pasada con el módulo csv: menor pico de memoria y sin importar pandas)
+    SJR_CSV_PARSER: str = os.getenv("SJR_CSV_PARSER", "pandas").lower()
+    # Intervalo (segundos) de revisión del CSV de SJR y de las recargas hechas por otros
+    # workers, para recargarlo en caliente (0 = desactivado: cada worker sólo recarga a pedido).
+    # Con varios workers, activarlo para que todos sigan las recargas de /sjr/reload.
+    SJR_WATCH_INTERVAL_SECONDS: float = float(os.getenv("SJR_WATCH_INTERVAL_SECONDS", "0"))
+
+    def scopus_api_keys(self) -> List[str]:
+        """API keys de Scopus del pool (SCOPUS_API_KEYS o, si está vacío, SCOPUS_API_KEY)."""
+        keys = [key.strip() for key in self.SCOPUS_API_KEYS.split(",") if key.strip()]
+        return keys or ([self.SCOPUS_API_KEY] if self.SCOPUS_API_KEY else [])
+
+    def sjr_editions(self) -> List[Tuple[str, str]]:
+        """Ediciones SJR configuradas como pares (nombre, ruta absoluta)."""
+        editions = []
+        for item in self.SJR_EDITIONS.split(","):
+            if not item.strip():
+                continue
+            name, _, path = item.partition("=")
+            editions.append((name.strip(), str(self.DATA_DIR / path.strip())))
+        return editions
 
 
 class Container:
@@ -42,8 +149,155 @@ class Container:
         # Inicializar Cliente Scopus
         # self.scopus_client = ScopusApiClient(self.settings.SCOPUS_API_KEY)
 
+        # Cliente HTTP con pool de conexiones para Scopus, compartido por todas
+        # las peticiones. Se abre y se cierra en el lifespan de la API.
+        self.scopus_http_client: Optional[AsyncClient] = None
+        # Pool de API keys para todas las llamadas a Scopus del proceso: cada key
+        # con su limitador de tasa, su cuota (persistida en BD) y su pausa al agotarse
+        self.scopus_key_pool = ApiKeyPool(
+            api_keys=self.settings.scopus_api_keys(),
+            rate_limiter_factory=lambda: AdaptiveRateLimiter(
+                max_rate=self.settings.SCOPUS_MAX_REQUESTS_PER_SECOND,
+                burst=self.settings.SCOPUS_RATE_BURST,
+                max_pause=self.settings.SCOPUS_MAX_PAUSE_SECONDS
+            ),
+            store=DBScopusApiKeyQuotaStore(self.db_handler.get_session_local)
+        )
+        # Consultas a Scopus en curso: las peticiones simultáneas por la misma
+        # cuenta esperan la misma descarga en lugar de repetirla
+        self.scopus_single_flight = SingleFlight()
+        # Capa en memoria delante de la caché de áreas temáticas en BD
+        self.subject_area_memory_cache: TTLCache[str, List[str]] = TTLCache(
+            ttl_seconds=self.settings.SUBJECT_AREA_MEMORY_TTL_SECONDS
+        )
+
+        # Repositorio SJR único por proceso. Se carga en el arranque (lifespan)
+        # y todas las peticiones comparten el mismo índice.
+        sjr_repository_class = (
+            SJRMmapRepository if self.settings.SJR_INDEX_BACKEND == "mmap" else SJRFileRepository
+        )
+        sjr_editions = self.settings.sjr_editions()
+        if sjr_editions:
+            # El registro de ediciones combina los índices en memoria (no usa el backend mmap)
+            sjr_repository_class = SJRFileRepository
+            self.sjr_repository = SJREditionRegistry(
+                editions=[SJREdition(name=name, csv_path=path) for name, path in sjr_editions],
+                autoload=False,
+                use_snapshot=self.settings.SJR_SNAPSHOT_ENABLED,
+                fuzzy_threshold=self.settings.SJR_FUZZY_THRESHOLD,
+                csv_parser=self.settings.SJR_CSV_PARSER
+            )
+        elif sjr_repository_class is SJRMmapRepository:
+            self.sjr_repository = SJRMmapRepository(
+                csv_path=self.settings.SJR_CSV_PATH,
+                autoload=False,
+                use_snapshot=self.settings.SJR_SNAPSHOT_ENABLED,
+                csv_parser=self.settings.SJR_CSV_PARSER
+            )
+        else:
+            self.sjr_repository = SJRFileRepository(
+                csv_path=self.settings.SJR_CSV_PATH,
+                autoload=False,
+                use_snapshot=self.settings.SJR_SNAPSHOT_ENABLED,
+                fuzzy_threshold=self.settings.SJR_FUZZY_THRESHOLD,
+                csv_parser=self.settings.SJR_CSV_PARSER
+            )
+        # Re-aplicación del SJR a la caché de publicaciones (endpoint /sjr/reenrich y tras cada recarga)
+        self.sjr_reenrichment_job = SJRReenrichmentJob(
+            self.sjr_repository,
+            session_factory=self.db_handler.get_session_local,
+            batch_size=self.settings.SJR_REENRICH_BATCH_SIZE
+        )
+        # Recarga en caliente del repositorio SJR (endpoint /sjr/reload y vigilancia del CSV).
+        # Con snapshot o índice mapeable, el índice nuevo se construye en un proceso aparte
+        # (con varias ediciones, sólo el snapshot del CSV recargado; ver SJREditionRegistry).
+        uses_derived_files = (
+            self.settings.SJR_SNAPSHOT_ENABLED or sjr_repository_class is SJRMmapRepository
+        )
+        self.sjr_reloader = SJRReloader(
+            self.sjr_repository,
+            data_dir=self.settings.DATA_DIR,
+            prebuild_factory=partial(
+                sjr_repository_class,
+                autoload=False,
+                use_snapshot=self.settings.SJR_SNAPSHOT_ENABLED,
+                csv_parser=self.settings.SJR_CSV_PARSER
+            ) if uses_derived_files else None,
+            on_reloaded=self.sjr_reenrichment_job.start if self.settings.SJR_REENRICH_ON_RELOAD else None
+        )
+
+        # Cosecha de publicaciones por institución (endpoint /publications/harvest y programada)
+        self.affiliation_harvest_job = AffiliationHarvestJob(
+            session_factory=self.db_handler.get_session_local,
+            service_factory=self.create_publication_service,
+            batch_size=self.settings.SCOPUS_HARVEST_BATCH_SIZE
+        )
+
         # Aquí podrías inicializar Redis, Logging centralizado, etc.
 
+    def create_publication_service(self, db: Session) -> PublicationService:
+        """Servicio de publicaciones (Scopus + caché en BD) sobre una sesión de BD."""
+        publication_repo = ScopusPublicationRepository(
+            http_client=self.scopus_http_client,
+            max_concurrent_pages=self.settings.SCOPUS_MAX_CONCURRENT_PAGES,
+            page_retries=self.settings.SCOPUS_PAGE_RETRIES,
+            cursor_threshold=self.settings.SCOPUS_CURSOR_THRESHOLD,
+            key_pool=self.scopus_key_pool,
+            field_projection=self.settings.SCOPUS_SEARCH_FIELD_PROJECTION
+        )
+        return PublicationService(
+            publication_repo=publication_repo,
+            cache_repo=DBPublicationCacheRepository(db),
+            sjr_repo=self.sjr_repository,
+            scopus_account_repo=DBScopusAccountRepository(db),
+            single_flight=self.scopus_single_flight,
+            incremental_refresh=self.settings.SCOPUS_INCREMENTAL_REFRESH,
+            full_reconcile_days=self.settings.SCOPUS_FULL_RECONCILE_DAYS,
+            shared_cache_repo=self.open_publication_cache_repository
+        )
+
+    @contextmanager
+    def open_publication_cache_repository(self) -> Iterator[DBPublicationCacheRepository]:
+        """Repositorio de caché de publicaciones sobre una sesión propia, que se cierra al salir."""
+        session = self.db_handler.get_session_local()
+        try:
+            yield DBPublicationCacheRepository(session)
+        finally:
+            session.close()
+
+    def create_subject_area_service(self, db: Session) -> SubjectAreaService:
+        """Servicio de áreas temáticas (Author Retrieval + caché) sobre una sesión de BD."""
+        author_sa_repo = ScopusAuthorSubjectAreaRepository(
+            http_client=self.scopus_http_client,
+            key_pool=self.scopus_key_pool,
+            batch_size=self.settings.SCOPUS_AUTHOR_BATCH_SIZE
+        )
+        return SubjectAreaService(
+            author_sa_repo=author_sa_repo,
+            scopus_account_repo=DBScopusAccountRepository(db),
+            single_flight=self.scopus_single_flight,
+            cache_repo=DBAuthorSubjectAreaCacheRepository(db),
+            memory_cache=self.subject_area_memory_cache,
+            cache_max_age_hours=self.settings.SUBJECT_AREA_CACHE_HOURS
+        )
+
+    def open_scopus_http_client(self) -> AsyncClient:
+        """Crea el cliente HTTP compartido (una vez por proceso)."""
+        if self.scopus_http_client is None:
+            self.scopus_http_client = create_http_client(
+                max_connections=self.settings.SCOPUS_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=self.settings.SCOPUS_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=self.settings.SCOPUS_HTTP_KEEPALIVE_EXPIRY,
+                http2=self.settings.SCOPUS_HTTP2
+            )
+        return self.scopus_http_client
+
+    async def close_scopus_http_client(self) -> None:
+        """Cierra las conexiones del cliente HTTP compartido."""
+        if self.scopus_http_client is not None:
+            await self.scopus_http_client.aclose()
+            self.scopus_http_client = None
+
 
 @lru_cache()
 def get_container() -> Container:
@@ -1,3 +1,6 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from typing import List, Dict
 
 import uvicorn
@@ -13,17 +16,68 @@ from .modules.job_positions.infrastructure.job_position_router import router as
 from .modules.authors.infrastructure.author_router import router as author_router
 from .modules.scopus_accounts.infrastructure.scopus_account_router import router as account_router
 from .modules.publications.infrastructure.publication_router import router as publication_router
+from .modules.publications.infrastructure.sjr_router import router as sjr_router
 from .modules.certificates.infrastructure.certificate_router import router as certificate_router
 
 # Obtener configuración
 container = get_container()
 settings = container.settings
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Inicializa los recursos compartidos del proceso antes de atender peticiones."""
+    # Cliente HTTP con pool de conexiones para todas las llamadas a Scopus
+    container.open_scopus_http_client()
+
+    # Cuota guardada de las API keys de Scopus (keys agotadas siguen en pausa)
+    try:
+        await container.scopus_key_pool.load()
+    except Exception as e:
+        logger.error(f"No se pudo cargar la cuota de las API keys de Scopus: {e}")
+    quota_task = asyncio.create_task(
+        container.scopus_key_pool.persist_periodically(settings.SCOPUS_KEY_QUOTA_PERSIST_SECONDS)
+    )
+
+    # Carga única del dataset SJR (en un hilo para no bloquear el event loop).
+    # Aún no se atienden peticiones: se puede pausar el GC durante la construcción
+    await asyncio.to_thread(container.sjr_repository.load, pause_gc=True)
+
+    # Vigilancia del CSV de SJR y de las recargas de otros workers, para recargarlo sin reiniciar
+    watch_task = None
+    if settings.SJR_WATCH_INTERVAL_SECONDS > 0:
+        watch_task = asyncio.create_task(
+            container.sjr_reloader.watch(settings.SJR_WATCH_INTERVAL_SECONDS)
+        )
+
+    # Cosecha periódica de publicaciones por institución (opcional)
+    harvest_task = None
+    if settings.SCOPUS_HARVEST_INTERVAL_HOURS > 0:
+        harvest_task = asyncio.create_task(
+            container.affiliation_harvest_job.schedule(settings.SCOPUS_HARVEST_INTERVAL_HOURS)
+        )
+
+    yield
+
+    if watch_task is not None:
+        watch_task.cancel()
+    if harvest_task is not None:
+        harvest_task.cancel()
+    quota_task.cancel()
+    await container.scopus_key_pool.flush()
+    await container.sjr_reenrichment_job.stop()
+    await container.affiliation_harvest_job.stop()
+    await container.close_scopus_http_client()
+
+
 # Crear aplicación FastAPI
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    description="API para gestión de reportes científicos EPN"
+    description="API para gestión de reportes científicos EPN",
+    lifespan=lifespan
 )
 
 # Configurar CORS
@@ -50,6 +104,7 @@ async def health_check():
         "status": "active",
         "version": settings.VERSION,
         "database": db_status,
+        "sjr_ready": container.sjr_repository.is_ready,
         "modules_loaded": ["organization"]
     }
 
@@ -70,6 +125,7 @@ app.include_router(job_position_router)
 app.include_router(author_router)
 app.include_router(account_router)
 app.include_router(publication_router)
+app.include_router(sjr_router)
 app.include_router(certificate_router)
 
 
@@ -23,6 +23,8 @@ class PublicationSnapshot(BaseModel):
     subject_areas: List[str] = Field(default_factory=list)
     categories_with_quartiles: List[str] = Field(default_factory=list)
     sjr_year_used: Optional[int] = None
+    sjr_edition: Optional[str] = None
+    sjr_fuzzy_match: bool = False
 
 
 class SaveReportMetadataDTO(BaseModel):
@@ -27,14 +27,9 @@ from .report.style_manager import ReportLabStyleManager
 from .report.chart_generator import MatplotlibChartGenerator
 from .report.publication_formatter import ReportLabPublicationFormatter
 from .report.template_overlay_service import TemplateOverlayService
-from ...publications.infrastructure.scopus_publication_repository import ScopusPublicationRepository
-from ...publications.infrastructure.sjr_file_repository import SJRFileRepository
-from ...publications.infrastructure.db_publication_cache_repository import DBPublicationCacheRepository
-from ...publications.infrastructure.scopus_author_subject_area_repository import ScopusAuthorSubjectAreaRepository
 from ...publications.application.publication_service import PublicationService
 from ...publications.application.subject_area_service import SubjectAreaService
 from ...publications.domain.publication import Publication
-from ...scopus_accounts.infrastructure.db_scopus_account_repository import DBScopusAccountRepository
 from ....shared.database import get_db
 from ....container import get_container
 
@@ -77,36 +72,14 @@ def get_publication_service(db: Session = Depends(get_db)) -> PublicationService
     """
     Factory para crear el servicio de publicaciones con sus dependencias.
     """
-    container = get_container()
-    
-    publication_repo = ScopusPublicationRepository(
-        api_key=container.settings.SCOPUS_API_KEY
-    )
-    cache_repo = DBPublicationCacheRepository(db)
-    sjr_repo = SJRFileRepository(csv_path=container.settings.SJR_CSV_PATH)
-    scopus_account_repo = DBScopusAccountRepository(db)
-    
-    return PublicationService(
-        publication_repo=publication_repo,
-        cache_repo=cache_repo,
-        sjr_repo=sjr_repo,
-        scopus_account_repo=scopus_account_repo
-    )
+    return get_container().create_publication_service(db)
 
 
 def get_subject_area_service(db: Session = Depends(get_db)) -> SubjectAreaService:
     """
     Factory para crear el servicio de áreas temáticas del autor.
     """
-    container = get_container()
-    author_sa_repo = ScopusAuthorSubjectAreaRepository(
-        api_key=container.settings.SCOPUS_API_KEY
-    )
-    scopus_account_repo = DBScopusAccountRepository(db)
-    return SubjectAreaService(
-        author_sa_repo=author_sa_repo,
-        scopus_account_repo=scopus_account_repo
-    )
+    return get_container().create_subject_area_service(db)
 
 
 @router.post(
@@ -146,7 +119,9 @@ async def generate_certificate(
         
         # Recolectar publicaciones de todos los author_ids
         all_publications: List[Publication] = []
-        all_subject_areas: set = set()
+        # Cuentas cuyas áreas temáticas se consultan juntas al final (Author Retrieval por lotes)
+        subject_area_author_ids: List[UUID] = []
+        subject_area_scopus_ids: List[str] = []
         
         for author_id in request.author_ids:
             try:
@@ -169,16 +144,14 @@ async def generate_certificate(
                         affiliation_id=pub_dto.affiliation_id,
                         subject_areas=pub_dto.subject_areas,
                         categories_with_quartiles=pub_dto.categories_with_quartiles,
-                        sjr_year_used=pub_dto.sjr_year_used
+                        sjr_year_used=pub_dto.sjr_year_used,
+                        sjr_edition=pub_dto.sjr_edition,
+                        sjr_fuzzy_match=pub_dto.sjr_fuzzy_match
                     )
                     all_publications.append(pub)
                 
-                # Obtener subject areas desde Author Retrieval API
-                try:
-                    author_areas = await subject_area_service.get_subject_areas_by_author(author_uuid)
-                    all_subject_areas.update(author_areas)
-                except ValueError:
-                    pass  # Autor sin cuentas Scopus, continuar
+                # Subject areas desde Author Retrieval API (autor sin cuentas Scopus: sin áreas)
+                subject_area_author_ids.append(author_uuid)
                     
             except ValueError:
                 # Si no es UUID, intentar como Scopus ID directamente
@@ -197,16 +170,22 @@ async def generate_certificate(
                         affiliation_id=pub_dto.affiliation_id,
                         subject_areas=pub_dto.subject_areas,
                         categories_with_quartiles=pub_dto.categories_with_quartiles,
-                        sjr_year_used=pub_dto.sjr_year_used
+                        sjr_year_used=pub_dto.sjr_year_used,
+                        sjr_edition=pub_dto.sjr_edition,
+                        sjr_fuzzy_match=pub_dto.sjr_fuzzy_match
                     )
                     all_publications.append(pub)
                 
                 # Para Scopus ID directo, obtener subject areas desde Author Retrieval
-                try:
-                    scopus_areas = await subject_area_service.get_subject_areas_by_scopus_id(author_id)
-                    all_subject_areas.update(scopus_areas)
-                except Exception:
-                    pass  # Fallback: sin áreas para este ID
+                subject_area_scopus_ids.append(author_id)
+        
+        # Subject areas de todas las cuentas en una sola consulta por lotes
+        try:
+            all_subject_areas = await subject_area_service.get_merged_subject_areas(
+                subject_area_author_ids, subject_area_scopus_ids
+            )
+        except Exception:
+            all_subject_areas = []  # Fallback: certificado sin áreas temáticas
         
         # Eliminar duplicados basados en scopus_id
         seen_ids = set()
@@ -248,7 +227,7 @@ async def generate_certificate(
             regional_publications=regional_pubs,
             event_memory=memories,
             book_chapters=book_chapters,
-            subject_areas=sorted(list(all_subject_areas)),
+            subject_areas=all_subject_areas,
             documents_by_year=pubs_by_year,
             is_draft=request.is_draft
         )
@@ -514,6 +493,8 @@ async def regenerate_from_metadata(
                 subject_areas=pub_dict.get("subject_areas", []),
                 categories_with_quartiles=pub_dict.get("categories_with_quartiles", []),
                 sjr_year_used=pub_dict.get("sjr_year_used"),
+                sjr_edition=pub_dict.get("sjr_edition"),
+                sjr_fuzzy_match=bool(pub_dict.get("sjr_fuzzy_match", False)),
             ))
 
         # Clasificar publicaciones
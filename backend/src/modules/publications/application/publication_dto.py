@@ -1,7 +1,9 @@
 
+from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel
 from ..domain.publication import Publication
+from ..domain.sjr_journal import SJRJournal
 
 
 class PublicationResponseDTO(BaseModel):
@@ -20,6 +22,8 @@ class PublicationResponseDTO(BaseModel):
     subject_areas: List[str]
     categories_with_quartiles: List[str]
     sjr_year_used: Optional[int]
+    sjr_edition: Optional[str] = None
+    sjr_fuzzy_match: bool = False
 
     @staticmethod
     def from_entity(publication: Publication) -> 'PublicationResponseDTO':
@@ -40,7 +44,32 @@ class PublicationResponseDTO(BaseModel):
             affiliation_id=publication.affiliation_id,
             subject_areas=publication.subject_areas,
             categories_with_quartiles=publication.categories_with_quartiles,
-            sjr_year_used=publication.sjr_year_used
+            sjr_year_used=publication.sjr_year_used,
+            sjr_edition=publication.sjr_edition,
+            sjr_fuzzy_match=publication.sjr_fuzzy_match
+        )
+
+
+class JournalResponseDTO(BaseModel):
+    """DTO de respuesta para una revista del SJR."""
+    title: str
+    source_ids: List[str]
+    years: List[int]
+    sjr_year: Optional[int]
+    sjr_edition: Optional[str]
+    subject_areas: List[str]
+    categories_with_quartiles: List[str]
+
+    @staticmethod
+    def from_entity(journal: SJRJournal) -> 'JournalResponseDTO':
+        return JournalResponseDTO(
+            title=journal.title,
+            source_ids=journal.source_ids,
+            years=journal.years,
+            sjr_year=journal.sjr_year,
+            sjr_edition=journal.sjr_edition,
+            subject_areas=journal.subject_areas,
+            categories_with_quartiles=journal.categories_with_quartiles
         )
 
 
@@ -52,6 +81,24 @@ class AuthorPublicationsResponseDTO(BaseModel):
     publications: List[PublicationResponseDTO]
 
 
+class AffiliationHarvestStatusDTO(BaseModel):
+    """DTO de respuesta con el avance de la cosecha por institución (AF-ID)."""
+    running: bool
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    accounts: int
+    entries: int
+    matched_entries: int
+    saved: int
+    matched_accounts: int
+    incomplete_accounts: int
+    elapsed_seconds: float
+    entries_per_second: float
+    # Otro worker ya la estaba ejecutando: ésta se omitió
+    skipped: bool = False
+    error: Optional[str]
+
+
 class DocumentsByYearDTO(BaseModel):
     """DTO para estadísticas de documentos por año."""
     year: int
@@ -1,20 +1,41 @@
 """ Servicio de aplicación para gestión de publicaciones. """
 
 import asyncio
-from typing import List, Dict, Optional
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, ContextManager, List, Dict, Optional, Set, Tuple
 from uuid import UUID
 import logging
 from .publication_dto import PublicationResponseDTO, AuthorPublicationsResponseDTO
+from .sjr_enrichment import enrich_with_sjr
 from ..domain.publication import Publication
 from ..domain.publication_repository import IPublicationRepository
 from ..domain.publication_cache_repository import IPublicationCacheRepository
 from ..domain.sjr_repository import ISJRRepository
 from ...scopus_accounts.domain.scopus_account import ScopusAccount
 from ...scopus_accounts.domain.scopus_account_repository import IScopusAccountRepository
+from ....shared.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class AffiliationHarvestProgress:
+    """Avance de una cosecha de publicaciones por institución (AF-ID)."""
+    accounts: int = 0           # Cuentas Scopus registradas
+    entries: int = 0            # Publicaciones recibidas de la búsqueda por institución
+    matched_entries: int = 0    # Publicaciones con al menos un autor registrado
+    saved: int = 0              # Publicaciones guardadas en caché
+    matched_accounts: int = 0   # Cuentas con al menos una publicación
+    incomplete_accounts: int = 0  # Cuentas con publicaciones guardadas a nombre de otra cuenta
+    elapsed_seconds: float = 0.0
+
+    @property
+    def entries_per_second(self) -> float:
+        return self.entries / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
 class PublicationService:
     """
     Servicio de aplicación para gestión de publicaciones.
@@ -22,6 +43,9 @@ class PublicationService:
     
     # Tiempo de validez de la caché en horas
     CACHE_MAX_AGE_HOURS = 24
+    # Margen (días) de la actualización incremental antes de la última
+    # actualización, por documentos que Scopus indexa con retraso
+    INCREMENTAL_OVERLAP_DAYS = 3
     EPN_AFFILIATION_ID = "60072054"
     
     
@@ -30,12 +54,26 @@ class PublicationService:
         publication_repo: IPublicationRepository,
         cache_repo: Optional[IPublicationCacheRepository],
         sjr_repo: ISJRRepository,
-        scopus_account_repo: IScopusAccountRepository
+        scopus_account_repo: IScopusAccountRepository,
+        single_flight: Optional[SingleFlight] = None,
+        incremental_refresh: bool = True,
+        full_reconcile_days: int = 7,
+        shared_cache_repo: Optional[Callable[[], ContextManager[IPublicationCacheRepository]]] = None
     ):
         self._publication_repo = publication_repo
         self._cache_repo = cache_repo
+        # Abre un repositorio de caché propio (con su propia sesión de BD) para las
+        # actualizaciones compartidas, que siguen en curso aunque termine o se cancele
+        # la petición que las inició; None = `cache_repo`
+        self._shared_cache_repo = shared_cache_repo
         self._sjr_repo = sjr_repo
         self._scopus_account_repo = scopus_account_repo
+        # Descargas en curso compartidas por el proceso (ver Container); None = sólo las de este servicio
+        self._single_flight = single_flight or SingleFlight()
+        # Al vencer la caché sólo se piden los documentos nuevos; cada
+        # `full_reconcile_days` se descarga todo para reflejar bajas y correcciones
+        self._incremental_refresh = incremental_refresh
+        self._full_reconcile_days = full_reconcile_days
 
     async def get_publications_by_author(
         self, 
@@ -102,24 +140,87 @@ class PublicationService:
                 if cached_pubs:
                     return cached_pubs
         
+        # Las actualizaciones simultáneas de la misma cuenta descargan y guardan una sola vez.
+        # Una completa no se une a una incremental en curso: debe reconciliar (delete_missing)
+        publications = await self._single_flight.run(
+            ("cache_refresh", account.account_id, force_refresh),
+            lambda: self._refresh_shared_cache(account, full=force_refresh)
+        )
+        return list(publications)
+
+    async def _refresh_shared_cache(self, account: ScopusAccount, full: bool) -> List[Publication]:
+        """`_refresh_cache` para la ejecución compartida, sobre un repositorio de caché propio."""
+        if self._shared_cache_repo is None:
+            return await self._refresh_cache(account, full)
+        with self._shared_cache_repo() as cache_repo:
+            return await self._refresh_cache(account, full, cache_repo)
+
+    async def _refresh_cache(
+        self,
+        account: ScopusAccount,
+        full: bool,
+        cache_repo: Optional[IPublicationCacheRepository] = None
+    ) -> List[Publication]:
+        """
+        Actualiza la caché de una cuenta: incremental (sólo documentos nuevos)
+        si hubo una descarga completa reciente; si no, o si se fuerza, completa.
+
+        Args:
+            cache_repo: Repositorio de caché a usar (por defecto, el del servicio)
+        """
+        cache_repo = cache_repo or self._cache_repo
+        now = datetime.utcnow()
+        state = await cache_repo.get_refresh_state(account.account_id)
+        incremental = (
+            self._incremental_refresh and not full and state is not None
+            and now - state.full_refreshed_at < timedelta(days=self._full_reconcile_days)
+        )
+
+        if incremental:
+            loaded_after = (state.refreshed_at - timedelta(days=self.INCREMENTAL_OVERLAP_DAYS)).date()
+            new_publications = await self._download_from_scopus(account.scopus_id, loaded_after)
+            if new_publications:
+                await cache_repo.save_publications(new_publications, account.account_id)
+            await cache_repo.mark_refreshed(account.account_id, now, full=False)
+            logger.info(
+                f"Actualización incremental de {account.scopus_id} (desde {loaded_after}): "
+                f"{len(new_publications)} publicación(es) nuevas o actualizadas"
+            )
+            return await cache_repo.get_by_scopus_account(account.account_id)
+
         publications = await self._fetch_from_scopus(account.scopus_id)
-        
         if publications:
-            await self._cache_repo.save_publications(publications, account.account_id)
-        
+            await cache_repo.save_publications(publications, account.account_id)
+            removed = await cache_repo.delete_missing(
+                account.account_id, [pub.scopus_id for pub in publications]
+            )
+            await cache_repo.mark_refreshed(account.account_id, now, full=True)
+            if removed:
+                logger.info(f"Reconciliación de {account.scopus_id}: {removed} publicación(es) eliminadas de la caché")
         return publications
 
     async def _fetch_from_scopus(self, scopus_id: str) -> List[Publication]:
-        """Obtiene publicaciones desde la API de Scopus y las enriquece con SJR."""
-        raw_publications = await self._publication_repo.get_publications_by_scopus_id(scopus_id)
-        
-        publications = []
-        for raw_pub in raw_publications:
-            pub = self._transform_raw_publication(raw_pub, scopus_id)
-            pub = self._enrich_with_sjr(pub)
-            publications.append(pub)
-        
-        return publications
+        """
+        Obtiene publicaciones desde la API de Scopus y las enriquece con SJR.
+
+        Las llamadas simultáneas para la misma cuenta comparten una sola descarga.
+        """
+        publications = await self._single_flight.run(
+            ("publications", scopus_id),
+            lambda: self._download_from_scopus(scopus_id)
+        )
+        # Lista propia de cada llamada (las entidades se comparten)
+        return list(publications)
+
+    async def _download_from_scopus(self, scopus_id: str, loaded_after: Optional[date] = None) -> List[Publication]:
+        # Cada página se transforma mientras llegan las siguientes
+        publications: List[Publication] = []
+        async for raw_publications in self._publication_repo.iter_publications_by_scopus_id(scopus_id, loaded_after):
+            publications.extend(
+                self._transform_raw_publication(raw_pub, scopus_id)
+                for raw_pub in raw_publications
+            )
+        return self._enrich_with_sjr(publications)
 
     async def get_publications_by_scopus_id(
         self, 
@@ -132,6 +233,116 @@ class PublicationService:
     async def refresh_author_publications(self, author_id: UUID) -> AuthorPublicationsResponseDTO:
         return await self.get_publications_by_author(author_id, force_refresh=True)
 
+    async def harvest_affiliation(
+        self,
+        batch_size: int = 1000,
+        on_progress: Optional[Callable[[AffiliationHarvestProgress], None]] = None
+    ) -> AffiliationHarvestProgress:
+        """
+        Actualiza la caché de todas las cuentas con una sola búsqueda por la
+        institución (AF-ID de la EPN), en lugar de una búsqueda por cuenta.
+
+        Cada publicación se asigna a las cuentas registradas que figuran en su
+        lista de autores, se analiza su filiación y se guarda por lotes. La
+        caché guarda un solo registro por publicación (ligado a una cuenta),
+        así que una publicación de coautores queda sólo con una de ellas. Sólo
+        las cuentas con una descarga completa previa que recibieron todas sus
+        publicaciones vuelven a tener la caché vigente (`mark_harvested`); las
+        demás (`incomplete_accounts`) siguen con su vigencia anterior y se
+        actualizan con su propia consulta. La cosecha no mueve el punto de
+        partida de la actualización incremental: la próxima de cada cuenta
+        sigue trayendo sus publicaciones fuera de la EPN.
+
+        Args:
+            batch_size: Publicaciones acumuladas antes de enriquecer y guardar
+            on_progress: Se invoca después de cada página con el avance acumulado
+        """
+        accounts = {account.scopus_id: account for account in await self._scopus_account_repo.get_all()}
+        progress = AffiliationHarvestProgress(accounts=len(accounts))
+        logger.info(f"Cosechando AF-ID({self.EPN_AFFILIATION_ID}) para {len(accounts)} cuentas Scopus")
+        now = datetime.utcnow()
+        started = time.perf_counter()
+
+        # Por cuenta, sin repetir publicación (el upsert no admite claves duplicadas)
+        pending: Dict[UUID, Dict[str, Publication]] = {}
+        matched_accounts = set()
+        incomplete_accounts = set()
+
+        async def flush() -> None:
+            nonlocal pending
+            batch, pending = pending, {}
+            # Enriquecimiento y escritura son síncronos: en un hilo, con su propio event loop,
+            # para no detener las peticiones de la API durante toda la cosecha
+            saved, incomplete = await asyncio.to_thread(asyncio.run, self._save_harvest_batch(batch))
+            progress.saved += saved
+            incomplete_accounts.update(incomplete)
+
+        n_pending = 0
+        async for raw_publications in self._publication_repo.iter_publications_by_affiliation(self.EPN_AFFILIATION_ID):
+            for raw in raw_publications:
+                progress.entries += 1
+                matched = False
+                for author_id in self._author_ids(raw):
+                    account = accounts.get(author_id)
+                    if account is None:
+                        continue
+                    matched = True
+                    matched_accounts.add(account.account_id)
+                    publication = self._transform_raw_publication(raw, author_id)
+                    pending.setdefault(account.account_id, {})[publication.scopus_id] = publication
+                    n_pending += 1
+                progress.matched_entries += matched
+            if n_pending >= batch_size:
+                await flush()
+                n_pending = 0
+            progress.matched_accounts = len(matched_accounts)
+            progress.elapsed_seconds = time.perf_counter() - started
+            if on_progress is not None:
+                on_progress(progress)
+        await flush()
+
+        await self._cache_repo.mark_harvested(list(matched_accounts - incomplete_accounts), now)
+
+        progress.matched_accounts = len(matched_accounts)
+        progress.incomplete_accounts = len(incomplete_accounts)
+        progress.elapsed_seconds = time.perf_counter() - started
+        logger.info(
+            f"Cosecha AF-ID({self.EPN_AFFILIATION_ID}) terminada: {progress.entries} publicaciones, "
+            f"{progress.saved} guardadas para {progress.matched_accounts} cuentas en {progress.elapsed_seconds:.1f}s "
+            f"({progress.incomplete_accounts} cuentas sin marcar al día por publicaciones compartidas)"
+        )
+        return progress
+
+    async def _save_harvest_batch(self, batch: Dict[UUID, Dict[str, Publication]]) -> Tuple[int, Set[UUID]]:
+        """
+        Enriquece y guarda un lote de la cosecha por institución.
+
+        Returns:
+            Publicaciones guardadas y cuentas con alguna publicación del lote
+            guardada a nombre de otra cuenta
+        """
+        publications = [pub for account_pubs in batch.values() for pub in account_pubs.values()]
+        # Una sola consulta SJR y una sola escritura por lote
+        self._enrich_with_sjr(publications)
+        saved = await self._cache_repo.save_publications_by_account(
+            {account_id: list(account_pubs.values()) for account_id, account_pubs in batch.items()}
+        )
+        # Las publicaciones que quedaron a nombre de otra cuenta no están en la caché de ésta
+        owners = await self._cache_repo.get_owner_accounts([pub.scopus_id for pub in publications])
+        incomplete = {
+            account_id for account_id, account_pubs in batch.items()
+            if any(owners.get(scopus_id) != account_id for scopus_id in account_pubs)
+        }
+        return saved, incomplete
+
+    @staticmethod
+    def _author_ids(raw: Dict) -> List[str]:
+        """Scopus IDs (sin repetir) de los autores de una publicación."""
+        authors = raw.get("author", [])
+        if isinstance(authors, dict):
+            authors = [authors]
+        return list(dict.fromkeys(author.get("authid") for author in authors if author.get("authid")))
+
     def _transform_raw_publication(self, raw: Dict, scopus_author_id: str) -> Publication:
         """
         Transforma y aplica la lógica de validación de filiación estricta.
@@ -166,7 +377,8 @@ class PublicationService:
             
             subject_areas=[],
             categories_with_quartiles=[],
-            sjr_year_used=None
+            sjr_year_used=None,
+            sjr_edition=None
         )
     
     def _analyze_affiliation_link(self, raw: Dict, target_author_id: str) -> tuple[str, Optional[str], bool]:
@@ -258,21 +470,12 @@ class PublicationService:
         
         return "Sin filiación", None
 
-    def _enrich_with_sjr(self, publication: Publication) -> Publication:
+    def _enrich_with_sjr(self, publications: List[Publication]) -> List[Publication]:
         """
         Enriquece usando Sourceid como búsqueda primaria, con fallback por nombre de revista.
+        Todas las publicaciones se resuelven en una sola consulta por lotes al repositorio SJR.
         """
-        areas, categories_with_quartiles, sjr_year_used = self._sjr_repo.get_journal_data(
-            publication.source_id, 
-            publication.year,
-            publication.source_title
-        )
-        
-        publication.subject_areas = areas
-        publication.categories_with_quartiles = categories_with_quartiles
-        publication.sjr_year_used = sjr_year_used
-        
-        return publication
+        return enrich_with_sjr(self._sjr_repo, publications)
 
     async def get_statistics_by_author(self, author_id: UUID) -> Dict:
         author_pubs = await self.get_publications_by_author(author_id)
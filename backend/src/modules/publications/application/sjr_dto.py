@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Dict, Optional
+from pydantic import BaseModel
+
+
+class SJRReloadRequestDTO(BaseModel):
+    """DTO de solicitud para recargar el dataset SJR."""
+    # Ruta del nuevo CSV (dentro del directorio de datos); por defecto, el actual
+    csv_path: Optional[str] = None
+
+
+class SJRStatusResponseDTO(BaseModel):
+    """DTO de respuesta con el estado del dataset SJR publicado."""
+    csv_path: str
+    ready: bool
+    reloading: bool
+    max_year: int
+    last_reload_at: Optional[datetime]
+
+
+class SJRReenrichmentStatusDTO(BaseModel):
+    """DTO de respuesta con el avance de la re-aplicación del SJR a la caché."""
+    running: bool
+    # El SJR cambió durante la ejecución: se repetirá al terminar
+    rerun_pending: bool
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    total: int
+    processed: int
+    updated: int
+    elapsed_seconds: float
+    rows_per_second: float
+    # Otro worker ya la estaba ejecutando: ésta se omitió
+    skipped: bool = False
+    error: Optional[str]
+
+
+class SJRLatencyDTO(BaseModel):
+    """Histograma de latencias de una ruta de búsqueda SJR (milisegundos)."""
+    count: int
+    mean_ms: float
+    max_ms: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    # Consultas por bucket: 'le_<límite>ms' y 'inf'
+    buckets: Dict[str, int]
+
+
+class SJRMetricsResponseDTO(BaseModel):
+    """DTO de respuesta con las métricas de búsqueda SJR del proceso."""
+    since: datetime
+    # Consultas por ruta (sourceid, name, fuzzy, miss, unavailable) y year_clamped
+    counters: Dict[str, int]
+    # Latencia por ruta; en lotes se mide una vez por consulta distinta
+    latency: Dict[str, SJRLatencyDTO]
+    lookups: int
+    # Fracción de consultas con datos SJR (sourceid + name + fuzzy)
+    hit_rate: float
@@ -0,0 +1,39 @@
+"""
+Enriquecimiento SJR de publicaciones.
+
+Lo comparten el servicio de publicaciones (al traer datos de Scopus) y la
+re-aplicación del SJR sobre la caché cuando cambia el dataset.
+"""
+from typing import Dict, List, Optional, TypeVar, Union
+
+from ..domain.publication import Publication
+from ..domain.publication_cache_repository import CachedSJRFields
+from ..domain.sjr_repository import ISJRRepository
+
+Enrichable = TypeVar("Enrichable", bound=Union[Publication, CachedSJRFields])
+
+
+def enrich_with_sjr(sjr_repo: ISJRRepository, items: List[Enrichable]) -> List[Enrichable]:
+    """
+    Enriquece usando Sourceid como búsqueda primaria, con fallback por nombre de revista.
+    Todas las publicaciones se resuelven en una sola consulta por lotes al repositorio SJR.
+
+    Modifica cada elemento (áreas, categorías con cuartiles, año y edición SJR,
+    y si el match fue aproximado) y devuelve la misma lista.
+    """
+    results = sjr_repo.get_journal_data_many([
+        (item.source_id, item.year, item.source_title)
+        for item in items
+    ])
+
+    editions: Dict[int, Optional[str]] = {}
+    for item, (areas, categories_with_quartiles, sjr_year_used, fuzzy_match) in zip(items, results):
+        item.subject_areas = areas
+        item.categories_with_quartiles = categories_with_quartiles
+        item.sjr_year_used = sjr_year_used
+        item.sjr_fuzzy_match = fuzzy_match
+        if item.year not in editions:
+            editions[item.year] = sjr_repo.get_edition_for_year(item.year)
+        item.sjr_edition = editions[item.year]
+
+    return items
@@ -0,0 +1,95 @@
+""" Servicio de aplicación para re-aplicar el SJR a la caché de publicaciones. """
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .sjr_enrichment import enrich_with_sjr
+from ..domain.publication_cache_repository import IPublicationCacheRepository
+from ..domain.sjr_repository import ISJRRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SJRReenrichmentProgress:
+    """Avance de una re-aplicación del SJR sobre la caché."""
+    total: int = 0              # Publicaciones en la caché al empezar
+    processed: int = 0          # Publicaciones revisadas
+    updated: int = 0            # Publicaciones cuyos datos SJR cambiaron
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.processed / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+class SJRReenrichmentService:
+    """
+    Vuelve a aplicar el SJR vigente a las publicaciones cacheadas, sin
+    consultar Scopus: la caché ya guarda Sourceid, año y revista de cada una.
+
+    Recorre la caché por lotes y sólo escribe las publicaciones cuyas áreas,
+    categorías con cuartiles, año o edición SJR cambiaron. El acceso a BD y el
+    enriquecimiento son síncronos: conviene ejecutarlo fuera del event loop de
+    la API (ver SJRReenrichmentJob).
+    """
+
+    def __init__(self, cache_repo: IPublicationCacheRepository, sjr_repo: ISJRRepository):
+        self._cache_repo = cache_repo
+        self._sjr_repo = sjr_repo
+
+    async def reenrich(
+        self,
+        batch_size: int = 1000,
+        on_progress: Optional[Callable[[SJRReenrichmentProgress], None]] = None,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> SJRReenrichmentProgress:
+        """
+        Args:
+            batch_size: Publicaciones por lote (lectura y escritura)
+            on_progress: Se invoca después de cada lote con el avance acumulado
+            should_stop: Se consulta antes de cada lote; si devuelve True, se
+                detiene (los lotes ya escritos se conservan)
+
+        Returns:
+            El avance final (revisadas, actualizadas y tiempo total)
+        """
+        progress = SJRReenrichmentProgress(total=await self._cache_repo.count_publications())
+        logger.info(f"Re-aplicando SJR a {progress.total} publicaciones cacheadas")
+        started = time.perf_counter()
+
+        after_scopus_id = None
+        while should_stop is None or not should_stop():
+            batch = await self._cache_repo.get_sjr_fields_batch(after_scopus_id, batch_size)
+            if not batch:
+                break
+            after_scopus_id = batch[-1].scopus_id
+
+            previous = [
+                (
+                    item.subject_areas, item.categories_with_quartiles,
+                    item.sjr_year_used, item.sjr_edition, item.sjr_fuzzy_match
+                )
+                for item in batch
+            ]
+            enrich_with_sjr(self._sjr_repo, batch)
+            changed = [
+                item for item, before in zip(batch, previous)
+                if (
+                    item.subject_areas, item.categories_with_quartiles,
+                    item.sjr_year_used, item.sjr_edition, item.sjr_fuzzy_match
+                ) != before
+            ]
+            progress.updated += await self._cache_repo.update_sjr_fields(changed)
+            progress.processed += len(batch)
+            progress.elapsed_seconds = time.perf_counter() - started
+            if on_progress is not None:
+                on_progress(progress)
+
+        logger.info(
+            f"SJR re-aplicado: {progress.processed} publicaciones revisadas, {progress.updated} actualizadas "
+            f"en {progress.elapsed_seconds:.1f}s ({progress.rows_per_second:.0f} pub/s)"
+        )
+        return progress
@@ -1,12 +1,14 @@
 """Servicio para obtener áreas temáticas de un autor desde Scopus Author Retrieval."""
 
-import asyncio
 import logging
-from typing import List
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID
 
+from ..domain.author_subject_area_cache_repository import IAuthorSubjectAreaCacheRepository
 from ..domain.author_subject_area_repository import IAuthorSubjectAreaRepository
 from ...scopus_accounts.domain.scopus_account_repository import IScopusAccountRepository
+from ....shared.single_flight import SingleFlight
+from ....shared.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -18,24 +20,40 @@ class SubjectAreaService:
     Flujo:
     1. Recibe el ID interno del autor (UUID).
     2. Busca todas sus cuentas Scopus (scopus_id).
-    3. Consulta la API de Author Retrieval para cada scopus_id.
+    3. Resuelve cada scopus_id en la caché en memoria, luego en la caché en BD
+       y, sólo para los que falten, en la API de Author Retrieval por lotes
+       (varios scopus_id por petición).
     4. Fusiona las áreas temáticas eliminando duplicados.
     """
 
+    # Tiempo de validez de la caché en BD en horas (las áreas de un perfil cambian poco)
+    CACHE_MAX_AGE_HOURS = 168
+
     def __init__(
         self,
         author_sa_repo: IAuthorSubjectAreaRepository,
-        scopus_account_repo: IScopusAccountRepository
+        scopus_account_repo: IScopusAccountRepository,
+        single_flight: Optional[SingleFlight] = None,
+        cache_repo: Optional[IAuthorSubjectAreaCacheRepository] = None,
+        memory_cache: Optional[TTLCache[str, List[str]]] = None,
+        cache_max_age_hours: Optional[int] = None
     ):
         self._author_sa_repo = author_sa_repo
         self._scopus_account_repo = scopus_account_repo
+        # Consultas en curso compartidas por el proceso (ver Container); None = sólo las de este servicio
+        self._single_flight = single_flight or SingleFlight()
+        # Caché en BD (None = sin caché) y capa en memoria del proceso delante de ella
+        self._cache_repo = cache_repo
+        self._memory_cache = memory_cache
+        self._cache_max_age_hours = cache_max_age_hours or self.CACHE_MAX_AGE_HOURS
 
-    async def get_subject_areas_by_author(self, author_id: UUID) -> List[str]:
+    async def get_subject_areas_by_author(self, author_id: UUID, force_refresh: bool = False) -> List[str]:
         """
         Obtiene las áreas temáticas fusionadas de todas las cuentas Scopus de un autor.
         
         Args:
             author_id: UUID del autor en el sistema
+            force_refresh: Consultar Scopus aunque haya áreas en caché
             
         Returns:
             Lista ordenada de áreas temáticas únicas
@@ -56,18 +74,9 @@ class SubjectAreaService:
             author_id, len(scopus_ids)
         )
 
-        # 2. Consultar Author Retrieval para cada cuenta en paralelo
-        tasks = [
-            self._author_sa_repo.get_subject_areas_by_scopus_id(sid)
-            for sid in scopus_ids
-        ]
-        results = await asyncio.gather(*tasks)
-
-        # 3. Fusionar eliminando duplicados
-        merged_areas: set[str] = set()
-        for areas_list in results:
-            for area in areas_list:
-                merged_areas.add(area)
+        # 2. Consultar Author Retrieval por lotes y 3. fusionar eliminando duplicados
+        areas_by_id = await self._fetch_subject_areas_many(scopus_ids, force_refresh)
+        merged_areas = {area for areas in areas_by_id.values() for area in areas}
 
         sorted_areas = sorted(merged_areas)
         logger.info(
@@ -77,16 +86,116 @@ class SubjectAreaService:
 
         return sorted_areas
 
-    async def get_subject_areas_by_scopus_id(self, scopus_id: str) -> List[str]:
+    async def get_merged_subject_areas(
+        self,
+        author_ids: Iterable[UUID],
+        scopus_ids: Iterable[str] = (),
+        force_refresh: bool = False
+    ) -> List[str]:
+        """
+        Áreas temáticas fusionadas de varios autores y cuentas Scopus sueltas
+        (p. ej. para un certificado), con una sola consulta por lotes.
+
+        Args:
+            author_ids: UUIDs de autores del sistema (sin cuentas: se ignoran)
+            scopus_ids: IDs de autores en Scopus consultados directamente
+            force_refresh: Consultar Scopus aunque haya áreas en caché
+
+        Returns:
+            Lista ordenada de áreas temáticas únicas
+        """
+        all_scopus_ids = list(scopus_ids)
+        for author_id in dict.fromkeys(author_ids):
+            accounts = await self._scopus_account_repo.get_by_author(author_id)
+            all_scopus_ids.extend(account.scopus_id for account in accounts)
+
+        if not all_scopus_ids:
+            return []
+        areas_by_id = await self._fetch_subject_areas_many(all_scopus_ids, force_refresh)
+        return sorted({area for areas in areas_by_id.values() for area in areas})
+
+    async def get_subject_areas_by_scopus_id(self, scopus_id: str, force_refresh: bool = False) -> List[str]:
         """
         Obtiene las áreas temáticas de una sola cuenta Scopus.
         
         Args:
             scopus_id: ID del autor en Scopus
+            force_refresh: Consultar Scopus aunque haya áreas en caché
             
         Returns:
             Lista ordenada de áreas temáticas
         """
-        areas = await self._author_sa_repo.get_subject_areas_by_scopus_id(scopus_id)
-        return sorted(set(areas))
+        areas_by_id = await self._fetch_subject_areas_many([scopus_id], force_refresh)
+        return sorted(set(areas_by_id.get(scopus_id, [])))
+
+    async def _fetch_subject_areas_many(
+        self,
+        scopus_ids: List[str],
+        force_refresh: bool = False
+    ) -> Dict[str, List[str]]:
+        """
+        Áreas temáticas por scopus_id: memoria del proceso, después BD y, para
+        los que falten (o todos, si se fuerza), Author Retrieval por lotes.
+
+        Los perfiles que no se pudieron consultar en Scopus no aparecen en el
+        resultado ni se cachean.
+        """
+        unique_ids = sorted(set(scopus_ids))
+        areas_by_id: Dict[str, List[str]] = {}
+
+        if not force_refresh:
+            if self._memory_cache is not None:
+                areas_by_id.update(self._memory_cache.get_many(unique_ids))
+            missing = [sid for sid in unique_ids if sid not in areas_by_id]
+            if missing and self._cache_repo is not None:
+                cached = await self._cache_repo.get_fresh(missing, self._cache_max_age_hours)
+                if cached and self._memory_cache is not None:
+                    self._memory_cache.set_many(cached)
+                areas_by_id.update(cached)
+
+        missing = [sid for sid in unique_ids if sid not in areas_by_id]
+        if missing:
+            logger.info(
+                "Subject areas: %d de %d perfiles en caché, %d se consultan en Scopus",
+                len(unique_ids) - len(missing), len(unique_ids), len(missing)
+            )
+            fetched = await self._download_subject_areas(missing)
+            areas_by_id.update(fetched)
+            await self._save_to_cache(fetched)
+
+        return areas_by_id
+
+    async def _download_subject_areas(self, scopus_ids: List[str]) -> Dict[str, List[str]]:
+        """
+        Consulta Author Retrieval; las consultas idénticas simultáneas se comparten.
+        Ante un error de la API los perfiles quedan fuera del resultado.
+        """
+        try:
+            if len(scopus_ids) == 1:
+                scopus_id = scopus_ids[0]
+                areas = await self._single_flight.run(
+                    ("subject_areas", scopus_id),
+                    lambda: self._author_sa_repo.get_subject_areas_by_scopus_id(scopus_id)
+                )
+                return {scopus_id: areas}
+            key = tuple(scopus_ids)
+            return await self._single_flight.run(
+                ("subject_areas_batch", key),
+                lambda: self._author_sa_repo.get_subject_areas_by_scopus_ids(list(key))
+            )
+        except Exception as e:
+            logger.error("Error al obtener subject areas de %d perfiles en Scopus: %s", len(scopus_ids), str(e))
+            return {}
 
+    async def _save_to_cache(self, areas_by_id: Dict[str, List[str]]) -> None:
+        # Los errores de la API no llegan aquí: una lista vacía es un perfil sin
+        # áreas y también se cachea
+        if not areas_by_id:
+            return
+        if self._memory_cache is not None:
+            self._memory_cache.set_many(areas_by_id)
+        if self._cache_repo is not None:
+            try:
+                await self._cache_repo.save_many(areas_by_id)
+            except Exception as e:
+                logger.error("Error al guardar subject areas en caché: %s", str(e))
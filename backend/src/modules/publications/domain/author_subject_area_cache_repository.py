@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+
+class IAuthorSubjectAreaCacheRepository(ABC):
+    """
+    Interfaz del repositorio de caché de áreas temáticas de perfiles de
+    Scopus (respuestas de Author Retrieval), por scopus_id.
+    """
+
+    @abstractmethod
+    async def get_fresh(self, scopus_ids: List[str], max_age_hours: int) -> Dict[str, List[str]]:
+        """
+        Obtiene las áreas temáticas cacheadas y vigentes.
+
+        Args:
+            scopus_ids: IDs de autores en Scopus
+            max_age_hours: Antigüedad máxima en horas
+
+        Returns:
+            Diccionario scopus_id -> áreas temáticas, sólo de los perfiles en caché y vigentes
+        """
+        pass
+
+    @abstractmethod
+    async def save_many(self, areas_by_scopus_id: Dict[str, List[str]]) -> int:
+        """
+        Guarda o actualiza las áreas temáticas de varios perfiles.
+
+        Returns:
+            Número de perfiles guardados
+        """
+        pass
@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List
 
 
 class IAuthorSubjectAreaRepository(ABC):
@@ -17,6 +18,36 @@ class IAuthorSubjectAreaRepository(ABC):
             scopus_id: ID del autor en Scopus
             
         Returns:
-            Lista de nombres de áreas temáticas (ej: ["Computer Science", "Engineering"])
+            Lista de nombres de áreas temáticas (ej: ["Computer Science", "Engineering"]);
+            vacía sólo si el perfil no tiene áreas
+
+        Raises:
+            Exception: Si no se pudo consultar la API (no se devuelve una lista vacía)
         """
         ...
+
+    async def get_subject_areas_by_scopus_ids(self, scopus_ids: List[str]) -> Dict[str, List[str]]:
+        """
+        Obtiene las áreas temáticas de varios perfiles de Scopus.
+
+        Por defecto consulta cada perfil por separado; las implementaciones que
+        admitan consultas por lotes deben sobrescribirlo.
+
+        Args:
+            scopus_ids: IDs de autores en Scopus
+
+        Returns:
+            Diccionario scopus_id -> lista de áreas temáticas; los perfiles que no
+            se pudieron obtener no aparecen
+
+        Raises:
+            Exception: Si no se pudo obtener ningún perfil
+        """
+        unique_ids = list(dict.fromkeys(scopus_ids))
+        results = await asyncio.gather(
+            *(self.get_subject_areas_by_scopus_id(sid) for sid in unique_ids), return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors and len(errors) == len(results):
+            raise errors[0]
+        return {sid: areas for sid, areas in zip(unique_ids, results) if not isinstance(areas, BaseException)}
@@ -38,6 +38,11 @@ class Publication:
     categories_with_quartiles: List[str] = field(default_factory=list)
     # Año del SJR utilizado (para años futuros se mapea al último disponible)
     sjr_year_used: Optional[int] = None
+    # Edición SJR (exportación del CSV) de la que provienen los datos de ese año
+    sjr_edition: Optional[str] = None
+    # Los datos SJR salieron del fallback aproximado por título (no por Sourceid ni
+    # nombre exacto): conviene revisarlos antes de certificar
+    sjr_fuzzy_match: bool = False
 
     def has_institutional_affiliation(self, institution_keywords: List[str]) -> bool:
         """
@@ -1,10 +1,38 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from .publication import Publication
 
 
+@dataclass
+class CachedSJRFields:
+    """
+    Datos de una publicación cacheada que intervienen en el enriquecimiento
+    SJR: la clave de búsqueda (revista y año) y el resultado guardado.
+    """
+    scopus_id: str
+    source_id: Optional[str]
+    year: int
+    source_title: str
+    subject_areas: List[str] = field(default_factory=list)
+    categories_with_quartiles: List[str] = field(default_factory=list)
+    sjr_year_used: Optional[int] = None
+    sjr_edition: Optional[str] = None
+    sjr_fuzzy_match: bool = False
+
+
+@dataclass
+class CacheRefreshState:
+    """Última actualización de la caché de una cuenta Scopus."""
+    scopus_account_id: UUID
+    refreshed_at: datetime        # Última actualización correcta (incremental o completa)
+    full_refreshed_at: datetime   # Última descarga completa
+    harvested_at: Optional[datetime] = None  # Última cosecha por institución (ver mark_harvested)
+
+
 class IPublicationCacheRepository(ABC):
     """
     Interfaz del repositorio de caché de publicaciones.
@@ -57,6 +85,36 @@ class IPublicationCacheRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def save_publications_by_account(self, publications_by_account: Dict[UUID, List[Publication]]) -> int:
+        """
+        Guarda de una vez las publicaciones de varias cuentas Scopus.
+
+        Cada publicación ocupa un solo registro: si aparece en varias
+        cuentas, se guarda con la primera (o con la cuenta a la que ya estaba
+        ligada; ver `get_owner_accounts`).
+
+        Args:
+            publications_by_account: Publicaciones por ID de cuenta Scopus
+
+        Returns:
+            Número de publicaciones guardadas/actualizadas
+        """
+        pass
+
+    @abstractmethod
+    async def get_owner_accounts(self, scopus_ids: List[str]) -> Dict[str, UUID]:
+        """
+        Obtiene la cuenta Scopus a la que está ligada cada publicación cacheada.
+
+        Args:
+            scopus_ids: Scopus IDs de las publicaciones
+
+        Returns:
+            ID de cuenta por Scopus ID (las que no están en caché se omiten)
+        """
+        pass
+
     @abstractmethod
     async def is_cache_valid(self, scopus_account_id: UUID, max_age_hours: int = 24) -> bool:
         """
@@ -83,3 +141,99 @@ class IPublicationCacheRepository(ABC):
             Número de registros eliminados
         """
         pass
+
+    @abstractmethod
+    async def delete_missing(self, scopus_account_id: UUID, keep_scopus_ids: List[str]) -> int:
+        """
+        Elimina de la caché de una cuenta las publicaciones que ya no
+        devuelve Scopus (tras una descarga completa).
+
+        Args:
+            scopus_account_id: ID de la cuenta Scopus
+            keep_scopus_ids: Scopus IDs de la descarga completa
+
+        Returns:
+            Número de registros eliminados
+        """
+        pass
+
+    @abstractmethod
+    async def get_refresh_state(self, scopus_account_id: UUID) -> Optional[CacheRefreshState]:
+        """
+        Obtiene la última actualización de la caché de una cuenta.
+
+        Returns:
+            Estado de actualización, o None si nunca se registró
+        """
+        pass
+
+    @abstractmethod
+    async def mark_refreshed(self, scopus_account_id: UUID, refreshed_at: datetime, full: bool) -> None:
+        """
+        Registra una actualización correcta de la caché de una cuenta.
+
+        Args:
+            scopus_account_id: ID de la cuenta Scopus
+            refreshed_at: Momento de la actualización (UTC)
+            full: True si fue una descarga completa
+        """
+        pass
+
+    @abstractmethod
+    async def mark_harvested(self, scopus_account_ids: List[UUID], harvested_at: datetime) -> None:
+        """
+        Registra que la cosecha por institución dejó al día la caché de las
+        cuentas: la caché vuelve a estar vigente, pero la próxima actualización
+        incremental sigue partiendo de `refreshed_at` (la cosecha no trae las
+        publicaciones fuera de la institución).
+
+        Sólo afecta a las cuentas con un estado de actualización registrado.
+
+        Args:
+            scopus_account_ids: IDs de las cuentas Scopus
+            harvested_at: Momento de la cosecha (UTC)
+        """
+        pass
+
+    @abstractmethod
+    async def count_publications(self) -> int:
+        """
+        Cuenta todas las publicaciones de la caché.
+
+        Returns:
+            Número de publicaciones cacheadas
+        """
+        pass
+
+    @abstractmethod
+    async def get_sjr_fields_batch(
+        self,
+        after_scopus_id: Optional[str],
+        limit: int
+    ) -> List[CachedSJRFields]:
+        """
+        Obtiene un lote de publicaciones cacheadas (sólo los datos SJR),
+        ordenadas por Scopus ID, para recorrer la caché completa por lotes.
+
+        Args:
+            after_scopus_id: Último Scopus ID del lote anterior (None = desde el inicio)
+            limit: Tamaño máximo del lote
+
+        Returns:
+            Lote de publicaciones; vacío al terminar
+        """
+        pass
+
+    @abstractmethod
+    async def update_sjr_fields(self, records: List[CachedSJRFields]) -> int:
+        """
+        Actualiza masivamente los datos SJR (áreas, categorías, año y edición
+        SJR) de publicaciones cacheadas, sin tocar la vigencia de la caché.
+
+        Args:
+            records: Publicaciones con los datos SJR nuevos
+
+        Returns:
+            Número de publicaciones actualizadas
+        """
+        pass
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from datetime import date
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 
 class IPublicationRepository(ABC):
@@ -23,6 +24,42 @@ class IPublicationRepository(ABC):
         """
         pass
 
+    async def iter_publications_by_scopus_id(
+        self,
+        scopus_author_id: str,
+        loaded_after: Optional[date] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Entrega las publicaciones de un autor por lotes, a medida que llegan
+        (p. ej. página a página), para procesarlas sin esperar al total.
+
+        Por defecto entrega todas en un único lote (sin filtrar por `loaded_after`,
+        que sólo reduce la descarga).
+
+        Args:
+            scopus_author_id: ID del autor en Scopus
+            loaded_after: Sólo documentos incorporados a la fuente después de
+                esta fecha (actualización incremental); None = todos
+
+        Yields:
+            Listas de diccionarios con los datos crudos de las publicaciones
+        """
+        yield await self.get_publications_by_scopus_id(scopus_author_id)
+
+    @abstractmethod
+    async def iter_publications_by_affiliation(self, affiliation_id: str) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Entrega por lotes todas las publicaciones de una institución, con la
+        lista de autores de cada una (para repartirlas entre sus cuentas).
+
+        Args:
+            affiliation_id: ID de la institución en la fuente (AF-ID en Scopus)
+
+        Yields:
+            Listas de diccionarios con los datos crudos de las publicaciones
+        """
+        pass
+
     @abstractmethod
     async def get_publication_details(self, scopus_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -0,0 +1,19 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class SJRJournal:
+    """
+    Entidad de dominio que representa una revista del SJR con sus datos
+    (áreas y categorías con cuartiles) para un año.
+    """
+    title: str                  # Título tal como aparece en el SJR
+    source_ids: List[str] = field(default_factory=list)  # Sourceids de la revista
+    years: List[int] = field(default_factory=list)       # Años con datos SJR
+
+    # Datos SJR del año consultado (o del más reciente de la revista)
+    sjr_year: Optional[int] = None
+    sjr_edition: Optional[str] = None
+    subject_areas: List[str] = field(default_factory=list)
+    categories_with_quartiles: List[str] = field(default_factory=list)
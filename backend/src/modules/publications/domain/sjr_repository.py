@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from .sjr_journal import SJRJournal
 
 
 class ISJRRepository(ABC):
@@ -20,6 +22,21 @@ class ISJRRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_edition_for_year(self, publication_year: int) -> Optional[str]:
+        """
+        Obtiene la edición SJR (exportación del CSV) usada para un año de publicación.
+
+        Se aplica el mismo mapeo dinámico de años que en `get_journal_data`.
+
+        Args:
+            publication_year: Año de publicación del artículo
+
+        Returns:
+            Nombre de la edición SJR, o None si ninguna cubre ese año
+        """
+        pass
+
     @abstractmethod
     def get_journal_data(
         self, 
@@ -33,6 +50,7 @@ class ISJRRepository(ABC):
         Estrategia de búsqueda:
         1. Búsqueda primaria por Sourceid (identificador único de la revista)
         2. Fallback por nombre normalizado de revista
+        3. Fallback aproximado por título, si el backend lo tiene y está activado
         
         Si el año solicitado es mayor al disponible, utiliza el último año
         disponible (mapeo dinámico).
@@ -50,6 +68,74 @@ class ISJRRepository(ABC):
         """
         pass
 
+    def get_journal_data_many(
+        self,
+        queries: List[Tuple[Optional[str], int, str]]
+    ) -> List[Tuple[List[str], List[str], int, bool]]:
+        """
+        Obtiene los datos SJR de varias publicaciones en una sola llamada.
+
+        Las consultas repetidas (misma revista y año) se resuelven una sola vez.
+        Las implementaciones pueden redefinirlo para evitar trabajo por consulta.
+
+        Args:
+            queries: Lista de (source_id, publication_year, source_title)
+
+        Returns:
+            Lista con el resultado de `get_journal_data` para cada consulta,
+            en el mismo orden, más un indicador de si el match salió del
+            fallback aproximado por título (siempre False si el backend no lo tiene)
+        """
+        resolved: Dict[Tuple[Optional[str], int, str], Tuple[List[str], List[str], int]] = {}
+        results = []
+        for query in queries:
+            if query not in resolved:
+                resolved[query] = self.get_journal_data(*query)
+            areas, categories, sjr_year = resolved[query]
+            # Listas propias por publicación: no se comparten entre entidades
+            results.append((list(areas), list(categories), sjr_year, False))
+        return results
+
+    @abstractmethod
+    def search_journals(
+        self,
+        query: str,
+        limit: int = 10,
+        publication_year: Optional[int] = None
+    ) -> List[SJRJournal]:
+        """
+        Busca revistas cuyo nombre normalizado empieza por la consulta o la
+        contiene a partir del inicio de una palabra (autocompletado).
+
+        Args:
+            query: Texto a buscar (se normaliza como los nombres de revista)
+            limit: Número máximo de revistas
+            publication_year: Año para los cuartiles (por defecto, el más
+                reciente de cada revista; se aplica el mapeo dinámico de años)
+
+        Returns:
+            Revistas encontradas, en orden alfabético
+        """
+        pass
+
+    @abstractmethod
+    def get_journal_by_sourceid(
+        self,
+        source_id: str,
+        publication_year: Optional[int] = None
+    ) -> Optional[SJRJournal]:
+        """
+        Obtiene una revista por su Sourceid.
+
+        Args:
+            source_id: Sourceid de la revista en Scopus/SJR
+            publication_year: Año para los cuartiles (ver `search_journals`)
+
+        Returns:
+            La revista, o None si el Sourceid no está en el SJR
+        """
+        pass
+
     @abstractmethod
     def normalize_journal_name(self, name: str) -> str:
         """
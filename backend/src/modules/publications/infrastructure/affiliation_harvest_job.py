@@ -0,0 +1,137 @@
+"""
+Cosecha de publicaciones por institución en segundo plano.
+
+Recorre una sola vez la búsqueda `AF-ID(...)` de la EPN y actualiza la caché
+de todas las cuentas Scopus registradas (ver
+PublicationService.harvest_affiliation), a demanda o cada cierto intervalo.
+Se ejecuta una sola cosecha a la vez. Con varios workers, un advisory lock de
+PostgreSQL garantiza que sólo uno la ejecute; los demás la omiten.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..application.publication_service import AffiliationHarvestProgress, PublicationService
+
+logger = logging.getLogger(__name__)
+
+# Clave del advisory lock de PostgreSQL compartido por todos los workers
+HARVEST_LOCK_KEY = 5_394_003
+
+
+class AffiliationHarvestJob:
+    """Coordina las cosechas por institución del proceso."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        service_factory: Callable[[Session], PublicationService],
+        batch_size: int = 1000
+    ):
+        """
+        Args:
+            session_factory: Crea una sesión de BD propia para cada ejecución
+            service_factory: Crea el servicio de publicaciones sobre esa sesión
+            batch_size: Publicaciones por lote de escritura
+        """
+        self._session_factory = session_factory
+        self._service_factory = service_factory
+        self._batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self._progress = AffiliationHarvestProgress()
+        self._started_at: Optional[datetime] = None
+        self._finished_at: Optional[datetime] = None
+        self._skipped = False
+        self._error: Optional[str] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> bool:
+        """
+        Programa una cosecha en el event loop actual.
+
+        Returns:
+            True si empezó; False si ya había una en curso
+        """
+        if self.is_running:
+            return False
+        self._task = asyncio.create_task(self._run())
+        return True
+
+    async def schedule(self, interval_hours: float) -> None:
+        """Lanza una cosecha cada `interval_hours` (la primera tras el primer intervalo)."""
+        while True:
+            await asyncio.sleep(interval_hours * 3600)
+            if not self.start():
+                logger.info("Cosecha por institución aún en curso, se omite la programada")
+
+    async def stop(self) -> None:
+        """Cancela la ejecución en curso (al apagar la API)."""
+        if self.is_running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        self._progress = AffiliationHarvestProgress()
+        self._started_at = datetime.now(timezone.utc)
+        self._finished_at = None
+        self._skipped = False
+        self._error = None
+        session = self._session_factory()
+        lock_connection = None
+        try:
+            # Conexión propia para el advisory lock: la sesión cambia de conexión en cada commit
+            lock_connection = session.get_bind().connect()
+            acquired = lock_connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": HARVEST_LOCK_KEY}
+            ).scalar()
+            if not acquired:
+                logger.info("Otro worker está cosechando por institución, se omite")
+                self._skipped = True
+                return
+            try:
+                service = self._service_factory(session)
+                self._progress = await service.harvest_affiliation(self._batch_size, on_progress=self._on_progress)
+            finally:
+                lock_connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": HARVEST_LOCK_KEY})
+        except asyncio.CancelledError:
+            self._error = "Cancelada"
+            raise
+        except Exception as e:
+            logger.error(f"Error en la cosecha por institución: {e}", exc_info=True)
+            self._error = str(e)
+        finally:
+            if lock_connection is not None:
+                lock_connection.close()
+            session.close()
+            self._finished_at = datetime.now(timezone.utc)
+
+    def _on_progress(self, progress: AffiliationHarvestProgress) -> None:
+        self._progress = progress
+
+    def status(self) -> Dict:
+        progress = self._progress
+        return {
+            "running": self.is_running,
+            "started_at": self._started_at,
+            "finished_at": self._finished_at,
+            "accounts": progress.accounts,
+            "entries": progress.entries,
+            "matched_entries": progress.matched_entries,
+            "saved": progress.saved,
+            "matched_accounts": progress.matched_accounts,
+            "incomplete_accounts": progress.incomplete_accounts,
+            "elapsed_seconds": progress.elapsed_seconds,
+            "entries_per_second": progress.entries_per_second,
+            "skipped": self._skipped,
+            "error": self._error,
+        }
@@ -0,0 +1,21 @@
+"""
+Modelo SQLAlchemy para caché de áreas temáticas de autores.
+
+Guarda, por perfil de Scopus, las áreas temáticas devueltas por Author
+Retrieval, que cambian muy poco, para no consultarlas en cada certificado.
+"""
+from sqlalchemy import Column, DateTime, JSON, String
+from sqlalchemy.sql import func
+
+from ....shared.database import Base
+
+
+class AuthorSubjectAreaCacheModel(Base):
+    """Áreas temáticas del perfil de un autor en Scopus."""
+    __tablename__ = 'author_subject_area_cache'
+
+    # ID del autor en Scopus (el de la cuenta Scopus o uno consultado directamente)
+    scopus_id = Column(String(50), primary_key=True)
+    # Nombres completos de las áreas temáticas
+    subject_areas = Column(JSON, nullable=False, default=list)
+    cached_at = Column(DateTime, default=func.now(), nullable=False)
@@ -0,0 +1,60 @@
+"""Repositorio de caché de áreas temáticas de autores usando PostgreSQL."""
+
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from .author_subject_area_cache_model import AuthorSubjectAreaCacheModel
+from ..domain.author_subject_area_cache_repository import IAuthorSubjectAreaCacheRepository
+
+
+class DBAuthorSubjectAreaCacheRepository(IAuthorSubjectAreaCacheRepository):
+    """
+    Implementación del repositorio de caché de áreas temáticas usando PostgreSQL.
+    """
+
+    def __init__(self, db: Session):
+        self._db = db
+
+    async def get_fresh(self, scopus_ids: List[str], max_age_hours: int) -> Dict[str, List[str]]:
+        """Lee en una sola consulta las áreas cacheadas no más antiguas que max_age_hours."""
+        if not scopus_ids:
+            return {}
+        cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
+        rows = self._db.query(
+            AuthorSubjectAreaCacheModel.scopus_id,
+            AuthorSubjectAreaCacheModel.subject_areas
+        ).filter(
+            AuthorSubjectAreaCacheModel.scopus_id.in_(scopus_ids),
+            AuthorSubjectAreaCacheModel.cached_at >= cutoff_time
+        ).all()
+        return {scopus_id: subject_areas or [] for scopus_id, subject_areas in rows}
+
+    async def save_many(self, areas_by_scopus_id: Dict[str, List[str]]) -> int:
+        """Upsert de todos los perfiles en una sola sentencia."""
+        if not areas_by_scopus_id:
+            return 0
+
+        now = datetime.utcnow()
+        records = [
+            {"scopus_id": scopus_id, "subject_areas": areas, "cached_at": now}
+            for scopus_id, areas in areas_by_scopus_id.items()
+        ]
+        stmt = insert(AuthorSubjectAreaCacheModel).values(records)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['scopus_id'],
+            set_={
+                "subject_areas": stmt.excluded.subject_areas,
+                "cached_at": stmt.excluded.cached_at
+            }
+        )
+
+        try:
+            self._db.execute(stmt)
+            self._db.commit()
+        except Exception as e:
+            self._db.rollback()
+            raise e
+        return len(records)
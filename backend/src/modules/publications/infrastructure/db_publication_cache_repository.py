@@ -2,14 +2,16 @@
 
 from sqlalchemy.dialects.postgresql import insert
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
+from sqlalchemy import bindparam, func
 from sqlalchemy.orm import Session
 
 from .publication_cache_model import PublicationCacheModel
+from .publication_cache_refresh_model import PublicationCacheRefreshModel
 from ..domain.publication import Publication
-from ..domain.publication_cache_repository import IPublicationCacheRepository
+from ..domain.publication_cache_repository import CacheRefreshState, CachedSJRFields, IPublicationCacheRepository
 
 
 class DBPublicationCacheRepository(IPublicationCacheRepository):
@@ -54,31 +56,34 @@ class DBPublicationCacheRepository(IPublicationCacheRepository):
         if not publications:
             return 0
 
-        # Preparamos los diccionarios de datos
-        records = []
-        for pub in publications:
-            model = self._entity_to_model(pub, scopus_account_id)
-            # Convertimos el modelo SQLAlchemy a diccionario para el insert core
-            record = {
-                "scopus_id": model.scopus_id,
-                "eid": model.eid,
-                "doi": model.doi,
-                "source_id": model.source_id,
-                "title": model.title,
-                "year": model.year,
-                "publication_date": model.publication_date,
-                "source_title": model.source_title,
-                "document_type": model.document_type,
-                "affiliation_name": model.affiliation_name,
-                "affiliation_id": model.affiliation_id,
-                "subject_areas": model.subject_areas,
-                "categories_with_quartiles": model.categories_with_quartiles,
-                "sjr_year_used": model.sjr_year_used,
-                "scopus_account_id": model.scopus_account_id,
-                "cached_at": model.cached_at
-            }
-            records.append(record)
+        records = [self._entity_to_record(pub, scopus_account_id) for pub in publications]
+        self._upsert_records(records)
+        return len(publications)
+
+    async def save_publications_by_account(self, publications_by_account: Dict[UUID, List[Publication]]) -> int:
+        """Upsert de las publicaciones de varias cuentas en una sola sentencia."""
+        records: Dict[str, dict] = {}
+        for scopus_account_id, publications in publications_by_account.items():
+            for pub in publications:
+                # Una fila por publicación: la conserva la primera cuenta (como en el upsert)
+                if pub.scopus_id not in records:
+                    records[pub.scopus_id] = self._entity_to_record(pub, scopus_account_id)
+        if not records:
+            return 0
+        self._upsert_records(list(records.values()))
+        return len(records)
+
+    async def get_owner_accounts(self, scopus_ids: List[str]) -> Dict[str, UUID]:
+        """Cuenta de cada publicación cacheada, en una sola consulta."""
+        if not scopus_ids:
+            return {}
+        rows = self._db.query(
+            PublicationCacheModel.scopus_id,
+            PublicationCacheModel.scopus_account_id
+        ).filter(PublicationCacheModel.scopus_id.in_(scopus_ids)).all()
+        return {scopus_id: scopus_account_id for scopus_id, scopus_account_id in rows}
 
+    def _upsert_records(self, records: List[dict]) -> None:
         # Definimos la sentencia de inserción
         stmt = insert(PublicationCacheModel).values(records)
 
@@ -99,7 +104,6 @@ class DBPublicationCacheRepository(IPublicationCacheRepository):
         try:
             self._db.execute(stmt)
             self._db.commit()
-            return len(publications)
         except Exception as e:
             self._db.rollback()
             raise e
@@ -107,6 +111,14 @@ class DBPublicationCacheRepository(IPublicationCacheRepository):
     async def is_cache_valid(self, scopus_account_id: UUID, max_age_hours: int = 24) -> bool:
         """Verifica si la caché está vigente (no más antigua que max_age_hours)."""
         cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
+
+        # Una actualización incremental sin novedades no modifica las filas
+        state = self._db.get(PublicationCacheRefreshModel, scopus_account_id)
+        if state is not None:
+            # La cosecha por institución también la deja vigente
+            return state.refreshed_at >= cutoff_time or (
+                state.harvested_at is not None and state.harvested_at >= cutoff_time
+            )
         
         # Buscar la publicación más reciente cacheada
         newest = self._db.query(PublicationCacheModel).filter(
@@ -121,10 +133,179 @@ class DBPublicationCacheRepository(IPublicationCacheRepository):
         deleted = self._db.query(PublicationCacheModel).filter(
             PublicationCacheModel.scopus_account_id == scopus_account_id
         ).delete()
+        # La próxima actualización vuelve a ser completa
+        self._db.query(PublicationCacheRefreshModel).filter(
+            PublicationCacheRefreshModel.scopus_account_id == scopus_account_id
+        ).delete()
         
         self._db.commit()
         return deleted
 
+    async def delete_missing(self, scopus_account_id: UUID, keep_scopus_ids: List[str]) -> int:
+        """Elimina las publicaciones de la cuenta que no están en `keep_scopus_ids`."""
+        cached_ids = {
+            row.scopus_id for row in self._db.query(PublicationCacheModel.scopus_id).filter(
+                PublicationCacheModel.scopus_account_id == scopus_account_id
+            )
+        }
+        missing = list(cached_ids.difference(keep_scopus_ids))
+        if not missing:
+            return 0
+
+        try:
+            deleted = self._db.query(PublicationCacheModel).filter(
+                PublicationCacheModel.scopus_id.in_(missing)
+            ).delete(synchronize_session=False)
+            self._db.commit()
+            return deleted
+        except Exception as e:
+            self._db.rollback()
+            raise e
+
+    async def get_refresh_state(self, scopus_account_id: UUID) -> Optional[CacheRefreshState]:
+        model = self._db.get(PublicationCacheRefreshModel, scopus_account_id)
+        if model is None:
+            return None
+        return CacheRefreshState(
+            scopus_account_id=model.scopus_account_id,
+            refreshed_at=model.refreshed_at,
+            full_refreshed_at=model.full_refreshed_at,
+            harvested_at=model.harvested_at
+        )
+
+    async def mark_refreshed(self, scopus_account_id: UUID, refreshed_at: datetime, full: bool) -> None:
+        """Upsert del estado de actualización de la cuenta."""
+        stmt = insert(PublicationCacheRefreshModel).values(
+            scopus_account_id=scopus_account_id,
+            refreshed_at=refreshed_at,
+            full_refreshed_at=refreshed_at
+        )
+        updated_columns = ['refreshed_at', 'full_refreshed_at'] if full else ['refreshed_at']
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['scopus_account_id'],
+            set_={column: stmt.excluded[column] for column in updated_columns}
+        )
+
+        try:
+            self._db.execute(stmt)
+            self._db.commit()
+        except Exception as e:
+            self._db.rollback()
+            raise e
+
+    async def mark_harvested(self, scopus_account_ids: List[UUID], harvested_at: datetime) -> None:
+        """Actualiza `harvested_at` de las cuentas que ya tienen estado de actualización."""
+        if not scopus_account_ids:
+            return
+        try:
+            self._db.query(PublicationCacheRefreshModel).filter(
+                PublicationCacheRefreshModel.scopus_account_id.in_(scopus_account_ids)
+            ).update({PublicationCacheRefreshModel.harvested_at: harvested_at}, synchronize_session=False)
+            self._db.commit()
+        except Exception as e:
+            self._db.rollback()
+            raise e
+
+    async def count_publications(self) -> int:
+        return self._db.query(func.count(PublicationCacheModel.id)).scalar() or 0
+
+    async def get_sjr_fields_batch(
+        self,
+        after_scopus_id: Optional[str],
+        limit: int
+    ) -> List[CachedSJRFields]:
+        """Lote ordenado por scopus_id (paginación por clave, sin OFFSET)."""
+        query = self._db.query(
+            PublicationCacheModel.scopus_id,
+            PublicationCacheModel.source_id,
+            PublicationCacheModel.year,
+            PublicationCacheModel.source_title,
+            PublicationCacheModel.subject_areas,
+            PublicationCacheModel.categories_with_quartiles,
+            PublicationCacheModel.sjr_year_used,
+            PublicationCacheModel.sjr_edition,
+            PublicationCacheModel.sjr_fuzzy_match
+        )
+        if after_scopus_id is not None:
+            query = query.filter(PublicationCacheModel.scopus_id > after_scopus_id)
+        rows = query.order_by(PublicationCacheModel.scopus_id).limit(limit).all()
+
+        return [
+            CachedSJRFields(
+                scopus_id=row.scopus_id,
+                source_id=row.source_id,
+                year=row.year,
+                source_title=row.source_title or "",
+                subject_areas=row.subject_areas or [],
+                categories_with_quartiles=row.categories_with_quartiles or [],
+                sjr_year_used=row.sjr_year_used,
+                sjr_edition=row.sjr_edition,
+                sjr_fuzzy_match=bool(row.sjr_fuzzy_match)
+            )
+            for row in rows
+        ]
+
+    async def update_sjr_fields(self, records: List[CachedSJRFields]) -> int:
+        """Actualización masiva en una sola sentencia ejecutada por lotes (executemany)."""
+        if not records:
+            return 0
+
+        table = PublicationCacheModel.__table__
+        stmt = (
+            table.update()
+            .where(table.c.scopus_id == bindparam("key_scopus_id"))
+            .values(
+                subject_areas=bindparam("new_subject_areas"),
+                categories_with_quartiles=bindparam("new_categories_with_quartiles"),
+                sjr_year_used=bindparam("new_sjr_year_used"),
+                sjr_edition=bindparam("new_sjr_edition"),
+                sjr_fuzzy_match=bindparam("new_sjr_fuzzy_match")
+            )
+        )
+        params = [
+            {
+                "key_scopus_id": record.scopus_id,
+                "new_subject_areas": record.subject_areas,
+                "new_categories_with_quartiles": record.categories_with_quartiles,
+                "new_sjr_year_used": record.sjr_year_used,
+                "new_sjr_edition": record.sjr_edition,
+                "new_sjr_fuzzy_match": record.sjr_fuzzy_match
+            }
+            for record in records
+        ]
+
+        try:
+            self._db.execute(stmt, params)
+            self._db.commit()
+            return len(records)
+        except Exception as e:
+            self._db.rollback()
+            raise e
+
+    def _entity_to_record(self, pub: Publication, scopus_account_id: UUID) -> dict:
+        """Fila para el insert core a partir de una entidad de dominio."""
+        model = self._entity_to_model(pub, scopus_account_id)
+        return {
+            "scopus_id": model.scopus_id,
+            "eid": model.eid,
+            "doi": model.doi,
+            "source_id": model.source_id,
+            "title": model.title,
+            "year": model.year,
+            "publication_date": model.publication_date,
+            "source_title": model.source_title,
+            "document_type": model.document_type,
+            "affiliation_name": model.affiliation_name,
+            "affiliation_id": model.affiliation_id,
+            "subject_areas": model.subject_areas,
+            "categories_with_quartiles": model.categories_with_quartiles,
+            "sjr_year_used": model.sjr_year_used,
+            "sjr_edition": model.sjr_edition,
+            "sjr_fuzzy_match": model.sjr_fuzzy_match,
+            "scopus_account_id": model.scopus_account_id,
+            "cached_at": model.cached_at
+        }
+
     def _model_to_entity(self, model: PublicationCacheModel) -> Publication:
         """Convierte un modelo de BD a entidad de dominio."""
         return Publication(
@@ -141,7 +322,9 @@ class DBPublicationCacheRepository(IPublicationCacheRepository):
             affiliation_id=model.affiliation_id,
             subject_areas=model.subject_areas or [],
             categories_with_quartiles=model.categories_with_quartiles or [],
-            sjr_year_used=model.sjr_year_used
+            sjr_year_used=model.sjr_year_used,
+            sjr_edition=model.sjr_edition,
+            sjr_fuzzy_match=bool(model.sjr_fuzzy_match)
         )
 
     def _entity_to_model(
@@ -165,6 +348,8 @@ class DBPublicationCacheRepository(IPublicationCacheRepository):
             subject_areas=pub.subject_areas,
             categories_with_quartiles=pub.categories_with_quartiles,
             sjr_year_used=pub.sjr_year_used,
+            sjr_edition=pub.sjr_edition,
+            sjr_fuzzy_match=pub.sjr_fuzzy_match,
             scopus_account_id=scopus_account_id,
             cached_at=datetime.utcnow()
         )
@@ -184,4 +369,6 @@ class DBPublicationCacheRepository(IPublicationCacheRepository):
         model.subject_areas = pub.subject_areas
         model.categories_with_quartiles = pub.categories_with_quartiles
         model.sjr_year_used = pub.sjr_year_used
+        model.sjr_edition = pub.sjr_edition
+        model.sjr_fuzzy_match = pub.sjr_fuzzy_match
         model.cached_at = datetime.utcnow()
@@ -0,0 +1,81 @@
+"""Persistencia en PostgreSQL del estado de cuota de las API keys de Scopus."""
+
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from .scopus_api_key_quota_model import ScopusApiKeyQuotaModel
+from ....shared.api_key_pool import ApiKeyQuota, IApiKeyQuotaStore
+
+
+class DBScopusApiKeyQuotaStore(IApiKeyQuotaStore):
+    """
+    Guarda el estado del pool de API keys (ver ApiKeyPool) en la tabla
+    scopus_api_key_quota. Abre una sesión propia en cada operación porque
+    el pool vive todo el proceso. Las fechas se guardan en UTC sin zona.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self._session_factory = session_factory
+
+    def load(self, key_ids: List[str]) -> Dict[str, ApiKeyQuota]:
+        if not key_ids:
+            return {}
+        session = self._session_factory()
+        try:
+            models = session.query(ScopusApiKeyQuotaModel).filter(
+                ScopusApiKeyQuotaModel.key_id.in_(key_ids)
+            ).all()
+            return {
+                m.key_id: ApiKeyQuota(
+                    key_id=m.key_id,
+                    limit=m.quota_limit,
+                    remaining=m.remaining,
+                    reset_at=_to_utc(m.reset_at),
+                    paused_until=_to_utc(m.paused_until),
+                    updated_at=_to_utc(m.updated_at)
+                )
+                for m in models
+            }
+        finally:
+            session.close()
+
+    def save(self, quotas: List[ApiKeyQuota]) -> None:
+        if not quotas:
+            return
+        records = [
+            {
+                "key_id": quota.key_id,
+                "quota_limit": quota.limit,
+                "remaining": quota.remaining,
+                "reset_at": _to_naive_utc(quota.reset_at),
+                "paused_until": _to_naive_utc(quota.paused_until),
+                "updated_at": _to_naive_utc(quota.updated_at)
+            }
+            for quota in quotas
+        ]
+        stmt = insert(ScopusApiKeyQuotaModel).values(records)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['key_id'],
+            set_={col.name: col for col in stmt.excluded if col.name != 'key_id'}
+        )
+
+        session = self._session_factory()
+        try:
+            session.execute(stmt)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+
+def _to_utc(value: Optional[datetime]) -> Optional[datetime]:
+    return value.replace(tzinfo=timezone.utc) if value is not None else None
+
+
+def _to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value is not None else None
@@ -7,7 +7,7 @@ para evitar llamadas repetidas a la API.
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, UUID, JSON
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, UUID, JSON, Boolean, false
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -49,6 +49,9 @@ class PublicationCacheModel(Base):
     subject_areas = Column(JSON, nullable=True, default=list)
     categories_with_quartiles = Column(JSON, nullable=True, default=list)
     sjr_year_used = Column(Integer, nullable=True)
+    sjr_edition = Column(String(100), nullable=True)
+    # Datos SJR obtenidos por coincidencia aproximada del título de la revista
+    sjr_fuzzy_match = Column(Boolean, nullable=False, default=False, server_default=false())
     
     # Relación con la cuenta Scopus que originó la consulta
     scopus_account_id = Column(
@@ -81,5 +84,7 @@ class PublicationCacheModel(Base):
             "affiliation_id": self.affiliation_id,
             "subject_areas": self.subject_areas or [],
             "categories_with_quartiles": self.categories_with_quartiles or [],
-            "sjr_year_used": self.sjr_year_used
+            "sjr_year_used": self.sjr_year_used,
+            "sjr_edition": self.sjr_edition,
+            "sjr_fuzzy_match": bool(self.sjr_fuzzy_match)
         }
@@ -0,0 +1,29 @@
+"""
+Modelo SQLAlchemy del estado de actualización de la caché de publicaciones.
+
+Guarda, por cuenta Scopus, cuándo se actualizó por última vez su caché,
+cuándo fue la última descarga completa (para decidir entre una
+actualización incremental y una reconciliación completa) y cuándo la
+actualizó por última vez la cosecha por institución.
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, UUID
+
+from ....shared.database import Base
+
+
+class PublicationCacheRefreshModel(Base):
+    """Última actualización (incremental o completa) de la caché de una cuenta Scopus."""
+    __tablename__ = 'publication_cache_refresh'
+
+    scopus_account_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("scopus_accounts.account_id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    # Última actualización correcta, de cualquier tipo
+    refreshed_at = Column(DateTime, nullable=False)
+    # Última descarga completa (reconciliación de bajas y correcciones)
+    full_refreshed_at = Column(DateTime, nullable=False)
+    # Última cosecha por institución que la dejó al día; no mueve el punto de
+    # partida de la actualización incremental (sólo trae publicaciones de la EPN)
+    harvested_at = Column(DateTime, nullable=True)
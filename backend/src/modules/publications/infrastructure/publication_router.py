@@ -1,21 +1,20 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from .scopus_publication_repository import ScopusPublicationRepository
-from .sjr_file_repository import SJRFileRepository
-from .db_publication_cache_repository import DBPublicationCacheRepository
-from .scopus_author_subject_area_repository import ScopusAuthorSubjectAreaRepository
+from .affiliation_harvest_job import AffiliationHarvestJob
 from ..application.publication_dto import (
     PublicationResponseDTO, 
-    AuthorPublicationsResponseDTO
+    AuthorPublicationsResponseDTO,
+    JournalResponseDTO,
+    AffiliationHarvestStatusDTO
 )
 from ..application.subject_area_dto import AuthorSubjectAreasResponseDTO
 from ..application.publication_service import PublicationService
 from ..application.subject_area_service import SubjectAreaService
-from ...scopus_accounts.infrastructure.db_scopus_account_repository import DBScopusAccountRepository
+from ..domain.sjr_repository import ISJRRepository
 from ....shared.database import get_db
 from ....container import get_container
 
@@ -26,48 +25,96 @@ def get_service(db: Session = Depends(get_db)) -> PublicationService:
     """
     Factory para crear el servicio de publicaciones con sus dependencias.
     """
-    container = get_container()
-    
-    # Repositorio de publicaciones (Scopus API)
-    publication_repo = ScopusPublicationRepository(
-        api_key=container.settings.SCOPUS_API_KEY
-    )
-    
-    # Repositorio de caché (base de datos)
-    cache_repo = DBPublicationCacheRepository(db)
-    
-    # Repositorio SJR (archivo CSV)
-    sjr_repo = SJRFileRepository(
-        csv_path=container.settings.SJR_CSV_PATH
-    )
-    
-    # Repositorio de cuentas Scopus (base de datos)
-    scopus_account_repo = DBScopusAccountRepository(db)
-    
-    return PublicationService(
-        publication_repo=publication_repo,
-        cache_repo=cache_repo,
-        sjr_repo=sjr_repo,
-        scopus_account_repo=scopus_account_repo
-    )
+    return get_container().create_publication_service(db)
+
+
+def get_harvest_job() -> AffiliationHarvestJob:
+    return get_container().affiliation_harvest_job
 
 
 def get_subject_area_service(db: Session = Depends(get_db)) -> SubjectAreaService:
     """
     Factory para crear el servicio de áreas temáticas con sus dependencias.
     """
-    container = get_container()
+    return get_container().create_subject_area_service(db)
+
+
+def get_sjr_repository() -> ISJRRepository:
+    """Repositorio SJR compartido por proceso (cargado al arranque)."""
+    return get_container().sjr_repository
+
+
+@router.get(
+    "/journals",
+    response_model=List[JournalResponseDTO],
+    summary="Buscar revistas en el SJR",
+    description="""
+    Consulta las áreas y categorías con cuartiles de una revista sin pasar por
+    las publicaciones de un autor.
+
+    - `q`: autocompletado por nombre. Devuelve las revistas cuyo nombre
+      normalizado empieza por el texto y, después, las que lo contienen a partir
+      del inicio de una palabra, en orden alfabético.
+    - `source_id`: búsqueda exacta por Sourceid (tiene prioridad sobre `q`).
+
+    Los cuartiles corresponden a `year` (con el mismo mapeo dinámico de años
+    que las publicaciones) o, si no se indica, al año más reciente de cada revista.
+    """
+)
+async def search_journals(
+    q: Optional[str] = Query(None, min_length=1, description="Nombre o inicio del nombre de la revista"),
+    source_id: Optional[str] = Query(None, min_length=1, description="Sourceid de la revista"),
+    year: Optional[int] = Query(None, description="Año de los cuartiles"),
+    limit: int = Query(10, ge=1, le=50, description="Máximo de revistas"),
+    sjr_repo: ISJRRepository = Depends(get_sjr_repository)
+):
+    """Endpoint de búsqueda de revistas por nombre o Sourceid."""
+    if not q and not source_id:
+        raise HTTPException(status_code=400, detail="Indique 'q' o 'source_id'")
+    if source_id:
+        journal = sjr_repo.get_journal_by_sourceid(source_id, publication_year=year)
+        journals = [journal] if journal is not None else []
+    else:
+        journals = sjr_repo.search_journals(q, limit=limit, publication_year=year)
+    return [JournalResponseDTO.from_entity(journal) for journal in journals]
 
-    author_sa_repo = ScopusAuthorSubjectAreaRepository(
-        api_key=container.settings.SCOPUS_API_KEY
-    )
 
-    scopus_account_repo = DBScopusAccountRepository(db)
+@router.get(
+    "/harvest",
+    response_model=AffiliationHarvestStatusDTO,
+    summary="Estado de la cosecha por institución",
+    description="Avance (publicaciones recibidas, guardadas y cuentas actualizadas) de la última cosecha."
+)
+async def get_harvest_status(job: AffiliationHarvestJob = Depends(get_harvest_job)):
+    return job.status()
 
-    return SubjectAreaService(
-        author_sa_repo=author_sa_repo,
-        scopus_account_repo=scopus_account_repo
-    )
+
+@router.post(
+    "/harvest",
+    response_model=AffiliationHarvestStatusDTO,
+    status_code=202,
+    summary="Cosechar las publicaciones de la EPN",
+    description="""
+    Recorre una sola vez la búsqueda de Scopus por la filiación de la EPN
+    (`AF-ID(60072054)`) y guarda cada publicación en la caché de una de las
+    cuentas registradas que figuran entre sus autores, con el mismo análisis
+    de filiación que la consulta por autor. Reemplaza una búsqueda por cuenta.
+
+    La caché guarda un solo registro por publicación: las cuentas de coautores
+    que no recibieron todas sus publicaciones (`incomplete_accounts`) no se
+    marcan como actualizadas y se actualizan con su propia consulta. La
+    cosecha no adelanta la actualización incremental de ninguna cuenta: la
+    siguiente sigue trayendo sus publicaciones fuera de la EPN.
+
+    Se ejecuta en segundo plano; también puede programarse con
+    `SCOPUS_HARVEST_INTERVAL_HOURS`. Con varios workers sólo uno cosecha a la
+    vez: los demás la omiten (`skipped`).
+    """
+)
+async def harvest_affiliation(job: AffiliationHarvestJob = Depends(get_harvest_job)):
+    if not job.start():
+        raise HTTPException(status_code=409, detail="Ya hay una cosecha en curso")
+    return job.status()
 
 
 @router.get(
@@ -158,18 +205,22 @@ async def get_publication_stats(
     summary="Obtener áreas temáticas de un autor",
     description="""
     Obtiene las áreas temáticas del perfil de un autor consultando la API
-    Author Retrieval de Scopus para cada cuenta asociada.
+    Author Retrieval de Scopus para las cuentas asociadas (hasta 25 por petición).
     
     Fusiona las áreas temáticas de todas las cuentas eliminando duplicados.
+
+    **Estrategia de caché:** las áreas de cada cuenta se almacenan en BD por 7 días
+    (`SUBJECT_AREA_CACHE_HOURS`). Use `refresh=true` para forzar actualización desde Scopus.
     """
 )
 async def get_author_subject_areas(
     author_id: UUID,
+    refresh: bool = Query(False, description="Forzar actualización desde Scopus"),
     service: SubjectAreaService = Depends(get_subject_area_service)
 ):
     """Endpoint para obtener áreas temáticas de un autor desde Scopus."""
     try:
-        subject_areas = await service.get_subject_areas_by_author(author_id)
+        subject_areas = await service.get_subject_areas_by_author(author_id, force_refresh=refresh)
         return AuthorSubjectAreasResponseDTO(
             author_id=str(author_id),
             subject_areas=subject_areas
@@ -0,0 +1,23 @@
+"""
+Modelo SQLAlchemy del estado de cuota de las API keys de Scopus.
+
+Guarda, por key (identificada por su huella, nunca en claro), la cuota
+restante y su reinicio, para que una key agotada siga en pausa tras
+reiniciar la API.
+"""
+from sqlalchemy import Column, DateTime, Integer, String
+
+from ....shared.database import Base
+
+
+class ScopusApiKeyQuotaModel(Base):
+    """Última cuota conocida de una API key de Scopus."""
+    __tablename__ = 'scopus_api_key_quota'
+
+    # Huella de la key (ver api_key_fingerprint)
+    key_id = Column(String(64), primary_key=True)
+    quota_limit = Column(Integer, nullable=True)
+    remaining = Column(Integer, nullable=True)
+    reset_at = Column(DateTime, nullable=True)
+    paused_until = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=True)
@@ -1,14 +1,21 @@
 """Repositorio de áreas temáticas del autor usando la API Author Retrieval de Scopus."""
 
+import asyncio
 import logging
-from typing import List
+from typing import Dict, List, Optional
 from httpx import Timeout, AsyncClient, HTTPStatusError
 
 from ..domain.author_subject_area_repository import IAuthorSubjectAreaRepository
 from ..domain.subject_area_mapping import resolve_subject_area
+from ....shared.http_client import borrow_http_client, get_with_retries
+from ....shared.api_key_pool import ApiKeyPool
+from ....shared.rate_limiter import AdaptiveRateLimiter
 
 logger = logging.getLogger(__name__)
 
+# Máximo de autores por petición a Author Retrieval (author_id=id1,id2,...)
+AUTHOR_RETRIEVAL_MAX_IDS = 25
+
 
 class ScopusAuthorSubjectAreaRepository(IAuthorSubjectAreaRepository):
     """
@@ -16,7 +23,14 @@ class ScopusAuthorSubjectAreaRepository(IAuthorSubjectAreaRepository):
     Author Retrieval de Scopus (vista ENHANCED).
     """
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str = "",
+        http_client: Optional[AsyncClient] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        key_pool: Optional[ApiKeyPool] = None,
+        batch_size: int = AUTHOR_RETRIEVAL_MAX_IDS
+    ):
         self._api_key = api_key
         self._base_url = "https://api.elsevier.com"
         self._headers = {
@@ -24,6 +38,15 @@ class ScopusAuthorSubjectAreaRepository(IAuthorSubjectAreaRepository):
             "X-ELS-APIKey": self._api_key
         }
         self._timeout = Timeout(60.0, connect=10.0)
+        # Cliente con pool compartido por el proceso (ver Container); None = uno por llamada
+        self._http_client = http_client
+        # Limitador de tasa compartido por todas las llamadas a Scopus (ver Container)
+        self._rate_limiter = rate_limiter
+        # Pool de API keys (ver Container): cada petición usa la key con más cuota
+        # y el limitador de esa key; None = `api_key` con `rate_limiter`
+        self._key_pool = key_pool
+        # Autores por petición en las consultas por lotes
+        self._batch_size = max(1, min(batch_size, AUTHOR_RETRIEVAL_MAX_IDS))
 
     async def get_subject_areas_by_scopus_id(self, scopus_id: str) -> List[str]:
         """
@@ -41,57 +64,132 @@ class ScopusAuthorSubjectAreaRepository(IAuthorSubjectAreaRepository):
             }
           }]
         }
+
+        Raises:
+            HTTPStatusError: Si la API responde con error tras los reintentos
+            ValueError: Si la respuesta no tiene el formato esperado
         """
         url = f"{self._base_url}/content/author/author_id/{scopus_id}"
         params = {"view": "ENHANCED"}
 
         try:
-            async with AsyncClient(timeout=self._timeout) as client:
-                response = await client.get(url, headers=self._headers, params=params)
-                response.raise_for_status()
+            async with borrow_http_client(self._http_client, self._timeout) as client:
+                response = await get_with_retries(
+                    client, url,
+                    rate_limiter=self._rate_limiter,
+                    key_pool=self._key_pool,
+                    headers=self._headers, params=params, timeout=self._timeout
+                )
                 data = response.json()
-
-            # Navegar la estructura de respuesta de Scopus
-            retrieval = data.get("author-retrieval-response", [])
-            if isinstance(retrieval, list) and retrieval:
-                retrieval = retrieval[0]
-            elif isinstance(retrieval, dict):
-                pass  # ya es el objeto
-            else:
-                logger.warning("Respuesta inesperada de Author Retrieval para %s", scopus_id)
-                return []
-
-            subject_areas_obj = retrieval.get("subject-areas", {})
-            subject_area_list = subject_areas_obj.get("subject-area", [])
-
-            if isinstance(subject_area_list, dict):
-                subject_area_list = [subject_area_list]
-
-            areas: List[str] = []
-            for sa in subject_area_list:
-                abbrev = sa.get("@abbrev", "").strip()
-                if abbrev:
-                    full_name = resolve_subject_area(abbrev)
-                    if full_name:
-                        areas.append(full_name)
-                    else:
-                        logger.warning(
-                            "Abreviatura de subject area desconocida '%s' para autor %s",
-                            abbrev, scopus_id
-                        )
-
-            logger.debug("Author %s subject areas: %s", scopus_id, areas)
-            return areas
-
         except HTTPStatusError as e:
             logger.error(
                 "Error HTTP al obtener subject areas del autor %s: %s",
                 scopus_id, e.response.status_code
             )
-            return []
-        except Exception as e:
+            raise
+
+        # Navegar la estructura de respuesta de Scopus
+        retrieval = data.get("author-retrieval-response", [])
+        if isinstance(retrieval, list) and retrieval:
+            retrieval = retrieval[0]
+        elif not isinstance(retrieval, dict):
+            raise ValueError(f"Respuesta inesperada de Author Retrieval para {scopus_id}")
+
+        return self._parse_subject_areas(retrieval, scopus_id)
+
+    async def get_subject_areas_by_scopus_ids(self, scopus_ids: List[str]) -> Dict[str, List[str]]:
+        """
+        Consulta Author Retrieval por lotes: hasta `batch_size` autores por
+        petición (`/content/author?author_id=id1,id2,...`), con los lotes en
+        paralelo (sujetos al limitador de tasa).
+
+        Si falla un lote, sus autores quedan fuera del resultado y se devuelven
+        los demás; si fallan todos, se propaga el error.
+
+        Formato de respuesta esperado de Scopus:
+        {
+          "author-retrieval-response-list": {
+            "author-retrieval-response": [{
+              "coredata": {"dc:identifier": "AUTHOR_ID:57200000000", ...},
+              "subject-areas": {...}
+            }, ...]
+          }
+        }
+        """
+        unique_ids = list(dict.fromkeys(scopus_ids))
+        chunks = [unique_ids[i:i + self._batch_size] for i in range(0, len(unique_ids), self._batch_size)]
+        results = await asyncio.gather(*(self._fetch_chunk(chunk) for chunk in chunks), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors and len(errors) == len(results):
+            raise errors[0]
+
+        areas_by_id: Dict[str, List[str]] = {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                logger.error("Error al obtener subject areas de %d autores: %s", len(chunk), str(result))
+            else:
+                areas_by_id.update(result)
+        return areas_by_id
+
+    async def _fetch_chunk(self, scopus_ids: List[str]) -> Dict[str, List[str]]:
+        """Un lote de Author Retrieval; los errores de la API se propagan."""
+        url = f"{self._base_url}/content/author"
+        params = {"author_id": ",".join(scopus_ids), "view": "ENHANCED"}
+
+        try:
+            async with borrow_http_client(self._http_client, self._timeout) as client:
+                response = await get_with_retries(
+                    client, url,
+                    rate_limiter=self._rate_limiter,
+                    key_pool=self._key_pool,
+                    headers=self._headers, params=params, timeout=self._timeout
+                )
+                data = response.json()
+        except HTTPStatusError as e:
             logger.error(
-                "Error inesperado al obtener subject areas del autor %s: %s",
-                scopus_id, str(e)
+                "Error HTTP al obtener subject areas de %d autores: %s",
+                len(scopus_ids), e.response.status_code
             )
-            return []
+            raise
+
+        retrievals = data.get("author-retrieval-response-list", {}).get("author-retrieval-response", [])
+        if isinstance(retrievals, dict):
+            retrievals = [retrievals]
+
+        # Repartir la respuesta por autor (el orden no está garantizado)
+        areas_by_id: Dict[str, List[str]] = {}
+        for retrieval in retrievals:
+            identifier = retrieval.get("coredata", {}).get("dc:identifier", "")
+            scopus_id = identifier.replace("AUTHOR_ID:", "")
+            if scopus_id in scopus_ids:
+                areas_by_id[scopus_id] = self._parse_subject_areas(retrieval, scopus_id)
+
+        missing = len(scopus_ids) - len(areas_by_id)
+        if missing:
+            logger.warning("Author Retrieval no devolvió %d de %d autores del lote", missing, len(scopus_ids))
+        return areas_by_id
+
+    @staticmethod
+    def _parse_subject_areas(retrieval: Dict, scopus_id: str) -> List[str]:
+        """Nombres completos de las subject-areas de un perfil de Author Retrieval."""
+        subject_areas_obj = retrieval.get("subject-areas") or {}
+        subject_area_list = subject_areas_obj.get("subject-area", [])
+
+        if isinstance(subject_area_list, dict):
+            subject_area_list = [subject_area_list]
+
+        areas: List[str] = []
+        for sa in subject_area_list:
+            abbrev = sa.get("@abbrev", "").strip()
+            if abbrev:
+                full_name = resolve_subject_area(abbrev)
+                if full_name:
+                    areas.append(full_name)
+                else:
+                    logger.warning(
+                        "Abreviatura de subject area desconocida '%s' para autor %s",
+                        abbrev, scopus_id
+                    )
+
+        logger.debug("Author %s subject areas: %s", scopus_id, areas)
+        return areas
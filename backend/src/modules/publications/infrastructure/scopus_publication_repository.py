@@ -1,8 +1,27 @@
 """ Repositorio de publicaciones que consume la API de Scopus. """
 
-from typing import List, Optional, Dict, Any
+import asyncio
+import logging
+from datetime import date
+from typing import Any, AsyncIterator, Dict, List, Optional
 from httpx import Timeout, AsyncClient, HTTPStatusError, RequestError
 from ..domain.publication_repository import IPublicationRepository
+from ....shared.http_client import borrow_http_client, get_with_retries
+from ....shared.api_key_pool import ApiKeyPool
+from ....shared.rate_limiter import AdaptiveRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Publicaciones por página (máximo permitido por la API de Scopus con view=COMPLETE)
+PAGE_SIZE = 25
+# Campos de cada resultado que usan PublicationService._transform_raw_publication y
+# el análisis de filiación (`authid`/`afid` traen la lista de autores con sus
+# filiaciones y `affilname` la de afiliaciones). Sin resúmenes ni palabras clave.
+SEARCH_FIELDS = (
+    "dc:identifier", "eid", "prism:doi", "source-id", "dc:title", "prism:coverDate",
+    "prism:publicationName", "subtypeDescription", "prism:aggregationType",
+    "authid", "afid", "affilname",
+)
 
 
 class ScopusPublicationRepository(IPublicationRepository):
@@ -13,7 +32,17 @@ class ScopusPublicationRepository(IPublicationRepository):
     publicaciones científicas desde el servicio de Elsevier.
     """
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str = "",
+        http_client: Optional[AsyncClient] = None,
+        max_concurrent_pages: int = 4,
+        page_retries: int = 3,
+        cursor_threshold: int = 5000,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        key_pool: Optional[ApiKeyPool] = None,
+        field_projection: bool = False
+    ):
         self._api_key = api_key
         self._base_url = "https://api.elsevier.com"
         self._headers = {
@@ -22,6 +51,24 @@ class ScopusPublicationRepository(IPublicationRepository):
         }
         # Aumentar timeout para autores con muchas publicaciones
         self._timeout = Timeout(120.0, connect=10.0)
+        # Cliente con pool compartido por el proceso (ver Container); None = uno por llamada
+        self._http_client = http_client
+        # Páginas de resultados que se piden a la vez (después de la primera)
+        self._max_concurrent_pages = max(1, max_concurrent_pages)
+        # Reintentos por página ante errores de red, 429 o 5xx
+        self._page_retries = page_retries
+        # Total de resultados a partir del cual se pagina con cursor en lugar de `start`
+        self._cursor_threshold = cursor_threshold
+        # Limitador de tasa compartido por todas las llamadas a Scopus (ver Container)
+        self._rate_limiter = rate_limiter
+        # Pool de API keys (ver Container): cada petición usa la key con más cuota
+        # y el limitador de esa key; None = `api_key` con `rate_limiter`
+        self._key_pool = key_pool
+        # Pedir sólo SEARCH_FIELDS (`field=`) en lugar del registro completo
+        self._field_projection = field_projection
+        # Si `field=` trae las filiaciones por autor: None = aún sin comprobar
+        # (ver _fetch_page), True = comprobado, False = se pide el registro completo
+        self._projection_works: Optional[bool] = None
 
     async def get_publications_by_scopus_id(
         self, 
@@ -36,38 +83,183 @@ class ScopusPublicationRepository(IPublicationRepository):
         Returns:
             Lista de diccionarios con los datos crudos de las publicaciones
         """
-        all_entries = []
-        start = 0
-        count = 25  # Máximo permitido por la API de Scopus
-        
-        async with AsyncClient(timeout=self._timeout) as client:
-            while True:
-                url = f"{self._base_url}/content/search/scopus"
-                params = {
-                    "query": f"AU-ID({scopus_author_id})",
-                    "start": start,
-                    "count": count,
-                    "view": "COMPLETE"  # Obtener datos completos para cada publicación
-                }
-                
-                response = await client.get(url, headers=self._headers, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                search_results = data.get("search-results", {})
-                entries = search_results.get("entry", [])
-                
-                # Verificar si hay resultados válidos
-                if not entries or (len(entries) == 1 and entries[0].get("error")):
-                    break
-                all_entries.extend(entries)
-                # Verificar si hay más páginas
-                total_results = int(search_results.get("opensearch:totalResults", 0))
-                if start + count >= total_results:
-                    break
-                start += count
+        all_entries: List[Dict[str, Any]] = []
+        async for entries in self.iter_publications_by_scopus_id(scopus_author_id):
+            all_entries.extend(entries)
         return all_entries
 
+    async def iter_publications_by_scopus_id(
+        self,
+        scopus_author_id: str,
+        loaded_after: Optional[date] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Entrega las publicaciones del autor página a página, en el orden de la
+        API, a medida que llegan.
+
+        La primera página se pide con `cursor=*` e indica el total de resultados:
+        - Hasta `cursor_threshold`: las páginas restantes se piden por
+          desplazamiento (`start`) en paralelo, hasta `max_concurrent_pages` a la vez.
+        - Por encima (la API no admite `start` más allá de su límite): se
+          sigue con el cursor de la primera página (`@next`), una página tras
+          otra, sin volver a pedirla.
+
+        Con `loaded_after` sólo se piden los documentos incorporados a Scopus
+        después de esa fecha (`ORIG-LOAD-DATE AFT aaaammdd`).
+        """
+        query = f"AU-ID({scopus_author_id})"
+        if loaded_after is not None:
+            query += f" AND ORIG-LOAD-DATE AFT {loaded_after:%Y%m%d}"
+        async for entries in self._iter_query(query):
+            yield entries
+
+    async def iter_publications_by_affiliation(self, affiliation_id: str) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Entrega página a página los resultados de `AF-ID(...)` (ver iter_publications_by_scopus_id)."""
+        async for entries in self._iter_query(f"AF-ID({affiliation_id})"):
+            yield entries
+
+    async def _iter_query(self, query: str) -> AsyncIterator[List[Dict[str, Any]]]:
+        async with borrow_http_client(self._http_client, self._timeout) as client:
+            # Con cursor, la primera página sirve también para seguir por cursor si el resultado es grande
+            search_results = await self._fetch_page(client, query, {"cursor": "*"})
+            first_entries = self._page_entries(search_results)
+            if not first_entries:
+                return
+            yield first_entries
+
+            total_results = int(search_results.get("opensearch:totalResults", 0))
+            if total_results > self._cursor_threshold:
+                logger.info(f"'{query}' tiene {total_results} resultados: paginación por cursor")
+                async for entries in self._iter_cursor_pages(client, query, search_results):
+                    yield entries
+                return
+
+            async for entries in self._iter_offset_pages(client, query, total_results):
+                yield entries
+
+    async def _iter_offset_pages(
+        self,
+        client: AsyncClient,
+        query: str,
+        total_results: int
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Páginas siguientes a la primera, pedidas en paralelo y entregadas en orden."""
+        semaphore = asyncio.Semaphore(self._max_concurrent_pages)
+
+        async def fetch(start: int) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return self._page_entries(await self._fetch_page(client, query, {"start": start}))
+
+        tasks = [asyncio.ensure_future(fetch(start)) for start in range(PAGE_SIZE, total_results, PAGE_SIZE)]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            # Una página agotó sus reintentos o el consumidor dejó de leer:
+            # no dejar peticiones huérfanas
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # Marca como leído el error de páginas ya descartadas
+
+    async def _iter_cursor_pages(
+        self,
+        client: AsyncClient,
+        query: str,
+        search_results: Dict[str, Any]
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Páginas siguientes a la primera (pedida con `cursor=*`), siguiendo `@next` (sin el límite de `start`)."""
+        cursor = "*"
+        while True:
+            next_cursor = (search_results.get("cursor") or {}).get("@next")
+            # La última página repite el cursor (o no lo trae)
+            if not next_cursor or next_cursor == cursor:
+                return
+            cursor = next_cursor
+            search_results = await self._fetch_page(client, query, {"cursor": cursor})
+            entries = self._page_entries(search_results)
+            if not entries:
+                return
+            yield entries
+
+    async def _fetch_page(
+        self,
+        client: AsyncClient,
+        query: str,
+        position: Dict[str, Any],
+        project: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Pide una página de resultados respetando el limitador de tasa, y la
+        reintenta por separado ante errores transitorios (red, 429, 5xx).
+
+        Args:
+            position: `{"start": n}` (desplazamiento) o `{"cursor": c}`
+            project: Usar la proyección de campos si está activada
+
+        Returns:
+            El objeto "search-results" de la respuesta
+        """
+        url = f"{self._base_url}/content/search/scopus"
+        params = {
+            "query": query,
+            "count": PAGE_SIZE,
+            "view": "COMPLETE",  # Necesaria para la lista de autores y sus filiaciones
+            **position
+        }
+        projected = project and self._field_projection and self._projection_works is not False
+        if projected:
+            params["field"] = ",".join(SEARCH_FIELDS)
+        response = await get_with_retries(
+            client, url,
+            rate_limiter=self._rate_limiter,
+            key_pool=self._key_pool,
+            retries=self._page_retries,
+            headers=self._headers, params=params, timeout=self._timeout
+        )
+        search_results = response.json().get("search-results", {})
+        if not projected or self._projection_works:
+            return search_results
+
+        entries = self._page_entries(search_results)
+        if not self._lacks_author_affiliations(entries):
+            if entries:
+                self._projection_works = True
+            return search_results
+        # Ningún autor de la página trae `afid`: puede que todas sean publicaciones sin
+        # filiación o que `field=` no las devuelva. Sólo el registro completo lo aclara
+        complete = await self._fetch_page(client, query, position, project=False)
+        if not self._lacks_author_affiliations(self._page_entries(complete)):
+            # Sin `afid` por autor el análisis de filiación marcaría todo como no EPN
+            logger.warning(
+                "Scopus Search no devolvió filiaciones por autor con `field=`: "
+                "este repositorio pide el registro completo en adelante"
+            )
+            self._projection_works = False
+        return complete
+
+    @staticmethod
+    def _lacks_author_affiliations(entries: List[Dict[str, Any]]) -> bool:
+        """True si ninguna publicación de la página trae `afid` en su lista de autores."""
+        if not entries:
+            return False
+        for entry in entries:
+            authors = entry.get("author", [])
+            if isinstance(authors, dict):
+                authors = [authors]
+            if any(author.get("afid") for author in authors):
+                return False
+        return True
+
+    @staticmethod
+    def _page_entries(search_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Publicaciones de una página (vacía si Scopus no devolvió resultados)."""
+        entries = search_results.get("entry", [])
+        if not entries or (len(entries) == 1 and entries[0].get("error")):
+            return []
+        return entries
+
     async def get_publication_details(
         self, 
         scopus_id: str
@@ -83,9 +275,14 @@ class ScopusPublicationRepository(IPublicationRepository):
         """
         try:
             url = f"{self._base_url}/content/abstract/scopus_id/{scopus_id}"
-            async with AsyncClient(timeout=self._timeout) as client:
-                response = await client.get(url, headers=self._headers)
-                response.raise_for_status()
+            async with borrow_http_client(self._http_client, self._timeout) as client:
+                response = await get_with_retries(
+                    client, url,
+                    rate_limiter=self._rate_limiter,
+                    key_pool=self._key_pool,
+                    retries=self._page_retries,
+                    headers=self._headers, timeout=self._timeout
+                )
                 data = response.json()
                 return data.get("abstracts-retrieval-response", {})               
         except HTTPStatusError as e:
@@ -0,0 +1,199 @@
+"""
+Lector columnar del CSV de SJR con pandas.
+
+Procesa el archivo completo en memoria con operaciones vectorizadas; es el
+lector por defecto. `sjr_csv_stream` produce los mismos índices en una sola
+pasada sin pandas (ver `SJR_CSV_PARSER`).
+"""
+import logging
+import re
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .sjr_index_tables import SJRRowStore, index_by_key
+
+logger = logging.getLogger(__name__)
+
+
+def build_sjr_indexes(csv_path: str, normalize: Callable[[str], str]) -> Dict:
+    """
+    Procesa el CSV, calcula percentiles y construye los índices por Sourceid
+    y por nombre normalizado.
+
+    El procesamiento es columnar (operaciones `str`, `explode` y `groupby`
+    de pandas) y replica exactamente la semántica de
+    `_parse_categories_structured` / `_parse_areas`.
+    """
+    # Leer CSV forzando string para no perder datos
+    df = pd.read_csv(csv_path, sep=';', decimal=',', dtype=str)
+    
+    # Limpiar nombres de columnas
+    df.columns = [c.strip() for c in df.columns]
+    df = df.reset_index(drop=True)
+    n_rows = len(df)
+
+    # Detectar columna Sourceid
+    col_map = {c.lower(): c for c in df.columns}
+    sourceid_col_name = col_map.get('sourceid')
+    
+    rank_col = 'Rank'
+    if 'Rank' not in df.columns and 'SJR Rank' in df.columns:
+        rank_col = 'SJR Rank'
+    
+    # Convertir a numéricos
+    ranks = pd.to_numeric(df[rank_col], errors='coerce').fillna(float('inf'))
+    years = pd.to_numeric(df['year'], errors='coerce').fillna(0).astype(int)
+
+    # Normalizar sólo títulos únicos (se repiten en cada año del histórico)
+    titles = df['Title'].fillna('nan')
+    title_map = {t: normalize(t) for t in titles.unique()}
+    titles_norm = titles.map(title_map)
+    
+    if sourceid_col_name:
+        sourceids = df[sourceid_col_name].fillna('').astype(str).str.strip()
+    else:
+        logger.warning("¡Columna Sourceid no encontrada en el CSV de SJR!")
+        sourceids = pd.Series([''] * n_rows, dtype=object)
+    
+    max_year = int(years.max()) if n_rows else 0
+
+    # --- FASE 1: Separar áreas y categorías (una fila por elemento) ---
+    area_parts = _explode_list_column(df.get('Areas'))
+    cats = _split_categories(_explode_list_column(df.get('Categories')))
+    cats['year'] = years.to_numpy()[cats.index.to_numpy()]
+    cats['rank'] = ranks.to_numpy()[cats.index.to_numpy()]
+
+    # --- FASE 2: Calcular percentiles (Top 10%) sobre las categorías Q1 ---
+    # Universo COMPLETO de cada (año, categoría): todas sus apariciones.
+    # La posición es 1 + número de ranks estrictamente menores (rank 'min'),
+    # de modo que los empates comparten la mejor posición de forma determinista.
+    universes = cats.groupby(['year', 'name'], sort=False)['rank']
+    positions = universes.rank(method='min').to_numpy()
+    totals = universes.transform('size').to_numpy()
+    percent_top = (positions / totals) * 100.0
+
+    # El texto anotado no se guarda: sólo el percentil ya formateado, que
+    # junto al texto de la categoría forma una etiqueta con pocos valores distintos
+    is_top = (cats['quartile'] == 'Q1').to_numpy() & (percent_top <= 10.0)
+    top_percent = np.full(len(cats), '', dtype=object)
+    top_percent[is_top] = [f"{percent:.1f}" for percent in percent_top[is_top].tolist()]
+
+    # --- FASE 3: Tablas internadas y almacén de filas únicas ---
+    area_codes, area_names = pd.factorize(area_parts)
+    display_codes, displays = pd.factorize(cats['display'])
+    percent_codes, percents = pd.factorize(top_percent)
+    # Etiqueta = (texto, percentil) codificada como un único entero
+    n_percents = max(len(percents), 1)
+    label_codes, label_keys = pd.factorize(display_codes.astype(np.int64) * n_percents + percent_codes)
+    display_list = list(displays)
+    percent_list = list(percents)
+    category_labels = [
+        (display_list[key // n_percents], percent_list[key % n_percents])
+        for key in label_keys.tolist()
+    ]
+
+    area_rows = _regroup_by_row(_as_shared_ids(area_codes, area_parts.index), n_rows)
+    label_rows = _regroup_by_row(_as_shared_ids(label_codes, cats.index), n_rows)
+
+    row_store = SJRRowStore()
+    row_of = [row_store.add(area_ids, label_ids) for area_ids, label_ids in zip(area_rows, label_rows)]
+
+    # Los índices se publican completos (un único diccionario), de modo que
+    # ninguna consulta concurrente observa un índice a medio poblar.
+    # En claves repetidas prevalece la última fila (mismo orden que el CSV).
+    # Claves y años se internan para que cada texto exista una sola vez.
+    year_list = _interned_list(years)
+    sid_list = _interned_list(sourceids)
+    name_list = _interned_list(titles_norm)
+    sourceid_index = index_by_key(sid_list, year_list, row_of)
+    name_index = index_by_key(name_list, year_list, row_of)
+    # Directorio de revistas: título visible y revista de cada Sourceid
+    journal_titles = {name: title for name, title in zip(name_list, titles.tolist()) if name}
+    sourceid_titles = {sid: name for sid, name in zip(sid_list, name_list) if sid and name}
+    count_sourceid_entries = sum(1 for sid in sid_list if sid)
+    count_name_entries = sum(1 for name in name_list if name)
+
+    logger.info(
+        f"SJR procesado desde CSV. Sourceids: {count_sourceid_entries}. "
+        f"Nombres: {count_name_entries}. Filas únicas: {len(row_store.rows)}. Año máximo: {max_year}"
+    )
+
+    return {
+        'area_names': list(area_names),
+        'category_labels': category_labels,
+        'rows': row_store.rows,
+        'sourceid_index': sourceid_index,
+        'name_index': name_index,
+        'max_year': max_year,
+        'years': sorted(set(year_list)),
+        'journal_titles': journal_titles,
+        'sourceid_titles': sourceid_titles,
+    }
+
+
+def _interned_list(values: pd.Series) -> list:
+    """Lista de valores en la que los repetidos comparten el mismo objeto."""
+    codes, uniques = pd.factorize(values)
+    return np.asarray(uniques, dtype=object)[codes].tolist()
+
+
+def _as_shared_ids(codes: np.ndarray, index: pd.Index) -> pd.Series:
+    """Códigos enteros como objetos compartidos (un único int por código)."""
+    pool = np.empty(int(codes.max()) + 1 if len(codes) else 0, dtype=object)
+    pool[:] = range(len(pool))
+    return pd.Series(pool[codes], index=index, dtype=object)
+
+
+def _explode_list_column(column: Optional[pd.Series]) -> pd.Series:
+    """
+    Separa una columna 'a; b; c' en una fila por elemento (sin vacíos),
+    conservando como índice la posición de la fila original.
+    """
+    if column is None:
+        return pd.Series([], dtype=object)
+    values = column.fillna('').astype(object)
+    values = values.mask(values == 'nan', '')
+    parts = values.str.split(';').explode().str.strip()
+    return parts[parts.notna() & (parts != '')].astype(object)
+
+
+def _regroup_by_row(parts: pd.Series, n_rows: int) -> List[List[str]]:
+    """
+    Inversa de `_explode_list_column`: una lista por fila original.
+
+    El índice de `parts` está ordenado por fila, así que cada grupo es un
+    tramo contiguo (más rápido que `groupby(...).agg(list)` con muchas filas).
+    """
+    values = parts.tolist()
+    bounds = np.searchsorted(parts.index.to_numpy(), np.arange(n_rows + 1)).tolist()
+    return [values[bounds[i]:bounds[i + 1]] for i in range(n_rows)]
+
+
+def _split_categories(parts: pd.Series) -> pd.DataFrame:
+    """
+    Versión columnar de `_parse_categories_structured`: separa
+    'Nombre (Qx)' en nombre, cuartil y texto a mostrar.
+
+    Las categorías se repiten en miles de filas, así que la extracción se
+    hace una vez por valor único y luego se expande con los códigos.
+    """
+    codes, uniques = pd.factorize(parts)
+    unique_parts = pd.Series(uniques, dtype=object)
+
+    match = unique_parts.str.extract(r'^(.*)\(([^(]*)\)$', flags=re.DOTALL)
+    q_candidate = match[1].str.strip()
+    is_quartile = (
+        q_candidate.str.startswith('Q').fillna(False).astype(bool)
+        & (q_candidate.str.len() <= 3).fillna(False).astype(bool)
+    )
+    names = unique_parts.where(~is_quartile, match[0].str.strip()).astype(object)
+    quartiles = q_candidate.where(is_quartile, '').astype(object)
+    displays = names.where(quartiles == '', names + ' (' + quartiles + ')').astype(object)
+
+    return pd.DataFrame({
+        'name': names.to_numpy()[codes],
+        'quartile': quartiles.to_numpy()[codes],
+        'display': displays.to_numpy()[codes],
+    }, index=parts.index)
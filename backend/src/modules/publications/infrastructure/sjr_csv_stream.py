@@ -0,0 +1,284 @@
+"""
+Lector del CSV de SJR en streaming, sin pandas.
+
+Recorre el archivo una sola vez con el módulo `csv` (separador ';') y va
+construyendo las tablas internadas y los índices por clave fila a fila; sólo
+guarda, por cada aparición de categoría, su grupo (año, categoría), rank y
+texto en arreglos compactos para calcular los percentiles al final. Así el
+pico de memoria queda cerca del tamaño de los índices finales, en lugar de
+varias veces el del DataFrame completo, y el arranque no paga la
+importación de pandas.
+
+Replica la semántica de `sjr_csv_pandas` (valores nulos de `read_csv`,
+conversión numérica de `to_numeric`, separación de listas y categorías), de
+modo que ambos lectores producen exactamente los mismos índices.
+"""
+import csv
+import logging
+import math
+import re
+from array import array
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .sjr_index_tables import SJRRowStore, freeze_key_index
+
+logger = logging.getLogger(__name__)
+
+# Textos que `pandas.read_csv` interpreta como nulos por defecto
+_NA_VALUES = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+})
+
+_CATEGORY_PATTERN = re.compile(r'^(.*)\(([^(]*)\)$', flags=re.DOTALL)
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    """Como `pd.to_numeric(..., errors='coerce')`: None si no es un número."""
+    # float() acepta además '1_000' y dígitos no ASCII, que pandas rechaza
+    if value is None or '_' in value or not value.isascii():
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return None if math.isnan(number) else number
+
+
+def _split_list(value: Optional[str]) -> List[str]:
+    """'a; b; c' -> ['a', 'b', 'c'] (sin vacíos)."""
+    if value is None:
+        return []
+    return [part for part in (part.strip() for part in value.split(';')) if part]
+
+
+def _split_category(part: str) -> Tuple[str, str, str]:
+    """'Nombre (Qx)' -> (nombre, cuartil, texto a mostrar); sin cuartil, (texto, '', texto)."""
+    match = _CATEGORY_PATTERN.search(part)
+    if match is not None:
+        quartile = match.group(2).strip()
+        if quartile.startswith('Q') and len(quartile) <= 3:
+            name = match.group(1).strip()
+            return name, quartile, f"{name} ({quartile})"
+    return part, '', part
+
+
+def _percent_top(groups: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """
+    Percentil de cada aparición dentro de su universo (año, categoría):
+    posición = 1 + número de ranks estrictamente menores (rank 'min').
+    """
+    n = len(groups)
+    if n == 0:
+        return np.zeros(0, dtype=np.float64)
+    order = np.lexsort((ranks, groups))
+    sorted_groups = groups[order]
+    sorted_ranks = ranks[order]
+    indices = np.arange(n)
+    new_group = np.ones(n, dtype=bool)
+    new_group[1:] = sorted_groups[1:] != sorted_groups[:-1]
+    new_rank = new_group.copy()
+    new_rank[1:] |= sorted_ranks[1:] != sorted_ranks[:-1]
+    group_start = np.maximum.accumulate(np.where(new_group, indices, 0))
+    rank_start = np.maximum.accumulate(np.where(new_rank, indices, 0))
+
+    positions = np.empty(n, dtype=np.float64)
+    positions[order] = rank_start - group_start + 1
+    totals = np.bincount(groups)[groups]
+    return (positions / totals) * 100.0
+
+
+def build_sjr_indexes(csv_path: str, normalize: Callable[[str], str]) -> Dict:
+    """
+    Procesa el CSV en una sola pasada, calcula percentiles y construye los
+    índices por Sourceid y por nombre normalizado (mismo resultado que
+    `sjr_csv_pandas.build_sjr_indexes`).
+    """
+    # utf-8-sig: igual que pandas, ignora la marca BOM al inicio del archivo
+    with open(csv_path, newline='', encoding='utf-8-sig') as csv_file:
+        reader = csv.reader(csv_file, delimiter=';')
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(f"El CSV de SJR está vacío: {csv_path}")
+
+        # Limpiar nombres de columnas (con nombres repetidos vale el primero)
+        columns: Dict[str, int] = {}
+        for position, column in enumerate(header):
+            columns.setdefault(column.strip(), position)
+        n_columns = len(header)
+
+        # Detectar columna Sourceid
+        col_map = {column.lower(): column for column in columns}
+        sourceid_col = columns[col_map['sourceid']] if 'sourceid' in col_map else None
+        if sourceid_col is None:
+            logger.warning("¡Columna Sourceid no encontrada en el CSV de SJR!")
+
+        rank_name = 'Rank'
+        if 'Rank' not in columns and 'SJR Rank' in columns:
+            rank_name = 'SJR Rank'
+        rank_col = columns[rank_name]
+        year_col = columns['year']
+        title_col = columns['Title']
+        areas_col = columns.get('Areas')
+        categories_col = columns.get('Categories')
+
+        # Tablas internadas (en orden de aparición)
+        area_ids: Dict[str, int] = {}
+        displays: List[str] = []
+        display_ids: Dict[str, int] = {}
+        universes: Dict[Tuple[int, str], int] = {}
+        interned: Dict = {}
+        row_store = SJRRowStore()
+        # Valores ya procesados: años, títulos, áreas y categorías se repiten
+        # en cada año del histórico, así que se convierten una vez por texto
+        year_values: Dict[str, int] = {}
+        title_names: Dict[str, str] = {}
+        area_lists: Dict[str, Tuple[int, ...]] = {}
+        categories: Dict[str, Tuple[str, bool, int]] = {}
+        category_lists: Dict[str, Tuple[Tuple[str, bool, int], ...]] = {}
+
+        # Por fila del CSV: áreas y fin de sus apariciones de categoría
+        row_areas: List[Tuple[int, ...]] = []
+        row_ends = array('q')
+        # Por aparición de categoría: universo (año, categoría), rank, Q1 y texto
+        occurrence_universe = array('q')
+        occurrence_rank = array('d')
+        occurrence_q1 = bytearray()
+        occurrence_display = array('q')
+
+        by_sourceid: Dict[str, Dict[int, int]] = {}
+        by_name: Dict[str, Dict[int, int]] = {}
+        journal_titles: Dict[str, str] = {}
+        sourceid_titles: Dict[str, str] = {}
+        count_sourceid_entries = 0
+        count_name_entries = 0
+        years: Set[int] = set()
+        n_rows = 0
+
+        for fields in reader:
+            if not fields or (len(fields) == 1 and not fields[0].strip()):
+                continue  # Líneas en blanco (pandas las omite)
+            if len(fields) > n_columns:
+                raise ValueError(
+                    f"Línea {reader.line_num} del CSV de SJR: se esperaban {n_columns} campos y hay {len(fields)}"
+                )
+            if len(fields) < n_columns:
+                fields += [''] * (n_columns - len(fields))
+
+            row = n_rows
+            n_rows += 1
+
+            rank_value = fields[rank_col]
+            rank = _to_float(rank_value if rank_value not in _NA_VALUES else None)
+            if rank is None:
+                rank = float('inf')
+            year_value = fields[year_col]
+            year = year_values.get(year_value)
+            if year is None:
+                year_number = _to_float(year_value if year_value not in _NA_VALUES else None)
+                year = int(year_number) if year_number is not None and math.isfinite(year_number) else 0
+                year = year_values[year_value] = interned.setdefault(year, year)
+                years.add(year)
+
+            # Normalizar sólo títulos únicos (se repiten en cada año del histórico)
+            title = fields[title_col]
+            if title in _NA_VALUES:
+                title = 'nan'
+            name = title_names.get(title)
+            if name is None:
+                name = normalize(title)
+                name = title_names[title] = interned.setdefault(name, name)
+
+            source_id = ''
+            if sourceid_col is not None and fields[sourceid_col] not in _NA_VALUES:
+                source_id = fields[sourceid_col].strip()
+                source_id = interned.setdefault(source_id, source_id)
+
+            # En claves repetidas prevalece la última fila (mismo orden que el CSV)
+            if source_id:
+                by_sourceid.setdefault(source_id, {})[year] = row
+                count_sourceid_entries += 1
+            if name:
+                by_name.setdefault(name, {})[year] = row
+                journal_titles[name] = title
+                count_name_entries += 1
+                if source_id:
+                    sourceid_titles[source_id] = name
+
+            areas = fields[areas_col] if areas_col is not None else ''
+            area_list = area_lists.get(areas)
+            if area_list is None:
+                area_list = area_lists[areas] = row_store.intern(
+                    area_ids.setdefault(area, len(area_ids))
+                    for area in _split_list(areas if areas not in _NA_VALUES else None)
+                )
+            row_areas.append(area_list)
+
+            category_text = fields[categories_col] if categories_col is not None else ''
+            category_list = category_lists.get(category_text)
+            if category_list is None:
+                parsed = []
+                for part in _split_list(category_text if category_text not in _NA_VALUES else None):
+                    category = categories.get(part)
+                    if category is None:
+                        category_name, quartile, display = _split_category(part)
+                        display_id = display_ids.get(display)
+                        if display_id is None:
+                            display_id = display_ids[display] = len(displays)
+                            displays.append(display)
+                        category = categories[part] = (category_name, quartile == 'Q1', display_id)
+                    parsed.append(category)
+                category_list = category_lists[category_text] = tuple(parsed)
+            for category_name, is_q1, display_id in category_list:
+                occurrence_universe.append(universes.setdefault((year, category_name), len(universes)))
+                occurrence_rank.append(rank)
+                occurrence_q1.append(is_q1)
+                occurrence_display.append(display_id)
+            row_ends.append(len(occurrence_universe))
+
+    # Percentiles (Top 10%) sobre el universo COMPLETO de cada (año, categoría);
+    # el texto anotado no se guarda, sólo el percentil ya formateado
+    percent_top = _percent_top(
+        np.frombuffer(occurrence_universe, dtype=np.int64),
+        np.frombuffer(occurrence_rank, dtype=np.float64)
+    )
+    is_top = np.frombuffer(occurrence_q1, dtype=bool) & (percent_top <= 10.0)
+    top_percent = [''] * len(percent_top)
+    for occurrence in np.flatnonzero(is_top).tolist():
+        top_percent[occurrence] = f"{percent_top[occurrence]:.1f}"
+    del occurrence_universe, occurrence_rank, occurrence_q1, percent_top, is_top
+
+    # Etiqueta = (texto, percentil), en orden de aparición
+    label_ids: Dict[Tuple[int, str], int] = {}
+    occurrence_label = [
+        label_ids.setdefault(key, len(label_ids)) for key in zip(occurrence_display, top_percent)
+    ]
+    category_labels = [(displays[display_id], percent) for display_id, percent in label_ids]
+    del occurrence_display, top_percent
+
+    row_of = array('q')
+    start = 0
+    for areas, end in zip(row_areas, row_ends):
+        row_of.append(row_store.add(areas, occurrence_label[start:end]))
+        start = end
+
+    max_year = max(years) if n_rows else 0
+
+    logger.info(
+        f"SJR procesado desde CSV. Sourceids: {count_sourceid_entries}. "
+        f"Nombres: {count_name_entries}. Filas únicas: {len(row_store.rows)}. Año máximo: {max_year}"
+    )
+
+    return {
+        'area_names': list(area_ids),
+        'category_labels': category_labels,
+        'rows': row_store.rows,
+        'sourceid_index': freeze_key_index(by_sourceid, row_of),
+        'name_index': freeze_key_index(by_name, row_of),
+        'max_year': max_year,
+        'years': sorted(years),
+        'journal_titles': journal_titles,
+        'sourceid_titles': sourceid_titles,
+    }
@@ -0,0 +1,195 @@
+"""
+Registro de varias ediciones SJR publicadas como un único índice.
+
+Cada edición es un CSV exportado de Scimago (p. ej. el histórico y la
+exportación anual más reciente). Para cada año se usa la edición más nueva
+que lo contiene; las ediciones anteriores sólo aportan los años que las
+nuevas no cubren.
+
+Las ediciones se combinan sobre las mismas tablas internadas (áreas,
+etiquetas de categoría y filas): una fila idéntica en dos ediciones se
+guarda una sola vez, así que la memoria crece sólo con las filas nuevas.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .sjr_file_repository import CSV_PARSER_PANDAS, SJRFileRepository, edition_name
+from .sjr_index_tables import SJRRowStore, freeze_key_index
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SJREdition:
+    """Edición SJR: nombre visible y CSV del que proviene."""
+    name: str
+    csv_path: str
+
+
+class SJREditionRegistry(SJRFileRepository):
+    """
+    Repositorio SJR sobre varias ediciones, ordenadas de la más antigua a la
+    más nueva.
+
+    Cada edición conserva su propio snapshot (ver sjr_snapshot), de modo que
+    agregar una edición sólo procesa el CSV nuevo. Por eso, con recarga en
+    caliente (ver sjr_reloader), basta con construir en segundo plano el
+    snapshot del CSV que cambió: los de las demás ediciones siguen vigentes.
+    La vigilancia del CSV sólo sigue a la edición más nueva (`csv_path`); los
+    cambios en ediciones anteriores se aplican en la siguiente recarga.
+    """
+
+    def __init__(
+        self,
+        editions: List[SJREdition],
+        autoload: bool = True,
+        use_snapshot: bool = True,
+        fuzzy_threshold: float = 0.0,
+        csv_parser: str = CSV_PARSER_PANDAS
+    ):
+        if not editions:
+            raise ValueError("Se requiere al menos una edición SJR")
+        self._editions = list(editions)
+        super().__init__(
+            editions[-1].csv_path,
+            autoload=autoload,
+            use_snapshot=use_snapshot,
+            fuzzy_threshold=fuzzy_threshold,
+            csv_parser=csv_parser
+        )
+
+    @property
+    def editions(self) -> List[SJREdition]:
+        return list(self._editions)
+
+    @property
+    def csv_path(self) -> str:
+        """CSV de la edición más nueva."""
+        return self._editions[-1].csv_path
+
+    def reload(self, csv_path: Optional[str] = None, editions: Optional[List[SJREdition]] = None) -> bool:
+        """
+        Vuelve a combinar las ediciones y publica el índice de forma atómica
+        (ver `SJRFileRepository.reload`).
+
+        Args:
+            csv_path: CSV de la edición más nueva. Si no es una edición
+                registrada, reemplaza a la más nueva; las demás se conservan
+            editions: Ediciones a publicar, de la más antigua a la más nueva
+                (p. ej. para agregar una); tiene prioridad sobre `csv_path`
+
+        Returns:
+            True si se publicó un índice nuevo
+        """
+        with self._load_lock:
+            editions = list(editions) if editions else self._editions_for(csv_path or self.csv_path)
+            indexes = self._combine_editions(editions)
+            if indexes is None:
+                return False
+            self._editions = editions
+            self._csv_path = editions[-1].csv_path
+            self._indexes = self._with_derived_indexes(indexes)
+            self._ready = True
+            logger.info(f"Índices SJR recargados desde {len(editions)} ediciones")
+        return True
+
+    def _editions_for(self, csv_path: str) -> List[SJREdition]:
+        """Ediciones registradas, con `csv_path` como la más nueva si no es una de ellas."""
+        if any(edition.csv_path == csv_path for edition in self._editions):
+            return list(self._editions)
+        return self._editions[:-1] + [SJREdition(name=edition_name(csv_path), csv_path=csv_path)]
+
+    def _read_editions(self, csv_path: str) -> Optional[Dict]:
+        """Lee y combina las ediciones registradas (ver `_editions_for`)."""
+        return self._combine_editions(self._editions_for(csv_path))
+
+    def _combine_editions(self, editions: List[SJREdition]) -> Optional[Dict]:
+        """Lee todas las ediciones indicadas y las combina; None si falla alguna."""
+        edition_indexes: List[Tuple[str, Dict]] = []
+        for edition in editions:
+            indexes = self._read_indexes(edition.csv_path)
+            if indexes is None:
+                logger.error(f"No se pudo cargar la edición SJR '{edition.name}'")
+                return None
+            edition_indexes.append((edition.name, indexes))
+
+        merged = self._merge_editions(edition_indexes)
+        logger.info(
+            f"Ediciones SJR combinadas: {', '.join(edition.name for edition in editions)}. "
+            f"Filas únicas: {len(merged['rows'])}. Año máximo: {merged['max_year']}"
+        )
+        return merged
+
+    @staticmethod
+    def _merge_editions(edition_indexes: List[Tuple[str, Dict]]) -> Dict:
+        """
+        Combina los índices de varias ediciones (de la más antigua a la más nueva).
+
+        Cada año pertenece a la edición más nueva que lo contiene y sólo se
+        copian las entradas de esos años, reinternadas sobre tablas comunes.
+        """
+        year_editions: Dict[int, str] = {}
+        for name, indexes in reversed(edition_indexes):
+            for year in indexes['years']:
+                year_editions.setdefault(year, name)
+
+        area_names: List[str] = []
+        area_ids: Dict[str, int] = {}
+        category_labels: List[Tuple[str, str]] = []
+        label_ids: Dict[Tuple[str, str], int] = {}
+        row_store = SJRRowStore()
+        sourceid_rows: Dict[str, Dict[int, int]] = {}
+        name_rows: Dict[str, Dict[int, int]] = {}
+        # Títulos del directorio de revistas: prevalece la edición más nueva
+        journal_titles: Dict[str, str] = {}
+        sourceid_titles: Dict[str, str] = {}
+
+        def _intern(table: list, ids: dict, value) -> int:
+            if value not in ids:
+                ids[value] = len(table)
+                table.append(value)
+            return ids[value]
+
+        for name, indexes in edition_indexes:
+            journal_titles.update(indexes['journal_titles'])
+            sourceid_titles.update(indexes['sourceid_titles'])
+            area_map = [_intern(area_names, area_ids, area) for area in indexes['area_names']]
+            label_map = [_intern(category_labels, label_ids, label) for label in indexes['category_labels']]
+            row_map: Dict[int, int] = {}
+
+            def _global_row(row_id: int) -> int:
+                if row_id not in row_map:
+                    local_areas, local_labels = indexes['rows'][row_id]
+                    row_map[row_id] = row_store.add(
+                        (area_map[i] for i in local_areas), (label_map[i] for i in local_labels)
+                    )
+                return row_map[row_id]
+
+            for index, merged in (
+                (indexes['sourceid_index'], sourceid_rows),
+                (indexes['name_index'], name_rows),
+            ):
+                for key, (years, local_rows) in index.items():
+                    for year, row_id in zip(years, local_rows):
+                        if year_editions[year] == name:
+                            merged.setdefault(key, {})[year] = _global_row(row_id)
+
+        years = sorted(year_editions)
+        return {
+            'area_names': area_names,
+            'category_labels': category_labels,
+            'rows': row_store.rows,
+            'sourceid_index': freeze_key_index(_by_year(sourceid_rows)),
+            'name_index': freeze_key_index(_by_year(name_rows)),
+            'max_year': max((indexes['max_year'] for _, indexes in edition_indexes), default=0),
+            'years': years,
+            'year_editions': year_editions,
+            'journal_titles': journal_titles,
+            'sourceid_titles': sourceid_titles,
+        }
+
+
+def _by_year(rows_by_key: Dict[str, Dict[int, int]]) -> Dict[str, Dict[int, int]]:
+    # Cada edición aporta sus años en su propio orden; el índice publicado los lleva ordenados
+    return {key: dict(sorted(rows_by_year.items())) for key, rows_by_year in rows_by_key.items()}
@@ -1,14 +1,83 @@
+from contextlib import contextmanager
 from functools import lru_cache
+import gc
+import os
+import threading
+import time
 import unicodedata
 import logging
-import pandas as pd
-from typing import Dict, Optional, Tuple, List
-from collections import defaultdict
+from typing import Dict, Iterator, Optional, Tuple, List
 
+from .sjr_fuzzy_index import SJRFuzzyTitleIndex
+from .sjr_journal_directory import SJRJournalDirectory
+from .sjr_snapshot import CsvFingerprint, read_snapshot, write_snapshot
+from ..domain.sjr_journal import SJRJournal
 from ..domain.sjr_repository import ISJRRepository
+from ....shared.metrics import MetricsRecorder
 
 logger = logging.getLogger(__name__)
 
+# Resultados del fallback aproximado recordados por índice publicado: las mismas
+# revistas sin match se repiten en cada regeneración de reportes
+FUZZY_CACHE_SIZE = 16384
+
+# Rutas de búsqueda registradas en `metrics` (contador y latencia por ruta)
+LOOKUP_SOURCEID = "sourceid"
+LOOKUP_NAME = "name"
+LOOKUP_FUZZY = "fuzzy"
+LOOKUP_MISS = "miss"
+# Consultas sin índice cargado
+LOOKUP_UNAVAILABLE = "unavailable"
+# Contador: años posteriores al último disponible, mapeados a éste (`_resolve_year`)
+YEAR_CLAMPED = "year_clamped"
+
+# Lectores del CSV (ver `_build_indexes`): columnar con pandas o en streaming con `csv`
+CSV_PARSER_PANDAS = "pandas"
+CSV_PARSER_STREAM = "stream"
+CSV_PARSERS = (CSV_PARSER_PANDAS, CSV_PARSER_STREAM)
+
+
+@lru_cache(maxsize=16384)
+def _normalize_journal_name(name: str) -> str:
+    """
+    Normalización pura de nombres de revista.
+
+    Vive a nivel de módulo para que la caché LRU no retenga referencias
+    a instancias del repositorio (y a sus diccionarios SJR).
+    """
+    name = name.lower().strip()
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    name = name.replace('&', 'and')
+    name = ''.join(c for c in name if c.isalnum() or c.isspace())
+    name = ' '.join(name.split())
+    return name
+
+
+def edition_name(csv_path: str) -> str:
+    """Nombre de la edición SJR de un CSV (nombre del archivo sin extensión)."""
+    return os.path.splitext(os.path.basename(csv_path))[0]
+
+
+@contextmanager
+def gc_paused(enabled: bool = True) -> Iterator[None]:
+    """
+    Pausa el recolector de basura (la construcción de los índices crea muchos
+    objetos de larga vida y dispara recolecciones completas repetidas).
+
+    El GC es global al proceso: no usar en recargas en caliente, que corren
+    en un hilo mientras la API atiende peticiones.
+    """
+    was_enabled = gc.isenabled()
+    if enabled:
+        gc.disable()
+    try:
+        yield
+    finally:
+        if enabled and was_enabled:
+            gc.enable()
+
+
 class SJRFileRepository(ISJRRepository):
     """
     Repositorio de datos SJR basado en archivo CSV.
@@ -17,19 +86,135 @@ class SJRFileRepository(ISJRRepository):
     Estrategia de búsqueda:
     1. Búsqueda primaria por Sourceid (identificador único de la revista)
     2. Fallback por nombre normalizado de revista
+    3. Fallback aproximado por título (ver sjr_fuzzy_index), si `fuzzy_threshold` > 0
+
+    Está pensado para instanciarse una sola vez por proceso (ver Container):
+    el CSV se procesa en `load()` y las consultas son búsquedas en diccionario.
+
+    Todos los índices se publican juntos en un único diccionario que se
+    reemplaza de forma atómica en `reload()`: cada consulta toma la referencia
+    vigente al empezar, así que las consultas en curso terminan sobre el
+    índice anterior y nunca ven uno a medio construir.
     """
 
-    def __init__(self, csv_path: str):
+    def __init__(
+        self,
+        csv_path: str,
+        autoload: bool = True,
+        use_snapshot: bool = True,
+        fuzzy_threshold: float = 0.0,
+        csv_parser: str = CSV_PARSER_PANDAS
+    ):
+        if csv_parser not in CSV_PARSERS:
+            raise ValueError(f"Lector de CSV SJR desconocido: '{csv_parser}' (opciones: {', '.join(CSV_PARSERS)})")
         self._csv_path = csv_path
-        # Caché primario: (sourceid, año) -> (áreas, categorías)
-        self._sourceid_cache: Dict[Tuple[str, int], Tuple[List[str], List[str]]] = {}
-        # Caché secundario (fallback): (nombre_normalizado, año) -> (áreas, categorías)
-        self._name_cache: Dict[Tuple[str, int], Tuple[List[str], List[str]]] = {}
-        self._max_year_available: int = 0
-        self._load_data()
+        # Snapshot binario de los índices junto al CSV (ver sjr_snapshot)
+        self._use_snapshot = use_snapshot
+        # Similitud mínima del fallback aproximado por título (0 = desactivado)
+        self._fuzzy_threshold = fuzzy_threshold
+        # Lector del CSV cuando no hay snapshot vigente (CSV_PARSER_*)
+        self._csv_parser = csv_parser
+        # Índices publicados (ver `_build_indexes`), representación compacta e internada:
+        # - area_names / category_labels: textos únicos de áreas y etiquetas de
+        #   categoría (texto 'Nombre (Qx)', percentil Top 10% o '')
+        # - rows: filas únicas (ids de áreas, ids de etiquetas)
+        # - sourceid_index / name_index: clave -> (años, ids de fila), ambos
+        #   apuntan al mismo almacén de filas
+        # - max_year / years: año máximo y años presentes
+        # - year_editions: año -> edición SJR que lo aporta
+        # - journal_titles / sourceid_titles: título visible por nombre
+        #   normalizado y nombre normalizado por Sourceid
+        # - fuzzy_index: índice de trigramas sobre las claves de name_index (o None)
+        #   y fuzzy_cache: (nombre normalizado, año) -> fila (o None)
+        # - journal_directory: títulos ordenados para búsqueda por prefijo
+        self._indexes: Dict = self._empty_indexes()
+        self._ready = False
+        self._load_lock = threading.Lock()
+        # Contadores y latencias por ruta de búsqueda (LOOKUP_*)
+        self.metrics = MetricsRecorder()
+        if autoload:
+            self.load()
+
+    @property
+    def is_ready(self) -> bool:
+        """Indica si el dataset SJR ya fue cargado correctamente."""
+        return self._ready
+
+    def load(self, pause_gc: bool = False) -> bool:
+        """
+        Carga el dataset SJR una única vez (idempotente y seguro entre hilos).
+
+        Args:
+            pause_gc: Pausar el recolector de basura durante la construcción
+                (ver `gc_paused`). Afecta a todo el proceso: sólo para la carga
+                inicial, antes de atender peticiones, o en un proceso aparte.
+
+        Returns:
+            True si los datos quedaron disponibles para consulta
+        """
+        with self._load_lock:
+            if not self._ready:
+                with gc_paused(pause_gc):
+                    indexes = self._read_editions(self._csv_path)
+                if indexes is not None:
+                    self._indexes = self._with_derived_indexes(indexes)
+                    self._ready = True
+        return self._ready
+
+    def reload(self, csv_path: Optional[str] = None) -> bool:
+        """
+        Reconstruye los índices (p. ej. ante una nueva edición SJR) y los
+        reemplaza de forma atómica, sin interrumpir las consultas.
+
+        Mientras se construye el índice nuevo las consultas siguen usando el
+        anterior; si la construcción falla, el índice anterior se conserva.
+
+        Args:
+            csv_path: Nuevo CSV de SJR (por defecto, vuelve a leer el actual)
+
+        Returns:
+            True si se publicó un índice nuevo
+        """
+        with self._load_lock:
+            path = csv_path or self._csv_path
+            indexes = self._read_editions(path)
+            if indexes is None:
+                return False
+            self._csv_path = path
+            self._indexes = self._with_derived_indexes(indexes)
+            self._ready = True
+            logger.info(f"Índices SJR recargados desde {path}")
+        return True
+
+    @property
+    def csv_path(self) -> str:
+        """CSV de SJR del que provienen los índices publicados."""
+        return self._csv_path
+
+    def export_indexes(self) -> Dict:
+        """Índices actualmente publicados (formato del snapshot más `year_editions`)."""
+        return self._indexes
+
+    def iter_entries(self, by: str = 'sourceid') -> Iterator[Tuple[Tuple[str, int], Tuple[List[str], List[str]]]]:
+        """
+        Recorre un índice con las filas ya decodificadas.
+        Se usa para construir representaciones derivadas (p. ej. el índice mmap).
+
+        Args:
+            by: 'sourceid' o 'name'
+        """
+        indexes = self._indexes
+        index = indexes['sourceid_index'] if by == 'sourceid' else indexes['name_index']
+        for key, (years, row_ids) in index.items():
+            for year, row_id in zip(years, row_ids):
+                yield (key, year), self._decode_row(indexes, row_id)
 
     def get_max_available_year(self) -> int:
-        return self._max_year_available
+        return self._indexes['max_year']
+
+    def get_edition_for_year(self, publication_year: int) -> Optional[str]:
+        indexes = self._indexes
+        return indexes['year_editions'].get(self._resolve_year(indexes, publication_year))
 
     def get_journal_data(
         self, 
@@ -40,27 +225,42 @@ class SJRFileRepository(ISJRRepository):
         """
         Busca datos de la revista usando Sourceid con fallback por nombre.
         """
-        if not self._sourceid_cache and not self._name_cache:
+        started = time.perf_counter()
+        # Referencia local: un `reload()` concurrente no afecta a esta consulta
+        indexes = self._indexes
+        if not indexes['sourceid_index'] and not indexes['name_index']:
+            self.metrics.record(LOOKUP_UNAVAILABLE, time.perf_counter() - started)
             return [], [], publication_year
         
-        target_year = self._resolve_year(publication_year)
+        target_year = self._resolve_year(indexes, publication_year)
+        if target_year != publication_year:
+            self.metrics.increment(YEAR_CLAMPED)
         
         # 1. Búsqueda primaria por Sourceid
         if source_id:
             clean_sid = source_id.strip()
-            data = self._sourceid_cache.get((clean_sid, target_year))
-            if data:
-                areas, categories = data
+            row_id = self._find_row(indexes['sourceid_index'], clean_sid, target_year)
+            if row_id is not None:
+                areas, categories = self._decode_row(indexes, row_id)
                 logger.debug(f"SJR match por Sourceid '{clean_sid}' año {target_year}")
+                self.metrics.record(LOOKUP_SOURCEID, time.perf_counter() - started)
                 return areas, categories, target_year
         
         # 2. Fallback por nombre de revista
         if source_title:
             normalized_name = self.normalize_journal_name(source_title)
-            data = self._name_cache.get((normalized_name, target_year))
-            if data:
-                areas, categories = data
+            row_id = self._find_row(indexes['name_index'], normalized_name, target_year)
+            if row_id is not None:
+                areas, categories = self._decode_row(indexes, row_id)
                 logger.debug(f"SJR match por nombre '{source_title}' año {target_year}")
+                self.metrics.record(LOOKUP_NAME, time.perf_counter() - started)
+                return areas, categories, target_year
+
+            # 3. Fallback aproximado por título
+            row_id = self._find_fuzzy_row(indexes, normalized_name, target_year)
+            if row_id is not None:
+                areas, categories = self._decode_row(indexes, row_id)
+                self.metrics.record(LOOKUP_FUZZY, time.perf_counter() - started)
                 return areas, categories, target_year
         
         if source_id or source_title:
@@ -68,171 +268,294 @@ class SJRFileRepository(ISJRRepository):
                 f"Sin match SJR: Sourceid={source_id}, título='{source_title}', año={target_year}"
             )
         
+        self.metrics.record(LOOKUP_MISS, time.perf_counter() - started)
         return [], [], target_year
 
-    @lru_cache(maxsize=2048)
+    def get_journal_data_many(
+        self,
+        queries: List[Tuple[Optional[str], int, str]]
+    ) -> List[Tuple[List[str], List[str], int, bool]]:
+        """
+        Versión por lotes de `get_journal_data` sobre un mismo índice publicado.
+
+        Cada título distinto se normaliza una sola vez y cada (Sourceid, año,
+        título) distinto se busca una sola vez. En las métricas, cada consulta
+        cuenta en su ruta, pero la latencia se registra sólo por consulta distinta.
+        """
+        indexes = self._indexes
+        if not indexes['sourceid_index'] and not indexes['name_index']:
+            self.metrics.increment(LOOKUP_UNAVAILABLE, len(queries))
+            return [([], [], publication_year, False) for _, publication_year, _ in queries]
+
+        normalized_titles = {
+            title: self.normalize_journal_name(title)
+            for title in {source_title for _, _, source_title in queries if source_title}
+        }
+
+        sourceid_index = indexes['sourceid_index']
+        name_index = indexes['name_index']
+        find_row = self._find_row
+        resolved: Dict[Tuple[Optional[str], int, str], Tuple[List[str], List[str], int, str]] = {}
+        # Varias consultas pueden llegar a la misma fila (p. ej. por Sourceid y por nombre)
+        decoded: Dict[int, Tuple[List[str], List[str]]] = {}
+        results = []
+        # Métricas acumuladas localmente y agregadas al final del lote
+        path_counts: Dict[str, int] = {}
+        durations: Dict[str, List[float]] = {}
+        clamped = 0
+        for query in queries:
+            data = resolved.get(query)
+            if data is None:
+                started = time.perf_counter()
+                source_id, publication_year, source_title = query
+                target_year = self._resolve_year(indexes, publication_year)
+                row_id = None
+                path = LOOKUP_MISS
+                if source_id:
+                    row_id = find_row(sourceid_index, source_id.strip(), target_year)
+                    path = LOOKUP_SOURCEID
+                if row_id is None and source_title:
+                    row_id = find_row(name_index, normalized_titles[source_title], target_year)
+                    path = LOOKUP_NAME
+                    if row_id is None:
+                        row_id = self._find_fuzzy_row(indexes, normalized_titles[source_title], target_year)
+                        path = LOOKUP_FUZZY
+                if row_id is None:
+                    data = ([], [], target_year, LOOKUP_MISS)
+                else:
+                    if row_id not in decoded:
+                        decoded[row_id] = self._decode_row(indexes, row_id)
+                    data = (*decoded[row_id], target_year, path)
+                resolved[query] = data
+                durations.setdefault(data[3], []).append(time.perf_counter() - started)
+            path_counts[data[3]] = path_counts.get(data[3], 0) + 1
+            if data[2] != query[1]:
+                clamped += 1
+            # Listas propias por publicación: no se comparten entre entidades
+            results.append((data[0].copy(), data[1].copy(), data[2], data[3] == LOOKUP_FUZZY))
+
+        if clamped:
+            path_counts[YEAR_CLAMPED] = clamped
+        self.metrics.merge(path_counts, durations)
+        logger.debug(
+            f"SJR por lotes: {len(queries)} consultas, {len(resolved)} distintas, "
+            f"{path_counts.get(LOOKUP_MISS, 0)} sin match"
+        )
+        return results
+
+    def search_journals(
+        self,
+        query: str,
+        limit: int = 10,
+        publication_year: Optional[int] = None
+    ) -> List[SJRJournal]:
+        indexes = self._indexes
+        directory = indexes['journal_directory']
+        if directory is None:
+            return []
+        titles = directory.search(self.normalize_journal_name(query), limit)
+        return [
+            self._journal(indexes, indexes['name_index'], title, title, publication_year)
+            for title in titles
+        ]
+
+    def get_journal_by_sourceid(
+        self,
+        source_id: str,
+        publication_year: Optional[int] = None
+    ) -> Optional[SJRJournal]:
+        indexes = self._indexes
+        clean_sid = source_id.strip()
+        if clean_sid not in indexes['sourceid_index']:
+            return None
+        title = indexes['sourceid_titles'].get(clean_sid, '')
+        return self._journal(indexes, indexes['sourceid_index'], clean_sid, title, publication_year)
+
+    def _journal(
+        self,
+        indexes: Dict,
+        index: Dict[str, Tuple[Tuple[int, ...], Tuple[int, ...]]],
+        key: str,
+        normalized_title: str,
+        publication_year: Optional[int]
+    ) -> SJRJournal:
+        """
+        Arma la revista con los datos de `index[key]` para el año pedido
+        (o para el más reciente de la revista si no se indica).
+        """
+        directory = indexes['journal_directory']
+        years = sorted(index[key][0])
+        if publication_year is None:
+            target_year = years[-1]
+        else:
+            target_year = self._resolve_year(indexes, publication_year)
+
+        areas: List[str] = []
+        categories: List[str] = []
+        row_id = self._find_row(index, key, target_year)
+        if row_id is not None:
+            areas, categories = self._decode_row(indexes, row_id)
+        return SJRJournal(
+            title=directory.display_title(normalized_title) or normalized_title,
+            source_ids=list(directory.sourceids(normalized_title)),
+            years=years,
+            sjr_year=target_year,
+            sjr_edition=indexes['year_editions'].get(target_year),
+            subject_areas=areas,
+            categories_with_quartiles=categories
+        )
+
     def normalize_journal_name(self, name: str) -> str:
         if not isinstance(name, str):
             name = str(name) if name else ""
-        
-        name = name.lower().strip()
-        name = unicodedata.normalize('NFKD', name)
-        name = ''.join(c for c in name if not unicodedata.combining(c))
-        name = name.replace('&', 'and')
-        name = ''.join(c for c in name if c.isalnum() or c.isspace())
-        name = ' '.join(name.split())
-        return name
-
-    def _resolve_year(self, requested_year: int) -> int:
-        if self._max_year_available > 0 and requested_year > self._max_year_available:
-            return self._max_year_available
+        return _normalize_journal_name(name)
+
+    @staticmethod
+    def _find_row(
+        index: Dict[str, Tuple[Tuple[int, ...], Tuple[int, ...]]], key: str, year: int
+    ) -> Optional[int]:
+        entry = index.get(key)
+        if entry is None:
+            return None
+        years, row_ids = entry
+        # Una revista tiene a lo sumo unas decenas de años: búsqueda lineal (en C)
+        if year not in years:
+            return None
+        return row_ids[years.index(year)]
+
+    def _find_fuzzy_row(self, indexes: Dict, normalized_name: str, year: int) -> Optional[int]:
+        """Fila del título SJR más parecido que tiene datos para el año, si supera el umbral."""
+        fuzzy_index = indexes['fuzzy_index']
+        if fuzzy_index is None or not normalized_name:
+            return None
+        cache = indexes['fuzzy_cache']
+        if (normalized_name, year) in cache:
+            return cache[(normalized_name, year)]
+
+        name_index = indexes['name_index']
+        match = fuzzy_index.search(
+            normalized_name,
+            self._fuzzy_threshold,
+            lambda title: self._find_row(name_index, title, year) is not None
+        )
+        row_id = None
+        if match is not None:
+            title, similarity = match
+            logger.debug(f"SJR match aproximado '{normalized_name}' -> '{title}' ({similarity:.2f}) año {year}")
+            row_id = self._find_row(name_index, title, year)
+        if len(cache) >= FUZZY_CACHE_SIZE:
+            cache.clear()
+        cache[(normalized_name, year)] = row_id
+        return row_id
+
+    def _with_derived_indexes(self, indexes: Dict) -> Dict:
+        """
+        Agrega a los índices a publicar los que se derivan de ellos y no se
+        guardan en el snapshot: directorio de revistas e índice aproximado de títulos.
+        """
+        journal_directory = SJRJournalDirectory(indexes['journal_titles'], indexes['sourceid_titles'])
+        fuzzy_index = None
+        if self._fuzzy_threshold > 0:
+            fuzzy_index = SJRFuzzyTitleIndex(list(indexes['name_index']))
+            logger.info(f"Índice aproximado de títulos SJR: {len(fuzzy_index)} títulos")
+        return dict(indexes, journal_directory=journal_directory, fuzzy_index=fuzzy_index, fuzzy_cache={})
+
+    @classmethod
+    def _decode_row(cls, indexes: Dict, row_id: int) -> Tuple[List[str], List[str]]:
+        """Convierte una fila internada en las listas de textos que recibe `Publication`."""
+        area_ids, label_ids = indexes['rows'][row_id]
+        area_names = indexes['area_names']
+        category_labels = indexes['category_labels']
+        areas = [area_names[i] for i in area_ids]
+        categories = [cls._format_category(*category_labels[i]) for i in label_ids]
+        return areas, categories
+
+    @staticmethod
+    def _format_category(display: str, top_percent: str) -> str:
+        if not top_percent:
+            return display
+        return f"{display}[Categoría dentro del 10% superior ({top_percent})]"
+
+    @staticmethod
+    def _resolve_year(indexes: Dict, requested_year: int) -> int:
+        max_year = indexes['max_year']
+        if max_year > 0 and requested_year > max_year:
+            return max_year
         return requested_year
 
-    def _load_data(self) -> None:
+    def _read_editions(self, csv_path: str) -> Optional[Dict]:
+        """
+        Índices a publicar: los del CSV, con todos sus años asignados a la
+        edición del archivo. `SJREditionRegistry` lo redefine para combinar
+        varias ediciones.
         """
-        Carga el CSV, calcula percentiles y puebla el caché indexado por Sourceid.
+        indexes = self._read_indexes(csv_path)
+        if indexes is None:
+            return None
+        edition = edition_name(csv_path)
+        return dict(indexes, year_editions={year: edition for year in indexes['years']})
+
+    def _read_indexes(self, csv_path: str) -> Optional[Dict]:
+        """
+        Obtiene los índices SJR de un CSV desde su snapshot binario si está
+        vigente; en caso contrario procesa el CSV y guarda un snapshot nuevo.
+
+        Returns:
+            Los índices construidos, o None si no se pudieron obtener
         """
         try:
-            # Leer CSV forzando string para no perder datos
-            df = pd.read_csv(self._csv_path, sep=';', decimal=',', dtype=str)
-            
-            # Limpiar nombres de columnas
-            df.columns = [c.strip() for c in df.columns]
-
-            # Detectar columna Sourceid
-            col_map = {c.lower(): c for c in df.columns}
-            sourceid_col_name = col_map.get('sourceid')
-            
-            rank_col = 'Rank'
-            if 'Rank' not in df.columns and 'SJR Rank' in df.columns:
-                rank_col = 'SJR Rank'
-            
-            # Convertir a numéricos
-            df[rank_col] = pd.to_numeric(df[rank_col], errors='coerce').fillna(float('inf'))
-            df['year'] = pd.to_numeric(df['year'], errors='coerce').fillna(0).astype(int)
-
-            df['Title_norm'] = df['Title'].apply(self.normalize_journal_name)
-            
-            if sourceid_col_name:
-                df['Sourceid_Final'] = df[sourceid_col_name].fillna('').astype(str).str.strip()
-            else:
-                logger.warning("¡Columna Sourceid no encontrada en el CSV de SJR!")
-                df['Sourceid_Final'] = ''
-            
-            self._max_year_available = int(df['year'].max()) if not df.empty else 0
-
-            # --- FASE 1: Construir universos COMPLETOS (Corregido) ---
-            category_universes: Dict[Tuple[int, str], List[float]] = defaultdict(list)
-            processed_rows = []
-
-            for _, row in df.iterrows():
-                try:
-                    year = int(row.get('year', 0))
-                    rank = float(row.get(rank_col, float('inf')))
-                    title_norm = row['Title_norm']
-                    areas_str = str(row.get('Areas', ''))
-                    categories_str = str(row.get('Categories', ''))
-                    sourceid_str = str(row.get('Sourceid_Final', '')).strip()
-
-                    parsed_cats = self._parse_categories_structured(categories_str)
-                    
-                    processed_rows.append({
-                        'key': (title_norm, year),
-                        'rank': rank,
-                        'areas': self._parse_areas(areas_str),
-                        'categories': parsed_cats,
-                        'sourceid': sourceid_str
-                    })
-
-                    for cat in parsed_cats:
-                        category_universes[(year, cat['name'])].append(rank)
-
-                except (ValueError, TypeError):
-                    continue
-
-            # Ordenamos las listas para poder calcular la posición (ranking relativo)
-            for key in category_universes:
-                category_universes[key].sort()
-
-            # --- FASE 2: Calcular percentiles y guardar caché ---
-            count_sourceid_entries = 0
-            count_name_entries = 0
-            
-            for item in processed_rows:
-                title_norm = item['key'][0]
-                year = item['key'][1]
-                my_rank = item['rank']
-                final_categories_str = []
-
-                # Lógica de cálculo de Top 10%
-                for cat in item['categories']:
-                    cat_name = cat['name']
-                    quartile = cat['quartile']
-                    cat_display = f"{cat_name} ({quartile})" if quartile else cat_name
-
-                    # Solo nos interesa marcar Top 10% si la revista ya es Q1
-                    if quartile == 'Q1':
-                        universe = category_universes.get((year, cat_name), [])
-                        total_journals = len(universe)
-                        
-                        if total_journals > 0:
-                            try:
-                                real_position = universe.index(my_rank) + 1
-                                percent_top = (real_position / total_journals) * 100.0
-                                
-                                if percent_top <= 10.0:
-                                    cat_display += f"[Categoría dentro del 10% superior ({percent_top:.1f})]"
-                            except ValueError:
-                                pass 
-                    final_categories_str.append(cat_display)
-
-                result_tuple = (item['areas'], final_categories_str)
-
-                # Guardar en Caché Primario (Sourceid)
-                sourceid = item['sourceid']
-                if sourceid:
-                    self._sourceid_cache[(sourceid, year)] = result_tuple
-                    count_sourceid_entries += 1
-                
-                # Guardar en Caché Secundario (Nombre)
-                if title_norm:
-                    self._name_cache[(title_norm, year)] = result_tuple
-                    count_name_entries += 1
-            
-            logger.info(
-                f"SJR cargado. Sourceids: {count_sourceid_entries}. Nombres: {count_name_entries}. "
-                f"Año máximo: {self._max_year_available}"
-            )
+            fingerprint = None
+            if self._use_snapshot:
+                indexes = read_snapshot(csv_path)
+                if indexes is not None:
+                    logger.info(
+                        f"SJR cargado desde snapshot. Sourceids: {len(indexes['sourceid_index'])}. "
+                        f"Nombres: {len(indexes['name_index'])}. Filas únicas: {len(indexes['rows'])}. "
+                        f"Año máximo: {indexes['max_year']}"
+                    )
+                    return indexes
+                # Huella tomada antes de leer el CSV: si cambia durante el
+                # procesamiento, el snapshot quedará invalidado en el próximo arranque
+                fingerprint = CsvFingerprint.from_file(csv_path)
+
+            indexes = self._build_indexes(csv_path)
+
+            if fingerprint is not None:
+                write_snapshot(csv_path, indexes, fingerprint)
+            return indexes
 
         except FileNotFoundError:
-            logger.error(f"No se encontró el archivo SJR en {self._csv_path}")
+            logger.error(f"No se encontró el archivo SJR en {csv_path}")
         except Exception as e:
             logger.error(f"Error procesando SJR: {e}", exc_info=True)
+        return None
 
     @staticmethod
-    def _parse_categories_structured(categories_str: str) -> List[Dict[str, str]]:
-        if not categories_str or categories_str == 'nan':
-            return []
-        results = []
-        parts = categories_str.split(';')
-        for part in parts:
-            part = part.strip()
-            if not part: continue
-            quartile = ""
-            name = part
-            if part.endswith(')'):
-                last_open = part.rfind('(')
-                if last_open != -1:
-                    q_candidate = part[last_open+1:-1].strip()
-                    if q_candidate.startswith('Q') and len(q_candidate) <= 3:
-                        quartile = q_candidate
-                        name = part[:last_open].strip()
-            results.append({'name': name, 'quartile': quartile})
-        return results
+    def _empty_indexes() -> Dict:
+        return {
+            'area_names': [],
+            'category_labels': [],
+            'rows': [],
+            'sourceid_index': {},
+            'name_index': {},
+            'max_year': 0,
+            'years': [],
+            'year_editions': {},
+            'journal_titles': {},
+            'sourceid_titles': {},
+            'journal_directory': None,
+            'fuzzy_index': None,
+            'fuzzy_cache': {},
+        }
 
-    @staticmethod
-    def _parse_areas(areas_str: str) -> List[str]:
-        if not areas_str or areas_str == 'nan':
-            return []
-        parts = areas_str.split(';')
-        return [part.strip() for part in parts if part.strip()]
\ No newline at end of file
+    def _build_indexes(self, csv_path: str) -> Dict:
+        """
+        Procesa el CSV con el lector configurado (`csv_parser`); ambos
+        construyen exactamente los mismos índices.
+        """
+        # Importación diferida: el lector en streaming evita cargar pandas
+        if self._csv_parser == CSV_PARSER_STREAM:
+            from .sjr_csv_stream import build_sjr_indexes
+        else:
+            from .sjr_csv_pandas import build_sjr_indexes
+        return build_sjr_indexes(csv_path, self.normalize_journal_name)
@@ -0,0 +1,165 @@
+"""
+Índice aproximado de títulos de revista para el fallback SJR.
+
+Cuando una publicación no tiene Sourceid en el SJR y su nombre normalizado no
+coincide exactamente (actas de congresos con año o número de edición, revistas
+renombradas, variaciones de puntuación), se busca el título más parecido por
+similitud de Jaccard sobre trigramas de caracteres.
+
+El índice se construye una vez sobre los títulos únicos (no por año): el año
+se verifica al final contra el índice por nombre, de modo que la memoria no
+crece con el histórico. Todas las estructuras son arreglos de NumPy en formato
+CSR (títulos -> trigramas y trigramas -> títulos).
+
+Para acotar la latencia, los candidatos salen sólo de los trigramas más raros
+de la consulta (filtro de prefijo): un título con similitud >= umbral debe
+compartir al menos uno de ellos, así que el filtro no pierde coincidencias.
+
+Las revistas hermanas ('Acta Crystallographica Section C' / 'Section D',
+'Journal of Physics D' / 'Journal of Physics') se parecen mucho en trigramas
+pero son revistas distintas: un candidato sólo se acepta si sus designadores
+(letras sueltas y 'section X', 'part X', 'series X') coinciden exactamente.
+"""
+import math
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Presupuesto de listas invertidas a recorrer en el filtro de conteo: múltiplo
+# del costo del prefijo mínimo, con un piso absoluto (en entradas)
+PROBE_BUDGET_FACTOR = 2
+MIN_PROBE_BUDGET = 2000
+# Palabras que introducen el designador de una revista dentro de una serie
+DESIGNATOR_WORDS = frozenset({"section", "sect", "part", "series", "serie", "ser"})
+
+
+def fuzzy_key(normalized_title: str) -> str:
+    """
+    Clave de comparación: el título normalizado sin las palabras con dígitos
+    (años, números de edición: '2019', '15th'), que no identifican a la revista.
+    """
+    return ' '.join(token for token in normalized_title.split() if not any(c.isdigit() for c in token))
+
+
+def designators(normalized_title: str) -> FrozenSet[str]:
+    """
+    Partes del título que distinguen revistas de una misma serie: letras
+    sueltas ('d') y la palabra que sigue a 'section', 'part', 'series'
+    ('section c', 'part 2'), incluidos los números que `fuzzy_key` descarta.
+    """
+    tokens = normalized_title.split()
+    found = set()
+    for position, token in enumerate(tokens):
+        if len(token) == 1 and token.isalpha():
+            found.add(token)
+        if token in DESIGNATOR_WORDS and position + 1 < len(tokens):
+            found.add(f"{token} {tokens[position + 1]}")
+    return frozenset(found)
+
+
+def trigrams(key: str) -> Set[str]:
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SJRFuzzyTitleIndex:
+    """Índice de trigramas sobre los títulos normalizados de revistas SJR."""
+
+    def __init__(self, titles: List[str]):
+        self._titles = titles
+        gram_ids: Dict[str, int] = {}
+        title_grams: List[List[int]] = []
+        for title in titles:
+            title_grams.append(sorted(
+                gram_ids.setdefault(gram, len(gram_ids)) for gram in trigrams(fuzzy_key(title))
+            ))
+        self._gram_ids = gram_ids
+
+        # Títulos -> trigramas (ids ordenados)
+        lengths = np.array([len(grams) for grams in title_grams], dtype=np.int64)
+        self._title_offsets = np.zeros(len(titles) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self._title_offsets[1:])
+        self._title_grams = np.fromiter(
+            (gram for grams in title_grams for gram in grams), dtype=np.int32, count=int(lengths.sum())
+        )
+        self._title_sizes = lengths
+
+        # Trigramas -> títulos (listas invertidas)
+        owners = np.repeat(np.arange(len(titles), dtype=np.int32), lengths)
+        order = np.argsort(self._title_grams, kind='stable')
+        self._postings = owners[order]
+        self._posting_offsets = np.searchsorted(
+            self._title_grams[order], np.arange(len(gram_ids) + 1)
+        ).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def search(
+        self,
+        normalized_title: str,
+        threshold: float,
+        accept: Callable[[str], bool]
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Busca el título más parecido con similitud >= `threshold` y los
+        mismos designadores (ver `designators`).
+
+        Args:
+            normalized_title: Título ya normalizado (ver `normalize_journal_name`)
+            threshold: Similitud de Jaccard mínima (0-1]
+            accept: Filtro de candidatos (p. ej. que tengan datos para el año)
+
+        Returns:
+            (título, similitud) del mejor candidato aceptado, o None
+        """
+        query_grams = trigrams(fuzzy_key(normalized_title))
+        known = [self._gram_ids[gram] for gram in query_grams if gram in self._gram_ids]
+        query_size = len(query_grams)
+        min_shared = math.ceil(threshold * query_size)
+        prefix_length = len(known) - min_shared + 1
+        if not known or prefix_length <= 0:
+            return None
+
+        # Candidatos: títulos que comparten alguno de los trigramas más raros.
+        # Mientras sea barato, se cuentan también los siguientes trigramas en
+        # rareza: por cada trigrama extra contado, el candidato debe compartir
+        # uno más (filtro de conteo), lo que descarta la mayoría antes de verificar.
+        known_array = np.array(known, dtype=np.int64)
+        starts = self._posting_offsets[known_array]
+        ends = self._posting_offsets[known_array + 1]
+        order = np.argsort(ends - starts, kind='stable')
+        cumulative = np.cumsum((ends - starts)[order])
+        budget = max(cumulative[prefix_length - 1] * PROBE_BUDGET_FACTOR, MIN_PROBE_BUDGET)
+        probed = min(max(int(np.searchsorted(cumulative, budget, side='right')), prefix_length), len(known))
+        counts = np.bincount(
+            np.concatenate([self._postings[starts[i]:ends[i]] for i in order[:probed].tolist()]),
+            minlength=len(self._titles)
+        )
+        candidates = np.flatnonzero(counts >= probed - prefix_length + 1)
+        # Cota superior de trigramas compartidos y filtro de Jaccard por tamaño
+        sizes = self._title_sizes[candidates]
+        upper_bound = counts[candidates] + (len(known) - probed)
+        candidates = candidates[upper_bound * (1 + threshold) >= threshold * (query_size + sizes)]
+        if candidates.size == 0:
+            return None
+
+        # Similitud exacta de todos los candidatos en una sola pasada
+        sizes = self._title_sizes[candidates]
+        segment_ends = np.cumsum(sizes)
+        positions = np.arange(segment_ends[-1]) + np.repeat(self._title_offsets[candidates] - segment_ends + sizes, sizes)
+        in_query = np.zeros(len(self._gram_ids), dtype=bool)
+        in_query[known_array] = True
+        shared_prefix = np.zeros(segment_ends[-1] + 1, dtype=np.int64)
+        np.cumsum(in_query[self._title_grams[positions]], out=shared_prefix[1:])
+        shared = shared_prefix[segment_ends] - shared_prefix[segment_ends - sizes]
+        similarity = shared / (query_size + sizes - shared)
+
+        passing = np.flatnonzero(similarity >= threshold)
+        query_designators = designators(normalized_title)
+        for position in passing[np.argsort(-similarity[passing], kind='stable')].tolist():
+            score = float(similarity[position])
+            title = self._titles[candidates[position]]
+            if title != normalized_title and designators(title) == query_designators and accept(title):
+                return title, score
+        return None
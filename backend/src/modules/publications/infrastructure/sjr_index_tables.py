@@ -0,0 +1,71 @@
+"""
+Tablas internadas comunes a los lectores del CSV de SJR (ver sjr_csv_pandas
+y sjr_csv_stream), de modo que ambos publiquen exactamente los mismos índices.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Fila internada: (ids de áreas, ids de etiquetas de categoría)
+Row = Tuple[Tuple[int, ...], Tuple[int, ...]]
+# Índice por clave: clave -> (años, ids de fila) en paralelo
+KeyIndex = Dict[str, Tuple[Tuple[int, ...], Tuple[int, ...]]]
+
+
+class SJRRowStore:
+    """
+    Almacén de filas únicas, en orden de aparición.
+
+    Las tuplas de ids idénticas (muy repetidas a lo largo del histórico) se
+    comparten entre filas.
+    """
+
+    def __init__(self):
+        self.rows: List[Row] = []
+        self._row_ids: Dict[Row, int] = {}
+        self._id_tuples: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+
+    def intern(self, ids: Iterable[int]) -> Tuple[int, ...]:
+        ids = tuple(ids)
+        return self._id_tuples.setdefault(ids, ids)
+
+    def add(self, area_ids: Iterable[int], label_ids: Iterable[int]) -> int:
+        """Id de la fila (la agrega si es nueva)."""
+        row = (self.intern(area_ids), self.intern(label_ids))
+        row_id = self._row_ids.get(row)
+        if row_id is None:
+            row_id = self._row_ids[row] = len(self.rows)
+            self.rows.append(row)
+        return row_id
+
+
+def index_by_key(keys: List[str], years: List[int], row_of: List[int]) -> KeyIndex:
+    """
+    Agrupa las filas por clave: clave -> (años, ids de fila) en paralelo.
+
+    Evita una tupla (clave, año) por entrada; las tuplas de años idénticas
+    (revistas con el mismo histórico) se comparten.
+    """
+    by_key: Dict[str, Dict[int, int]] = {}
+    for key, year, row_id in zip(keys, years, row_of):
+        if key:
+            # En claves repetidas prevalece la última fila
+            by_key.setdefault(key, {})[year] = row_id
+    return freeze_key_index(by_key)
+
+
+def freeze_key_index(by_key: Dict[str, Dict[int, int]], row_of: Optional[Sequence[int]] = None) -> KeyIndex:
+    """
+    Convierte clave -> {año: fila} en el índice publicado.
+
+    Args:
+        by_key: Filas por clave y año, en orden de aparición
+        row_of: Si se indica, traduce cada fila del CSV a su id de fila única
+    """
+    year_tuples: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+    index: KeyIndex = {}
+    for key, rows_by_year in by_key.items():
+        key_years = tuple(rows_by_year)
+        row_ids = rows_by_year.values()
+        if row_of is not None:
+            row_ids = (row_of[row] for row in row_ids)
+        index[key] = (year_tuples.setdefault(key_years, key_years), tuple(row_ids))
+    return index
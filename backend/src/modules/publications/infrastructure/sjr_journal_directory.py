@@ -0,0 +1,127 @@
+"""
+Directorio de revistas SJR para búsqueda por prefijo (autocompletado).
+
+Se construye al publicar los índices SJR a partir de los títulos normalizados
+(claves de `name_index`) y sus Sourceids. Todo son arreglos ordenados con
+búsqueda binaria:
+
+- Prefijo del título completo: 'journal of ph' -> 'journal of physics a', ...
+- Prefijo desde el inicio de cualquier palabra: 'physics let' ->
+  'applied physics letters', con un arreglo de sufijos de palabra (cada título
+  aporta un sufijo por palabra; sólo se guardan título y desplazamiento).
+
+Los resultados se devuelven en orden alfabético del título normalizado:
+primero los que empiezan por la consulta y luego los que la contienen a partir
+de una palabra.
+"""
+import bisect
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class SJRJournalDirectory:
+    """Títulos de revistas SJR ordenados, con sus títulos visibles y Sourceids."""
+
+    def __init__(self, journal_titles: Dict[str, str], sourceid_titles: Dict[str, str]):
+        """
+        Args:
+            journal_titles: Título normalizado -> título tal como aparece en el SJR
+            sourceid_titles: Sourceid -> título normalizado
+        """
+        self._keys: List[str] = sorted(journal_titles)
+        self._display_titles: List[str] = [journal_titles[key] for key in self._keys]
+        positions = {key: position for position, key in enumerate(self._keys)}
+
+        sourceids_by_position: Dict[int, List[str]] = {}
+        for source_id, title in sourceid_titles.items():
+            if title in positions:
+                sourceids_by_position.setdefault(positions[title], []).append(source_id)
+        self._sourceids: Dict[int, Tuple[str, ...]] = {
+            position: tuple(sorted(source_ids)) for position, source_ids in sourceids_by_position.items()
+        }
+        self._sourceid_titles = sourceid_titles
+
+        # Arreglo de sufijos desde el inicio de cada palabra, sin el primero
+        # (ése es el título completo). Se ordena con NumPy sobre los bytes UTF-8,
+        # cuyo orden coincide con el de los textos, sin retener el GIL.
+        suffix_positions: List[int] = []
+        suffix_offsets: List[int] = []
+        for position, key in enumerate(self._keys):
+            offset = key.find(' ')
+            while offset != -1:
+                suffix_positions.append(position)
+                suffix_offsets.append(offset + 1)
+                offset = key.find(' ', offset + 1)
+        suffixes = np.array(
+            [self._keys[position][offset:].encode() for position, offset in zip(suffix_positions, suffix_offsets)],
+            dtype=bytes
+        )
+        order = np.argsort(suffixes, kind='stable') if len(suffixes) else np.array([], dtype=np.int64)
+        self._suffix_positions = np.array(suffix_positions, dtype=np.int32)[order]
+        self._suffix_offsets = np.array(suffix_offsets, dtype=np.int32)[order]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def display_title(self, normalized_title: str) -> Optional[str]:
+        position = bisect.bisect_left(self._keys, normalized_title)
+        if position < len(self._keys) and self._keys[position] == normalized_title:
+            return self._display_titles[position]
+        return None
+
+    def sourceids(self, normalized_title: str) -> Tuple[str, ...]:
+        position = bisect.bisect_left(self._keys, normalized_title)
+        if position < len(self._keys) and self._keys[position] == normalized_title:
+            return self._sourceids.get(position, ())
+        return ()
+
+    def title_of_sourceid(self, source_id: str) -> Optional[str]:
+        return self._sourceid_titles.get(source_id)
+
+    def search(self, normalized_query: str, limit: int) -> List[str]:
+        """
+        Títulos normalizados que empiezan por la consulta o la contienen a
+        partir del inicio de una palabra, hasta `limit`.
+        """
+        if not normalized_query or limit <= 0:
+            return []
+
+        matches: List[int] = []
+        start = bisect.bisect_left(self._keys, normalized_query)
+        for position in range(start, len(self._keys)):
+            if len(matches) == limit or not self._keys[position].startswith(normalized_query):
+                break
+            matches.append(position)
+        if len(matches) == limit:
+            return [self._keys[position] for position in matches]
+
+        # Títulos con alguna palabra (no la primera) que empieza por la consulta
+        first = self._bisect_suffix(normalized_query)
+        last = self._bisect_suffix(normalized_query + "\uffff", first)
+        if last - first > len(self._keys) // 16:
+            # Rango grande (palabra muy común): marcar es lineal y ya sale ordenado
+            marked = np.zeros(len(self._keys), dtype=bool)
+            marked[self._suffix_positions[first:last]] = True
+            word_matches = np.flatnonzero(marked)
+        else:
+            word_matches = np.unique(self._suffix_positions[first:last])
+        seen = set(matches)
+        for position in word_matches.tolist():
+            if position not in seen:
+                matches.append(position)
+                if len(matches) == limit:
+                    break
+        return [self._keys[position] for position in matches]
+
+    def _bisect_suffix(self, text: str, low: int = 0) -> int:
+        """Primer sufijo >= `text` (búsqueda binaria comparando sólo los sufijos visitados)."""
+        high = len(self._suffix_positions)
+        while low < high:
+            middle = (low + high) // 2
+            position = int(self._suffix_positions[middle])
+            if self._keys[position][self._suffix_offsets[middle]:] < text:
+                low = middle + 1
+            else:
+                high = middle
+        return low
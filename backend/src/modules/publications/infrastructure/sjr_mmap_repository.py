@@ -0,0 +1,653 @@
+"""
+Repositorio SJR sobre un índice binario de sólo lectura mapeado en memoria.
+
+Con varios workers (uvicorn/gunicorn) por nodo, cada proceso con
+`SJRFileRepository` mantiene su propia copia de los diccionarios SJR en el
+heap. Este repositorio consulta en cambio un archivo `<SJR_CSV_PATH>.mmap`
+mediante `mmap`: las páginas del archivo las comparte el sistema operativo
+entre todos los procesos y sólo se materializan en Python los resultados de
+cada consulta.
+
+Formato del archivo (little-endian, secciones alineadas a 8 bytes):
+- Prefijo fijo: magic, versión y longitud de la cabecera JSON.
+- Cabecera JSON: huella del CSV, año máximo, edición de cada año y tabla de secciones.
+- strings: tabla de textos únicos (áreas y categorías ya formateadas).
+- rows: filas únicas [n_áreas, ids de áreas..., ids de categorías...].
+- sid_* / name_*: hashes de 64 bits ordenados de (clave + año), las claves
+  completas (para verificar colisiones) y el id de fila; la búsqueda es un
+  `searchsorted` de NumPy sobre los hashes.
+- year_lists: listas únicas de años [años...]; sid_years_* / name_years_*
+  tienen el mismo formato que sid_* / name_* pero con la clave sola y el id
+  de su lista de años, para obtener los años de una revista con una búsqueda.
+- journals: JSON con el título visible por nombre normalizado y el nombre
+  normalizado por Sourceid, para la búsqueda de revistas. El directorio de
+  búsqueda (ver sjr_journal_directory) se arma en cada proceso sólo la primera
+  vez que se busca una revista.
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .sjr_file_repository import (
+    CSV_PARSER_PANDAS, LOOKUP_MISS, LOOKUP_NAME, LOOKUP_SOURCEID, LOOKUP_UNAVAILABLE, YEAR_CLAMPED,
+    SJRFileRepository, _normalize_journal_name
+)
+from .sjr_journal_directory import SJRJournalDirectory
+from .sjr_snapshot import CsvFingerprint, is_source_unchanged, write_atomically
+from ..domain.sjr_journal import SJRJournal
+from ..domain.sjr_repository import ISJRRepository
+from ....shared.metrics import MetricsRecorder
+
+logger = logging.getLogger(__name__)
+
+MMAP_INDEX_VERSION = 4
+MMAP_INDEX_SUFFIX = ".mmap"
+
+_MAGIC = b"SJRMMAP\x00"
+_PREFIX = struct.Struct("<8sII")
+_ALIGNMENT = 8
+
+
+def mmap_index_path(csv_path: str) -> str:
+    """Ruta del índice mapeable asociado a un CSV (mismo directorio)."""
+    return f"{csv_path}{MMAP_INDEX_SUFFIX}"
+
+
+def _encode_key(key: str, year: int) -> bytes:
+    # El separador \x00 no aparece en Sourceids ni en nombres normalizados
+    return key.encode("utf-8") + b"\x00" + struct.pack(">I", year)
+
+
+def _key_hash(encoded_key: bytes) -> int:
+    # Hash estable entre procesos (hash() de Python es aleatorio por proceso)
+    return int.from_bytes(hashlib.blake2b(encoded_key, digest_size=8).digest(), "little")
+
+
+def _hash_table(entries: Iterable[Tuple[bytes, int]]) -> Tuple[np.ndarray, np.ndarray, bytes, np.ndarray]:
+    """Hashes ordenados, offsets de las claves, claves concatenadas e ids (ver `_KeyTable`)."""
+    hashed = sorted((_key_hash(encoded), encoded, value) for encoded, value in entries)
+    key_offsets = np.zeros(len(hashed) + 1, dtype="<u8")
+    key_offsets[1:] = np.cumsum([len(k) for _, k, _ in hashed], dtype="<u8")
+    return (
+        np.array([h for h, _, _ in hashed], dtype="<u8"),
+        key_offsets,
+        b"".join(k for _, k, _ in hashed),
+        np.array([v for _, _, v in hashed], dtype="<u4"),
+    )
+
+
+def build_mmap_index(
+    path: str,
+    sourceid_entries: Iterable[Tuple[Tuple[str, int], Tuple[List[str], List[str]]]],
+    name_entries: Iterable[Tuple[Tuple[str, int], Tuple[List[str], List[str]]]],
+    max_year: int,
+    year_editions: Dict[int, str],
+    fingerprint: CsvFingerprint,
+    journal_titles: Optional[Dict[str, str]] = None,
+    sourceid_titles: Optional[Dict[str, str]] = None
+) -> bool:
+    """
+    Serializa los índices de `SJRFileRepository` al formato mapeable.
+
+    Args:
+        path: Ruta del archivo a generar
+        sourceid_entries: Entradas ((sourceid, año), (áreas, categorías))
+            (ver `SJRFileRepository.iter_entries`)
+        name_entries: Entradas ((nombre_normalizado, año), (áreas, categorías))
+        max_year: Año máximo disponible
+        year_editions: Edición SJR de cada año
+        fingerprint: Huella del CSV del que provienen los índices
+        journal_titles: Título visible por nombre normalizado
+        sourceid_titles: Nombre normalizado por Sourceid
+
+    Returns:
+        True si el archivo se escribió correctamente
+    """
+    string_ids: Dict[str, int] = {}
+    row_ids: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], int] = {}
+    row_items: List[int] = []
+    row_offsets: List[int] = [0]
+    years = set()
+
+    def _string_id(text: str) -> int:
+        if text not in string_ids:
+            string_ids[text] = len(string_ids)
+        return string_ids[text]
+
+    def _row_id(entry: Tuple[List[str], List[str]]) -> int:
+        areas, categories = entry
+        row_key = (tuple(areas), tuple(categories))
+        if row_key not in row_ids:
+            row_ids[row_key] = len(row_ids)
+            row_items.append(len(areas))
+            row_items.extend(_string_id(a) for a in areas)
+            row_items.extend(_string_id(c) for c in categories)
+            row_offsets.append(len(row_items))
+        return row_ids[row_key]
+
+    year_list_ids: Dict[Tuple[int, ...], int] = {}
+    year_items: List[int] = []
+    year_offsets: List[int] = [0]
+
+    def _year_list_id(key_years: Iterable[int]) -> int:
+        year_list = tuple(sorted(key_years))
+        if year_list not in year_list_ids:
+            year_list_ids[year_list] = len(year_list_ids)
+            year_items.extend(year_list)
+            year_offsets.append(len(year_items))
+        return year_list_ids[year_list]
+
+    def _hashed_keys(
+        cache_entries: Iterable[Tuple[Tuple[str, int], Tuple[List[str], List[str]]]]
+    ) -> Dict[str, bytes]:
+        entries = []
+        years_by_key: Dict[str, List[int]] = {}
+        for (key, year), entry in cache_entries:
+            years.add(year)
+            years_by_key.setdefault(key, []).append(year)
+            entries.append((_encode_key(key, year), _row_id(entry)))
+        hashes, offsets, data, rows = _hash_table(entries)
+        year_hashes, year_key_offsets, year_data, year_rows = _hash_table(
+            (key.encode("utf-8"), _year_list_id(key_years)) for key, key_years in years_by_key.items()
+        )
+        return {
+            "hashes": hashes.tobytes(), "offsets": offsets.tobytes(), "data": data, "rows": rows.tobytes(),
+            "years_hashes": year_hashes.tobytes(), "years_offsets": year_key_offsets.tobytes(),
+            "years_data": year_data, "years_rows": year_rows.tobytes(),
+        }
+
+    key_sections = {
+        f"{prefix}_{name}": data
+        for prefix, prefix_entries in (("sid", sourceid_entries), ("name", name_entries))
+        for name, data in _hashed_keys(prefix_entries).items()
+    }
+
+    encoded_strings = [s.encode("utf-8") for s in string_ids]
+    str_offsets = np.zeros(len(encoded_strings) + 1, dtype="<u8")
+    str_offsets[1:] = np.cumsum([len(s) for s in encoded_strings], dtype="<u8")
+
+    sections = {
+        "str_offsets": str_offsets.tobytes(),
+        "str_data": b"".join(encoded_strings),
+        "row_offsets": np.array(row_offsets, dtype="<u4").tobytes(),
+        "row_items": np.array(row_items, dtype="<u4").tobytes(),
+        "year_offsets": np.array(year_offsets, dtype="<u4").tobytes(),
+        "year_items": np.array(year_items, dtype="<u4").tobytes(),
+        **key_sections,
+        "journals": json.dumps({
+            "journal_titles": journal_titles or {},
+            "sourceid_titles": sourceid_titles or {},
+        }).encode("utf-8"),
+    }
+
+    # La cabecera se serializa dos veces: la primera sólo para conocer su tamaño
+    def _header(table: Dict[str, List[int]]) -> bytes:
+        return json.dumps({
+            "size": fingerprint.size,
+            "mtime_ns": fingerprint.mtime_ns,
+            "sha256": fingerprint.sha256,
+            "max_year": max_year,
+            "years": sorted(years),
+            # JSON sólo admite claves de texto
+            "year_editions": {str(year): edition for year, edition in year_editions.items()},
+            "sections": table,
+        }).encode("utf-8")
+
+    placeholder = {name: [2 ** 62, len(data)] for name, data in sections.items()}
+    position = _align(_PREFIX.size + len(_header(placeholder)))
+    table: Dict[str, List[int]] = {}
+    for name, data in sections.items():
+        table[name] = [position, len(data)]
+        position = _align(position + len(data))
+    header = _header(table).ljust(len(_header(placeholder)))
+
+    def _write(file: BinaryIO) -> None:
+        file.write(_PREFIX.pack(_MAGIC, MMAP_INDEX_VERSION, len(header)))
+        file.write(header)
+        for name, data in sections.items():
+            file.seek(table[name][0])
+            file.write(data)
+
+    if not write_atomically(path, _write):
+        return False
+    logger.info(
+        f"Índice SJR mapeable guardado en {path}: {len(string_ids)} textos, "
+        f"{len(row_ids)} filas únicas"
+    )
+    return True
+
+
+def _align(position: int) -> int:
+    return (position + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class _KeyTable:
+    """Tabla de claves ordenadas por hash: hash -> posición -> (clave, id de fila o de lista de años)."""
+
+    def __init__(
+        self,
+        buffer: mmap.mmap,
+        hashes: np.ndarray,
+        offsets: np.ndarray,
+        data_start: int,
+        rows: np.ndarray
+    ):
+        self._buffer = buffer
+        self._hashes = hashes
+        self._offsets = offsets
+        self._data_start = data_start
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def find(self, encoded_key: bytes) -> Optional[int]:
+        """Id asociado a la clave, o None si no existe."""
+        key_hash = np.uint64(_key_hash(encoded_key))
+        position = int(np.searchsorted(self._hashes, key_hash))
+        # Colisiones de hash: recorrer las posiciones con el mismo hash
+        while position < len(self._hashes) and self._hashes[position] == key_hash:
+            if self._key(position) == encoded_key:
+                return int(self._rows[position])
+            position += 1
+        return None
+
+    def _key(self, position: int) -> bytes:
+        start = self._data_start + int(self._offsets[position])
+        end = self._data_start + int(self._offsets[position + 1])
+        return self._buffer[start:end]
+
+
+class _MappedIndex:
+    """Índice SJR abierto sobre un archivo mapeado en memoria."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_length = _PREFIX.unpack_from(self._buffer, 0)
+        if magic != _MAGIC or version != MMAP_INDEX_VERSION:
+            raise ValueError(f"Índice SJR mapeable con formato no soportado: {path}")
+        self.header = json.loads(self._buffer[_PREFIX.size:_PREFIX.size + header_length])
+        self.max_year: int = self.header["max_year"]
+        self.years: List[int] = self.header["years"]
+        self.year_editions: Dict[int, str] = {
+            int(year): edition for year, edition in self.header["year_editions"].items()
+        }
+
+        sections = self.header["sections"]
+        self._str_offsets = self._array(sections["str_offsets"], "<u8")
+        self._str_start = sections["str_data"][0]
+        self._row_offsets = self._array(sections["row_offsets"], "<u4")
+        self._row_items = self._array(sections["row_items"], "<u4")
+        self._year_offsets = self._array(sections["year_offsets"], "<u4")
+        self._year_items = self._array(sections["year_items"], "<u4")
+        self._sid_keys = self._key_table(sections, "sid")
+        self._name_keys = self._key_table(sections, "name")
+        self._sid_years = self._key_table(sections, "sid_years")
+        self._name_years = self._key_table(sections, "name_years")
+        self._journals_section = sections["journals"]
+        self._journal_directory: Optional[SJRJournalDirectory] = None
+        self._directory_lock = threading.Lock()
+
+    def _key_table(self, sections: Dict[str, List[int]], prefix: str) -> _KeyTable:
+        return _KeyTable(
+            self._buffer,
+            self._array(sections[f"{prefix}_hashes"], "<u8"),
+            self._array(sections[f"{prefix}_offsets"], "<u8"),
+            sections[f"{prefix}_data"][0],
+            self._array(sections[f"{prefix}_rows"], "<u4"),
+        )
+
+    def _array(self, section: List[int], dtype: str) -> np.ndarray:
+        offset, length = section
+        item_size = np.dtype(dtype).itemsize
+        return np.frombuffer(self._buffer, dtype=dtype, count=length // item_size, offset=offset)
+
+    def is_empty(self) -> bool:
+        return len(self._sid_keys) == 0 and len(self._name_keys) == 0
+
+    def find_by_sourceid(self, source_id: str, year: int) -> Optional[Tuple[List[str], List[str]]]:
+        return self._find(self._sid_keys, source_id, year)
+
+    def find_by_name(self, normalized_name: str, year: int) -> Optional[Tuple[List[str], List[str]]]:
+        return self._find(self._name_keys, normalized_name, year)
+
+    def years_by_sourceid(self, source_id: str) -> List[int]:
+        return self._years(self._sid_years, source_id)
+
+    def years_by_name(self, normalized_name: str) -> List[int]:
+        return self._years(self._name_years, normalized_name)
+
+    def _years(self, keys: _KeyTable, key: str) -> List[int]:
+        year_list_id = keys.find(key.encode("utf-8"))
+        if year_list_id is None:
+            return []
+        return self._year_items[self._year_offsets[year_list_id]:self._year_offsets[year_list_id + 1]].tolist()
+
+    def journal_directory(self) -> SJRJournalDirectory:
+        """Directorio de revistas, armado la primera vez que se usa."""
+        with self._directory_lock:
+            if self._journal_directory is None:
+                offset, length = self._journals_section
+                journals = json.loads(self._buffer[offset:offset + length])
+                self._journal_directory = SJRJournalDirectory(
+                    journals["journal_titles"], journals["sourceid_titles"]
+                )
+        return self._journal_directory
+
+    def _find(self, keys: _KeyTable, key: str, year: int) -> Optional[Tuple[List[str], List[str]]]:
+        if not 0 <= year <= 0xFFFFFFFF:
+            return None
+        row_id = keys.find(_encode_key(key, year))
+        return self._row(row_id) if row_id is not None else None
+
+    def _row(self, row_id: int) -> Tuple[List[str], List[str]]:
+        items = self._row_items[self._row_offsets[row_id]:self._row_offsets[row_id + 1]].tolist()
+        n_areas = items[0]
+        texts = [self._string(i) for i in items[1:]]
+        return texts[:n_areas], texts[n_areas:]
+
+    def _string(self, string_id: int) -> str:
+        start = self._str_start + int(self._str_offsets[string_id])
+        end = self._str_start + int(self._str_offsets[string_id + 1])
+        return self._buffer[start:end].decode("utf-8")
+
+
+class SJRMmapRepository(ISJRRepository):
+    """
+    Implementación de ISJRRepository sobre el índice SJR mapeado en memoria.
+
+    Misma estrategia de búsqueda que `SJRFileRepository` (Sourceid y luego
+    nombre normalizado, con el año limitado al último disponible). Si el
+    índice no existe o el CSV cambió, se reconstruye a partir del CSV (o de su
+    snapshot); un lock de archivo evita que varios workers lo construyan a la vez.
+    """
+
+    def __init__(
+        self,
+        csv_path: str,
+        autoload: bool = True,
+        use_snapshot: bool = True,
+        csv_parser: str = CSV_PARSER_PANDAS
+    ):
+        self._csv_path = csv_path
+        self._use_snapshot = use_snapshot
+        # Lector del CSV al reconstruir el índice (ver SJRFileRepository)
+        self._csv_parser = csv_parser
+        self._index: Optional[_MappedIndex] = None
+        self._load_lock = threading.Lock()
+        # Contadores y latencias por ruta de búsqueda (ver sjr_file_repository)
+        self.metrics = MetricsRecorder()
+        if autoload:
+            self.load()
+
+    @property
+    def is_ready(self) -> bool:
+        """Indica si el índice SJR ya está mapeado y disponible para consulta."""
+        return self._index is not None
+
+    def load(self, pause_gc: bool = False) -> bool:
+        """
+        Mapea el índice SJR, construyéndolo antes si no existe o está desactualizado.
+
+        Args:
+            pause_gc: Pausar el GC si hay que construir el índice (ver
+                `SJRFileRepository.load`)
+
+        Returns:
+            True si los datos quedaron disponibles para consulta
+        """
+        with self._load_lock:
+            if self._index is None:
+                self._index = self._try_open_or_build(self._csv_path, pause_gc)
+        return self._index is not None
+
+    def reload(self, csv_path: Optional[str] = None) -> bool:
+        """
+        Vuelve a mapear el índice (reconstruyéndolo si el CSV cambió) y lo
+        reemplaza de forma atómica, sin interrumpir las consultas.
+
+        Las consultas en curso terminan sobre el mapeo anterior, que se libera
+        cuando deja de estar referenciado.
+
+        Args:
+            csv_path: Nuevo CSV de SJR (por defecto, vuelve a leer el actual)
+
+        Returns:
+            True si se publicó un índice nuevo
+        """
+        with self._load_lock:
+            path = csv_path or self._csv_path
+            index = self._try_open_or_build(path)
+            if index is None:
+                return False
+            self._csv_path = path
+            self._index = index
+        return True
+
+    @property
+    def csv_path(self) -> str:
+        """CSV de SJR del que proviene el índice mapeado."""
+        return self._csv_path
+
+    def get_max_available_year(self) -> int:
+        return self._index.max_year if self._index else 0
+
+    def get_edition_for_year(self, publication_year: int) -> Optional[str]:
+        index = self._index
+        if index is None:
+            return None
+        return index.year_editions.get(self._resolve_year(index, publication_year))
+
+    def get_journal_data(
+        self,
+        source_id: Optional[str],
+        publication_year: int,
+        source_title: str = ""
+    ) -> Tuple[List[str], List[str], int]:
+        """
+        Busca datos de la revista usando Sourceid con fallback por nombre.
+        """
+        started = time.perf_counter()
+        index = self._index
+        if index is None or index.is_empty():
+            self.metrics.record(LOOKUP_UNAVAILABLE, time.perf_counter() - started)
+            return [], [], publication_year
+
+        target_year = self._resolve_year(index, publication_year)
+        if target_year != publication_year:
+            self.metrics.increment(YEAR_CLAMPED)
+
+        if source_id:
+            data = index.find_by_sourceid(source_id.strip(), target_year)
+            if data:
+                self.metrics.record(LOOKUP_SOURCEID, time.perf_counter() - started)
+                return data[0], data[1], target_year
+
+        if source_title:
+            data = index.find_by_name(self.normalize_journal_name(source_title), target_year)
+            if data:
+                self.metrics.record(LOOKUP_NAME, time.perf_counter() - started)
+                return data[0], data[1], target_year
+
+        self.metrics.record(LOOKUP_MISS, time.perf_counter() - started)
+        return [], [], target_year
+
+    def search_journals(
+        self,
+        query: str,
+        limit: int = 10,
+        publication_year: Optional[int] = None
+    ) -> List[SJRJournal]:
+        index = self._index
+        if index is None:
+            return []
+        directory = index.journal_directory()
+        titles = directory.search(self.normalize_journal_name(query), limit)
+        return [
+            self._journal(index, index.years_by_name(title), index.find_by_name, title, title, publication_year)
+            for title in titles
+        ]
+
+    def get_journal_by_sourceid(
+        self,
+        source_id: str,
+        publication_year: Optional[int] = None
+    ) -> Optional[SJRJournal]:
+        index = self._index
+        if index is None:
+            return None
+        clean_sid = source_id.strip()
+        years = index.years_by_sourceid(clean_sid)
+        if not years:
+            return None
+        title = index.journal_directory().title_of_sourceid(clean_sid) or ''
+        return self._journal(index, years, index.find_by_sourceid, clean_sid, title, publication_year)
+
+    def _journal(
+        self,
+        index: _MappedIndex,
+        years: List[int],
+        find: Callable[[str, int], Optional[Tuple[List[str], List[str]]]],
+        key: str,
+        normalized_title: str,
+        publication_year: Optional[int]
+    ) -> SJRJournal:
+        """
+        Arma la revista con los datos de `key` para el año pedido (o para el
+        más reciente de la revista si no se indica), como SJRFileRepository.
+        """
+        directory = index.journal_directory()
+        target_year = years[-1] if publication_year is None else self._resolve_year(index, publication_year)
+        areas, categories = find(key, target_year) or ([], [])
+        return SJRJournal(
+            title=directory.display_title(normalized_title) or normalized_title,
+            source_ids=list(directory.sourceids(normalized_title)),
+            years=years,
+            sjr_year=target_year,
+            sjr_edition=index.year_editions.get(target_year),
+            subject_areas=areas,
+            categories_with_quartiles=categories
+        )
+
+    def normalize_journal_name(self, name: str) -> str:
+        if not isinstance(name, str):
+            name = str(name) if name else ""
+        return _normalize_journal_name(name)
+
+    @staticmethod
+    def _resolve_year(index: _MappedIndex, requested_year: int) -> int:
+        if index.max_year > 0 and requested_year > index.max_year:
+            return index.max_year
+        return requested_year
+
+    def _try_open_or_build(self, csv_path: str, pause_gc: bool = False) -> Optional[_MappedIndex]:
+        try:
+            index = self._open_or_build(csv_path, pause_gc)
+            logger.info(f"Índice SJR mapeado desde {mmap_index_path(csv_path)}")
+            return index
+        except FileNotFoundError:
+            logger.error(f"No se encontró el archivo SJR en {csv_path}")
+        except Exception as e:
+            logger.error(f"Error cargando el índice SJR mapeable: {e}", exc_info=True)
+        return None
+
+    def _open_or_build(self, csv_path: str, pause_gc: bool = False) -> _MappedIndex:
+        index_path = mmap_index_path(csv_path)
+        index = self._open_if_current(csv_path, index_path)
+        if index is not None:
+            return index
+
+        with _FileLock(f"{index_path}.lock"):
+            # Otro worker pudo construirlo mientras esperábamos el lock
+            index = self._open_if_current(csv_path, index_path)
+            if index is not None:
+                return index
+
+            fingerprint = CsvFingerprint.from_file(csv_path)
+            source = SJRFileRepository(
+                csv_path, autoload=False, use_snapshot=self._use_snapshot, csv_parser=self._csv_parser
+            )
+            if not source.load(pause_gc=pause_gc):
+                raise RuntimeError("No se pudieron construir los índices SJR desde el CSV")
+            source_indexes = source.export_indexes()
+            built = build_mmap_index(
+                index_path,
+                source.iter_entries('sourceid'),
+                source.iter_entries('name'),
+                source.get_max_available_year(),
+                source_indexes['year_editions'],
+                fingerprint,
+                journal_titles=source_indexes['journal_titles'],
+                sourceid_titles=source_indexes['sourceid_titles']
+            )
+            if not built:
+                raise RuntimeError(f"No se pudo escribir el índice SJR en {index_path}")
+
+        return _MappedIndex(index_path)
+
+    @staticmethod
+    def _open_if_current(csv_path: str, index_path: str) -> Optional[_MappedIndex]:
+        if not os.path.exists(index_path):
+            return None
+        try:
+            index = _MappedIndex(index_path)
+        except Exception as e:
+            logger.warning(f"Índice SJR mapeable ilegible, se reconstruirá: {e}")
+            return None
+        header = index.header
+        if not is_source_unchanged(csv_path, header["size"], header["mtime_ns"], header["sha256"]):
+            logger.info("El CSV de SJR cambió desde que se generó el índice mapeable, se reconstruirá")
+            return None
+        return index
+
+
+class _FileLock:
+    """Lock exclusivo entre procesos basado en `fcntl.flock` (no-op si no está disponible)."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._file = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Toma el lock; con `blocking=False` no espera.
+
+        Returns:
+            True si lo tomó; False si otro proceso lo tiene (sólo sin esperar)
+        """
+        try:
+            import fcntl
+        except ImportError:  # Windows: sin coordinación entre procesos
+            return True
+        self._file = open(self._path, "a+b")
+        try:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._file.close()
+            self._file = None
+            return False
+        return True
+
+    def release(self) -> None:
+        if self._file is not None:
+            import fcntl
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "_FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
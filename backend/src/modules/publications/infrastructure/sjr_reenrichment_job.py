@@ -0,0 +1,171 @@
+"""
+Re-aplicación del SJR a la caché de publicaciones en segundo plano.
+
+Cuando se publica una nueva edición SJR (ver sjr_reloader), las publicaciones
+cacheadas se vuelven a enriquecer localmente, sin volver a consultar Scopus.
+Se ejecuta una sola re-aplicación a la vez; si el SJR cambia mientras corre,
+se repite al terminar para que toda la caché quede con la misma edición.
+
+Los lotes (lectura, enriquecimiento y escritura, todos síncronos) se procesan
+en un hilo aparte para no detener el event loop de la API. Con varios workers,
+un advisory lock de PostgreSQL garantiza que sólo uno la ejecute a la vez; los
+demás la omiten.
+"""
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .db_publication_cache_repository import DBPublicationCacheRepository
+from ..application.sjr_reenrichment_service import SJRReenrichmentProgress, SJRReenrichmentService
+from ..domain.sjr_repository import ISJRRepository
+
+logger = logging.getLogger(__name__)
+
+# Frecuencia (en lotes) de los mensajes de avance en el log
+_LOG_EVERY_BATCHES = 10
+
+# Clave del advisory lock de PostgreSQL compartido por todos los workers
+REENRICHMENT_LOCK_KEY = 5_394_002
+
+
+class SJRReenrichmentJob:
+    """Coordina las re-aplicaciones del SJR sobre la caché del proceso."""
+
+    def __init__(
+        self,
+        sjr_repository: ISJRRepository,
+        session_factory: Callable[[], Session],
+        batch_size: int = 1000
+    ):
+        """
+        Args:
+            sjr_repository: Repositorio SJR compartido del proceso
+            session_factory: Crea una sesión de BD propia para cada ejecución
+            batch_size: Publicaciones por lote
+        """
+        self._sjr_repository = sjr_repository
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self._rerun = False
+        self._progress = SJRReenrichmentProgress()
+        self._batches = 0
+        self._started_at: Optional[datetime] = None
+        self._finished_at: Optional[datetime] = None
+        self._skipped = False
+        self._error: Optional[str] = None
+        self._stop_requested = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> bool:
+        """
+        Programa una re-aplicación en el event loop actual.
+
+        Returns:
+            True si empezó una ejecución nueva; False si ya había una en curso
+            (en ese caso se repetirá al terminar)
+        """
+        if self.is_running:
+            self._rerun = True
+            return False
+        self._task = asyncio.create_task(self._run())
+        return True
+
+    async def stop(self) -> None:
+        """Cancela la ejecución en curso (al apagar la API)."""
+        if self.is_running:
+            # El hilo termina al acabar el lote en curso
+            self._stop_requested.set()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            self._rerun = False
+            await self._run_once()
+            if not self._rerun:
+                break
+            logger.info("El SJR cambió durante la re-aplicación, repitiendo")
+
+    async def _run_once(self) -> None:
+        self._progress = SJRReenrichmentProgress()
+        self._batches = 0
+        self._started_at = datetime.now(timezone.utc)
+        self._finished_at = None
+        self._skipped = False
+        self._error = None
+        self._stop_requested.clear()
+        try:
+            await asyncio.to_thread(self._run_in_thread)
+        except asyncio.CancelledError:
+            self._error = "Cancelada"
+            raise
+        except Exception as e:
+            logger.error(f"Error re-aplicando el SJR a la caché: {e}", exc_info=True)
+            self._error = str(e)
+        finally:
+            self._finished_at = datetime.now(timezone.utc)
+
+    def _run_in_thread(self) -> None:
+        session = self._session_factory()
+        # Conexión propia para el advisory lock: la sesión cambia de conexión en cada commit
+        lock_connection = session.get_bind().connect()
+        try:
+            acquired = lock_connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": REENRICHMENT_LOCK_KEY}
+            ).scalar()
+            if not acquired:
+                logger.info("Otro worker está re-aplicando el SJR a la caché, se omite")
+                self._skipped = True
+                return
+            try:
+                service = SJRReenrichmentService(DBPublicationCacheRepository(session), self._sjr_repository)
+                # Los métodos del repositorio son síncronos: un event loop propio del hilo
+                self._progress = asyncio.run(service.reenrich(
+                    self._batch_size,
+                    on_progress=self._on_progress,
+                    should_stop=self._stop_requested.is_set
+                ))
+            finally:
+                lock_connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": REENRICHMENT_LOCK_KEY}
+                )
+        finally:
+            lock_connection.close()
+            session.close()
+
+    def _on_progress(self, progress: SJRReenrichmentProgress) -> None:
+        self._progress = progress
+        self._batches += 1
+        if self._batches % _LOG_EVERY_BATCHES == 0:
+            logger.info(
+                f"Re-aplicación SJR: {progress.processed}/{progress.total} revisadas, "
+                f"{progress.updated} actualizadas ({progress.rows_per_second:.0f} pub/s)"
+            )
+
+    def status(self) -> Dict:
+        progress = self._progress
+        return {
+            "running": self.is_running,
+            "rerun_pending": self._rerun,
+            "started_at": self._started_at,
+            "finished_at": self._finished_at,
+            "total": progress.total,
+            "processed": progress.processed,
+            "updated": progress.updated,
+            "elapsed_seconds": progress.elapsed_seconds,
+            "rows_per_second": progress.rows_per_second,
+            "skipped": self._skipped,
+            "error": self._error,
+        }
@@ -0,0 +1,287 @@
+"""
+Recarga en caliente del dataset SJR.
+
+Permite publicar una nueva edición SJR sin reiniciar la API, ya sea a pedido
+(endpoint administrativo) o vigilando el CSV configurado. El repositorio
+reemplaza el índice de forma atómica: las consultas nunca esperan a la
+reconstrucción.
+
+Procesar el CSV con pandas retiene el GIL durante decenas o cientos de
+milisegundos seguidos, lo que se notaría como latencia en las peticiones
+concurrentes. Por eso, cuando el repositorio usa archivos derivados (snapshot
+o índice mapeable), éstos se construyen en un proceso aparte y el proceso de
+la API sólo los lee al publicar el índice nuevo.
+
+Con varios workers, cada proceso tiene su propio índice. Por eso cada recarga
+publicada deja una marca en el directorio de datos (`PUBLISHED_MARKER`) y la
+vigilancia (`watch`) de los demás workers la sigue: recargan el mismo CSV en
+la siguiente revisión (sin repetir las acciones posteriores a la recarga,
+como la re-aplicación del SJR a la caché). Un worker que se reinicia carga el CSV configurado
+(`SJR_CSV_PATH`), así que un cambio de CSV permanente debe reflejarse ahí.
+
+Los archivos derivados se construyen una sola vez para todos los workers: el
+que publica una recarga toma un lock de archivo (`BUILD_LOCK`) mientras los
+construye. Si varios detectan el mismo cambio del CSV, sólo el que obtiene el
+lock lo construye; los demás siguen su marca y leen los archivos ya escritos.
+"""
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from .sjr_file_repository import SJRFileRepository
+from .sjr_mmap_repository import SJRMmapRepository, _FileLock
+
+logger = logging.getLogger(__name__)
+
+SJRRepository = Union[SJRFileRepository, SJRMmapRepository]
+
+# Marca, dentro del directorio de datos, de la última recarga publicada por cualquier worker
+PUBLISHED_MARKER = ".sjr_published.json"
+# Lock de archivo, en el mismo directorio, del worker que construye y publica una recarga
+BUILD_LOCK = ".sjr_build.lock"
+# Espera (segundos) entre intentos de tomar el lock de construcción
+_BUILD_LOCK_POLL_SECONDS = 0.5
+
+
+def _prebuild(repository_factory: Callable[[str], SJRRepository], csv_path: str) -> bool:
+    """Construye los archivos derivados de un CSV (se ejecuta en un proceso aparte)."""
+    # Proceso propio: pausar el GC no afecta a la API
+    return repository_factory(csv_path).load(pause_gc=True)
+
+
+class SJRReloader:
+    """
+    Coordina las recargas del repositorio SJR compartido del proceso.
+
+    Las recargas se serializan (una a la vez) y se ejecutan fuera del event loop.
+    """
+
+    def __init__(
+        self,
+        repository: SJRRepository,
+        data_dir: Path,
+        prebuild_factory: Optional[Callable[[str], SJRRepository]] = None,
+        on_reloaded: Optional[Callable[[], object]] = None
+    ):
+        """
+        Args:
+            repository: Repositorio SJR compartido del proceso
+            data_dir: Directorio de datos; los CSV a recargar deben estar dentro
+            prebuild_factory: Fábrica serializable (pickle) de un repositorio sin
+                carga automática que, al cargarse, deja escritos los archivos
+                derivados del CSV. Si se indica, la construcción se hace en un
+                proceso aparte; si no, en un hilo del proceso de la API.
+            on_reloaded: Se invoca (en el event loop) tras publicar un índice
+                nuevo, p. ej. para re-aplicar el SJR a la caché de publicaciones.
+                No se invoca cuando la recarga sigue la marca de otro worker,
+                que ya lo hizo.
+        """
+        self._repository = repository
+        self._prebuild_factory = prebuild_factory
+        self._on_reloaded = on_reloaded
+        # Sólo se aceptan CSV dentro del directorio de datos de la aplicación
+        self._data_dir = Path(data_dir).resolve()
+        self._marker_path = self._data_dir / PUBLISHED_MARKER
+        self._build_lock_path = self._data_dir / BUILD_LOCK
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._marker_signature: Optional[Tuple[int, int]] = None
+        self._last_reload_at: Optional[datetime] = None
+
+    @property
+    def is_reloading(self) -> bool:
+        # La tarea programada cuenta desde antes de tomar el lock
+        return self._lock.locked() or (self._task is not None and not self._task.done())
+
+    def start(self, csv_path: Optional[str] = None) -> bool:
+        """
+        Programa una recarga en el event loop actual.
+
+        La recarga queda reservada al volver, así que dos solicitudes
+        seguidas no pueden programar dos recargas.
+
+        Returns:
+            True si se programó; False si ya había una recarga en curso
+        """
+        if self.is_reloading:
+            return False
+        self._task = asyncio.create_task(self.reload(csv_path))
+        return True
+
+    def resolve_csv_path(self, csv_path: str) -> str:
+        """
+        Valida la ruta de un CSV de SJR para recarga.
+
+        Las rutas relativas se interpretan dentro del directorio de datos.
+
+        Raises:
+            ValueError: Si la ruta está fuera del directorio de datos o no existe
+        """
+        path = (self._data_dir / csv_path).resolve()
+        if not path.is_relative_to(self._data_dir):
+            raise ValueError(f"El CSV de SJR debe estar dentro de {self._data_dir}")
+        if not path.is_file():
+            raise ValueError(f"No existe el CSV de SJR {path}")
+        return str(path)
+
+    async def reload(self, csv_path: Optional[str] = None, announce: bool = True) -> bool:
+        """
+        Reconstruye el índice SJR en segundo plano y lo publica.
+
+        Args:
+            csv_path: Nuevo CSV de SJR (por defecto, vuelve a leer el actual)
+            announce: Dejar la marca para que los demás workers recarguen
+                (False cuando la recarga viene de la marca de otro worker)
+
+        Returns:
+            True si se publicó un índice nuevo
+        """
+        return bool(await self._reload(csv_path, announce, wait_for_build=True))
+
+    async def _reload(self, csv_path: Optional[str], announce: bool, wait_for_build: bool) -> Optional[bool]:
+        """
+        Returns:
+            Como `reload`; None si otro worker está construyendo y `wait_for_build` es False
+        """
+        async with self._lock:
+            if not announce:
+                # El worker que dejó la marca ya construyó los archivos derivados
+                return await self._publish(csv_path, announce=False)
+
+            build_lock = _FileLock(str(self._build_lock_path))
+            while not build_lock.acquire(blocking=False):
+                if not wait_for_build:
+                    return None
+                await asyncio.sleep(_BUILD_LOCK_POLL_SECONDS)
+            try:
+                if self._prebuild_factory is not None:
+                    path = csv_path or self._repository.csv_path
+                    if not await self._prebuild_in_subprocess(path):
+                        logger.error(f"No se pudo construir el índice SJR de {path}, se conserva el actual")
+                        return False
+                return await self._publish(csv_path, announce=True)
+            finally:
+                build_lock.release()
+
+    async def _publish(self, csv_path: Optional[str], announce: bool) -> bool:
+        reloaded = await asyncio.to_thread(self._repository.reload, csv_path)
+        if reloaded:
+            self._signature = self._file_signature(self._repository.csv_path)
+            self._last_reload_at = datetime.now(timezone.utc)
+            if announce:
+                await asyncio.to_thread(self._write_marker)
+                if self._on_reloaded is not None:
+                    self._on_reloaded()
+        return reloaded
+
+    async def watch(self, interval_seconds: float) -> None:
+        """
+        Vigila el CSV de SJR y lo recarga cuando cambia.
+
+        Un cambio se aplica cuando la huella (tamaño y fecha) se mantiene
+        estable entre dos revisiones, para no leer un archivo a medio copiar.
+        También sigue la marca de recarga de los demás workers. Si otro worker
+        ya está reconstruyendo (tiene el lock de construcción), éste no
+        repite la construcción: espera su marca.
+        """
+        self._signature = self._file_signature(self._repository.csv_path)
+        self._marker_signature = self._file_signature(str(self._marker_path))
+        pending: Optional[Tuple[int, int]] = None
+        while True:
+            await asyncio.sleep(interval_seconds)
+            if not self.is_reloading and await self._follow_marker():
+                pending = None
+                continue
+            signature = self._file_signature(self._repository.csv_path)
+            if signature is None or signature == self._signature or self.is_reloading:
+                pending = None
+                continue
+            if signature != pending:
+                pending = signature
+                continue
+
+            reloaded = await self._reload(None, announce=True, wait_for_build=False)
+            if reloaded is None:
+                logger.info("Otro worker está reconstruyendo el índice SJR, se seguirá su recarga")
+            elif reloaded:
+                logger.info(f"Cambió el CSV de SJR {self._repository.csv_path}, recargado")
+            else:
+                # Evita reintentar en cada revisión hasta que el archivo vuelva a cambiar
+                self._signature = signature
+            pending = None
+
+    async def _follow_marker(self) -> bool:
+        """Recarga el CSV publicado por otro worker si la marca cambió."""
+        marker_signature = self._file_signature(str(self._marker_path))
+        if marker_signature is None or marker_signature == self._marker_signature:
+            return False
+        self._marker_signature = marker_signature
+        try:
+            marker = json.loads(self._marker_path.read_text(encoding="utf-8"))
+            csv_path = self.resolve_csv_path(marker["csv_path"])
+            signature = tuple(marker["signature"]) if marker.get("signature") else None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Marca de recarga SJR inválida en {self._marker_path}: {e}")
+            return False
+        if csv_path == str(Path(self._repository.csv_path).resolve()) and signature == self._signature:
+            # Este worker ya tiene ese CSV (p. ej. también detectó el cambio)
+            return False
+        logger.info(f"Otro worker publicó el SJR {csv_path}, recargando")
+        await self.reload(csv_path, announce=False)
+        return True
+
+    def _write_marker(self) -> None:
+        marker = {
+            "csv_path": self._repository.csv_path,
+            "signature": self._signature,
+            "published_at": self._last_reload_at.isoformat(),
+            "pid": os.getpid(),
+        }
+        tmp_path = self._marker_path.with_name(f"{PUBLISHED_MARKER}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(marker), encoding="utf-8")
+            os.replace(tmp_path, self._marker_path)
+        except OSError as e:
+            logger.warning(f"No se pudo escribir la marca de recarga SJR {self._marker_path}: {e}")
+            return
+        # La marca propia no provoca otra recarga en este worker
+        self._marker_signature = self._file_signature(str(self._marker_path))
+
+    async def _prebuild_in_subprocess(self, csv_path: str) -> bool:
+        # 'spawn': el proceso hijo no hereda los hilos ni el estado del servidor
+        context = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(max_workers=1, mp_context=context)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, _prebuild, self._prebuild_factory, csv_path
+            )
+        except Exception as e:
+            logger.error(f"Error construyendo el índice SJR en segundo plano: {e}", exc_info=True)
+            return False
+        finally:
+            # Esperar al proceso hijo también bloquea: fuera del event loop
+            await asyncio.to_thread(executor.shutdown)
+
+    def status(self) -> Dict:
+        return {
+            "csv_path": self._repository.csv_path,
+            "ready": self._repository.is_ready,
+            "reloading": self.is_reloading,
+            "max_year": self._repository.get_max_available_year(),
+            "last_reload_at": self._last_reload_at,
+        }
+
+    @staticmethod
+    def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
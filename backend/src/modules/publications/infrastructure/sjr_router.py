@@ -0,0 +1,139 @@
+from fastapi import APIRouter, HTTPException
+
+from .sjr_file_repository import LOOKUP_FUZZY, LOOKUP_MISS, LOOKUP_NAME, LOOKUP_SOURCEID, LOOKUP_UNAVAILABLE
+from .sjr_reenrichment_job import SJRReenrichmentJob
+from .sjr_reloader import SJRReloader
+from ..application.sjr_dto import (
+    SJRMetricsResponseDTO, SJRReenrichmentStatusDTO, SJRReloadRequestDTO, SJRStatusResponseDTO
+)
+from ....shared.metrics import MetricsRecorder
+from ....container import get_container
+
+router = APIRouter(prefix="/sjr", tags=["SJR"])
+
+
+def get_reloader() -> SJRReloader:
+    return get_container().sjr_reloader
+
+
+def get_reenrichment_job() -> SJRReenrichmentJob:
+    return get_container().sjr_reenrichment_job
+
+
+def get_lookup_metrics() -> MetricsRecorder:
+    return get_container().sjr_repository.metrics
+
+
+@router.get(
+    "/status",
+    response_model=SJRStatusResponseDTO,
+    summary="Estado del dataset SJR",
+    description="Muestra el CSV de SJR publicado, el año máximo disponible y si hay una recarga en curso."
+)
+async def get_sjr_status():
+    return get_reloader().status()
+
+
+@router.post(
+    "/reload",
+    response_model=SJRStatusResponseDTO,
+    status_code=202,
+    summary="Recargar el dataset SJR",
+    description="""
+    Reconstruye el índice SJR en segundo plano (por ejemplo, al llegar una nueva
+    edición) y lo publica sin reiniciar la API.
+
+    Mientras se construye, las consultas siguen usando el índice anterior.
+    Si la construcción falla, el índice anterior se conserva.
+    Si ya hay una recarga en curso, responde 409.
+
+    Con varios workers, recarga el worker que recibe la solicitud; los demás
+    lo siguen en la siguiente revisión de `SJR_WATCH_INTERVAL_SECONDS` (si está
+    activada) sin volver a construir el índice.
+
+    `csv_path` permite cambiar de CSV; debe estar dentro del directorio de datos.
+    """
+)
+async def reload_sjr(request: SJRReloadRequestDTO):
+    reloader = get_reloader()
+    csv_path = None
+    if request.csv_path:
+        try:
+            csv_path = reloader.resolve_csv_path(request.csv_path)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    if not reloader.start(csv_path):
+        raise HTTPException(status_code=409, detail="Ya hay una recarga SJR en curso")
+    return reloader.status()
+
+
+@router.get(
+    "/reenrich",
+    response_model=SJRReenrichmentStatusDTO,
+    summary="Estado de la re-aplicación del SJR a la caché",
+    description="Avance (revisadas, actualizadas, publicaciones por segundo) de la última re-aplicación."
+)
+async def get_sjr_reenrichment_status():
+    return get_reenrichment_job().status()
+
+
+@router.post(
+    "/reenrich",
+    response_model=SJRReenrichmentStatusDTO,
+    status_code=202,
+    summary="Re-aplicar el SJR a la caché de publicaciones",
+    description="""
+    Vuelve a calcular áreas, categorías con cuartiles, año y edición SJR de todas
+    las publicaciones cacheadas con el SJR publicado, sin consultar Scopus.
+    Sólo se escriben las publicaciones cuyos datos cambiaron.
+
+    Se ejecuta automáticamente tras cada recarga del SJR (`SJR_REENRICH_ON_RELOAD`),
+    sólo en el worker que publicó la recarga. Si ya hay una en curso en este
+    worker, se repite al terminar; si la está ejecutando otro worker, se omite
+    (`skipped`).
+    """
+)
+async def reenrich_sjr():
+    job = get_reenrichment_job()
+    job.start()
+    return job.status()
+
+
+@router.get(
+    "/metrics",
+    response_model=SJRMetricsResponseDTO,
+    summary="Métricas de búsqueda SJR",
+    description="""
+    Contadores y latencias de las búsquedas SJR de este proceso, por ruta:
+    `sourceid`, `name` (nombre exacto), `fuzzy` (título aproximado), `miss`
+    y `unavailable` (índice sin cargar). `year_clamped` cuenta los años
+    posteriores al último disponible que se mapearon a éste.
+
+    Los valores se acumulan desde el arranque o desde el último reinicio
+    (`POST /sjr/metrics/reset`) y son propios de cada worker.
+    """
+)
+async def get_sjr_metrics():
+    snapshot = get_lookup_metrics().snapshot()
+    counters = snapshot["counters"]
+    lookups = sum(
+        counters.get(path, 0)
+        for path in (LOOKUP_SOURCEID, LOOKUP_NAME, LOOKUP_FUZZY, LOOKUP_MISS, LOOKUP_UNAVAILABLE)
+    )
+    hits = sum(counters.get(path, 0) for path in (LOOKUP_SOURCEID, LOOKUP_NAME, LOOKUP_FUZZY))
+    return SJRMetricsResponseDTO(
+        **snapshot,
+        lookups=lookups,
+        hit_rate=hits / lookups if lookups else 0.0
+    )
+
+
+@router.post(
+    "/metrics/reset",
+    status_code=204,
+    summary="Reiniciar métricas de búsqueda SJR",
+    description="Pone en cero los contadores y latencias SJR de este proceso (p. ej. antes de una actualización masiva)."
+)
+async def reset_sjr_metrics():
+    get_lookup_metrics().reset()
@@ -0,0 +1,173 @@
+"""
+Snapshot binario de los índices SJR.
+
+Guarda junto al CSV de SJR los índices ya construidos (Sourceid, nombre,
+percentiles incluidos en las categorías y año máximo) para que los
+siguientes arranques no tengan que volver a procesar el CSV.
+
+El snapshot está versionado y se asocia al CSV de origen mediante su tamaño,
+fecha de modificación y hash de contenido: si el CSV cambia, se reconstruye.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Incrementar cuando cambie la estructura de los índices serializados
+SNAPSHOT_VERSION = 4
+SNAPSHOT_SUFFIX = ".snapshot"
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CsvFingerprint:
+    """Identidad de un CSV de origen: tamaño, fecha de modificación y hash SHA-256."""
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    @classmethod
+    def from_file(cls, path: str) -> "CsvFingerprint":
+        stat = os.stat(path)
+        return cls(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=compute_sha256(path))
+
+
+def compute_sha256(path: str) -> str:
+    """Calcula el hash SHA-256 del contenido de un archivo."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_path(csv_path: str) -> str:
+    """Ruta del snapshot asociado a un CSV (mismo directorio)."""
+    return f"{csv_path}{SNAPSHOT_SUFFIX}"
+
+
+def is_source_unchanged(csv_path: str, size: int, mtime_ns: int, sha256: str) -> bool:
+    """
+    Indica si el CSV coincide con la huella guardada en un archivo derivado.
+
+    El tamaño y la fecha de modificación permiten validar sin leer el CSV;
+    si sólo cambió la fecha, decide el hash de contenido.
+    """
+    stat = os.stat(csv_path)
+    if stat.st_size != size:
+        return False
+    if stat.st_mtime_ns == mtime_ns:
+        return True
+    return compute_sha256(csv_path) == sha256
+
+
+def write_atomically(path: str, write: Callable[[BinaryIO], None]) -> bool:
+    """
+    Escribe un archivo derivado de forma atómica (archivo temporal + rename),
+    de modo que otros procesos nunca lean un archivo a medio escribir.
+
+    Args:
+        path: Ruta final del archivo
+        write: Función que escribe el contenido en el archivo temporal
+
+    Returns:
+        True si el archivo se escribió correctamente
+    """
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp", delete=False
+        ) as file:
+            tmp_path = file.name
+            write(file)
+        # NamedTemporaryFile crea el archivo con permisos 0600
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        logger.warning(f"No se pudo escribir {path}: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+
+def read_snapshot(csv_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Lee el snapshot de un CSV si existe y sigue vigente.
+
+    Si el CSV sólo cambió de fecha (mismo contenido), se reescribe el
+    snapshot con la nueva fecha para no recalcular el hash en cada arranque.
+
+    Args:
+        csv_path: Ruta del CSV de SJR
+
+    Returns:
+        Diccionario con los índices guardados, o None si hay que reconstruir
+    """
+    path = snapshot_path(csv_path)
+    if not os.path.exists(path):
+        return None
+
+    stat = os.stat(csv_path)
+    try:
+        with open(path, "rb") as file:
+            # Cabecera y contenido son dos pickles independientes: la cabecera
+            # se valida sin deserializar los índices
+            header = pickle.load(file)
+
+            if header.get("version") != SNAPSHOT_VERSION:
+                logger.info("Snapshot SJR de otra versión, se reconstruirá")
+                return None
+            if not is_source_unchanged(csv_path, header["size"], header["mtime_ns"], header["sha256"]):
+                logger.info("El CSV de SJR cambió desde el último snapshot, se reconstruirá")
+                return None
+
+            indexes = pickle.load(file)
+    except Exception as e:
+        logger.warning(f"No se pudo leer el snapshot SJR {path}: {e}")
+        return None
+
+    if header["mtime_ns"] != stat.st_mtime_ns:
+        # Mismo contenido con otra fecha: refrescar la huella para el próximo arranque
+        write_snapshot(
+            csv_path,
+            indexes,
+            CsvFingerprint(stat.st_size, stat.st_mtime_ns, header["sha256"])
+        )
+    return indexes
+
+
+def write_snapshot(csv_path: str, indexes: Dict[str, Any], fingerprint: CsvFingerprint) -> bool:
+    """
+    Escribe el snapshot de los índices SJR.
+
+    Args:
+        csv_path: Ruta del CSV de SJR del que provienen los índices
+        indexes: Índices a serializar
+        fingerprint: Huella del CSV tomada ANTES de procesarlo
+
+    Returns:
+        True si el snapshot se escribió correctamente
+    """
+    path = snapshot_path(csv_path)
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "size": fingerprint.size,
+        "mtime_ns": fingerprint.mtime_ns,
+        "sha256": fingerprint.sha256,
+    }
+
+    def _write(file: BinaryIO) -> None:
+        pickle.dump(header, file, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(indexes, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    if not write_atomically(path, _write):
+        return False
+    logger.info(f"Snapshot SJR guardado en {path}")
+    return True
@@ -11,6 +11,11 @@ class IScopusAccountRepository(ABC):
         """Obtiene las cuentas de Scopus asociadas a un autor."""
         pass
 
+    @abstractmethod
+    async def get_all(self) -> List[ScopusAccount]:
+        """Obtiene todas las cuentas de Scopus registradas."""
+        pass
+
     @abstractmethod
     async def get_by_id(self, account_id: UUID) -> Optional[ScopusAccount]:
         """Obtiene una cuenta de Scopus por su ID."""
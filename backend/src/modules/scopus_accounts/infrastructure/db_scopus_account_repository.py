@@ -16,6 +16,10 @@ class DBScopusAccountRepository(IScopusAccountRepository):
         models = self.db.query(ScopusAccountModel).filter(ScopusAccountModel.author_id == author_id).all()
         return [model.to_entity() for model in models]
 
+    async def get_all(self) -> List[ScopusAccount]:
+        models = self.db.query(ScopusAccountModel).all()
+        return [model.to_entity() for model in models]
+
     async def get_by_id(self, account_id: UUID) -> Optional[ScopusAccount]:
         model = self.db.query(ScopusAccountModel).filter(ScopusAccountModel.account_id == account_id).first()
         return model.to_entity() if model else None
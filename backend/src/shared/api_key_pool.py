@@ -0,0 +1,239 @@
+"""
+Pool de API keys con cuota por key (Scopus).
+
+Cada key tiene su propia cuota semanal y su propio límite de peticiones por
+segundo, así que el pool reparte las peticiones entre todas en paralelo:
+
+- Cada petición usa la key con más cuota restante por petición en curso, de
+  modo que las keys se consumen en proporción a su presupuesto.
+- La cuota restante y su reinicio se leen de `X-RateLimit-Remaining` /
+  `X-RateLimit-Reset`; una key agotada (cuota 0 o 429 `QUOTA_EXCEEDED`) se
+  pausa hasta su reinicio y las peticiones pasan a las demás.
+- Cada key tiene un limitador de tasa adaptativo propio.
+- El estado se guarda periódicamente (ver IApiKeyQuotaStore) para que una key
+  agotada siga en pausa tras reiniciar la API. Las keys se identifican por
+  una huella (hash), nunca se guardan en claro.
+"""
+import asyncio
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
+
+from .rate_limiter import AdaptiveRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+def api_key_fingerprint(api_key: str) -> str:
+    """Identificador estable de una key que no permite recuperarla."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class ApiKeyQuota:
+    """Estado de la cuota de una API key (fechas en UTC)."""
+    key_id: str
+    limit: Optional[int] = None            # Cuota total del periodo (X-RateLimit-Limit)
+    remaining: Optional[int] = None        # Cuota restante (None = aún sin información)
+    reset_at: Optional[datetime] = None    # Reinicio de la cuota
+    paused_until: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class IApiKeyQuotaStore(ABC):
+    """Persistencia del estado de cuota de las API keys."""
+
+    @abstractmethod
+    def load(self, key_ids: List[str]) -> Dict[str, ApiKeyQuota]:
+        """Estado guardado de las keys indicadas (las que no tienen estado se omiten)."""
+        pass
+
+    @abstractmethod
+    def save(self, quotas: List[ApiKeyQuota]) -> None:
+        """Guarda (inserta o actualiza) el estado de las keys."""
+        pass
+
+
+class ApiKeysExhaustedError(Exception):
+    """Todas las API keys del pool están en pausa (o no hay ninguna configurada)."""
+
+    def __init__(self, message: str, resume_at: Optional[datetime] = None):
+        super().__init__(message)
+        self.resume_at = resume_at
+
+
+class PooledApiKey:
+    """Una key del pool con su cuota y su limitador de tasa."""
+
+    # Cuota supuesta de una key hasta recibir sus cabeceras X-RateLimit-*
+    UNKNOWN_BUDGET = 1_000_000
+
+    def __init__(self, api_key: str, rate_limiter: AdaptiveRateLimiter):
+        self.api_key = api_key
+        self.rate_limiter = rate_limiter
+        self.quota = ApiKeyQuota(key_id=api_key_fingerprint(api_key))
+        self.in_flight = 0
+        # Peticiones en curso descontadas por adelantado de `quota.remaining`
+        self.reserved = 0
+
+    def is_paused(self, now: Optional[datetime] = None) -> bool:
+        paused_until = self.quota.paused_until
+        return paused_until is not None and paused_until > (now or datetime.now(timezone.utc))
+
+    def budget(self) -> float:
+        """Cuota restante por petición en curso (mayor = preferible)."""
+        remaining = self.quota.remaining
+        if remaining is None:
+            # Sin información todavía: todas las keys desconocidas valen lo mismo
+            remaining = self.quota.limit if self.quota.limit is not None else self.UNKNOWN_BUDGET
+        return remaining / (self.in_flight + 1)
+
+
+class ApiKeyPool:
+    """Reparte las peticiones a una API entre varias keys según su cuota."""
+
+    # Pausa de una key agotada cuando la API no indica el reinicio de la cuota
+    DEFAULT_EXHAUSTED_PAUSE = timedelta(hours=1)
+
+    def __init__(
+        self,
+        api_keys: Sequence[str],
+        rate_limiter_factory: Callable[[], AdaptiveRateLimiter],
+        store: Optional[IApiKeyQuotaStore] = None,
+        header_name: str = "X-ELS-APIKey"
+    ):
+        """
+        Args:
+            api_keys: Keys del pool (las repetidas o vacías se ignoran)
+            rate_limiter_factory: Crea el limitador de tasa de cada key
+            store: Persistencia del estado de cuota; None = sólo en memoria
+            header_name: Cabecera en la que se envía la key
+        """
+        self._keys = [
+            PooledApiKey(api_key, rate_limiter_factory())
+            for api_key in dict.fromkeys(key.strip() for key in api_keys)
+            if api_key
+        ]
+        self._store = store
+        self.header_name = header_name
+        self._dirty = False
+
+    @property
+    def size(self) -> int:
+        return len(self._keys)
+
+    def select(self) -> PooledApiKey:
+        """
+        Elige la key para una petición y la cuenta como en curso (liberarla
+        con `observe` o `release`).
+
+        Raises:
+            ApiKeysExhaustedError: Si no hay keys o todas están en pausa
+        """
+        if not self._keys:
+            raise ApiKeysExhaustedError("No hay API keys de Scopus configuradas")
+        now = datetime.now(timezone.utc)
+        available = [key for key in self._keys if not key.is_paused(now)]
+        if not available:
+            resume_at = min(key.quota.paused_until for key in self._keys)
+            raise ApiKeysExhaustedError(
+                f"Cuota agotada en las {len(self._keys)} API keys de Scopus hasta {resume_at.isoformat()}",
+                resume_at=resume_at
+            )
+        key = max(available, key=PooledApiKey.budget)
+        key.in_flight += 1
+        if key.quota.remaining is not None:
+            # Reserva optimista: las selecciones simultáneas se reparten entre las keys
+            key.quota.remaining -= 1
+            key.reserved += 1
+        return key
+
+    def release(self, key: PooledApiKey) -> None:
+        """
+        Libera una key cuya petición no llegó a enviarse o terminó sin
+        respuesta (error de red, cancelación): devuelve la cuota reservada.
+        """
+        key.in_flight = max(0, key.in_flight - 1)
+        if key.reserved > 0:
+            key.reserved -= 1
+            if key.quota.remaining is not None:
+                key.quota.remaining += 1
+
+    def observe(self, key: PooledApiKey, status_code: int, headers: Mapping[str, str]) -> None:
+        """Libera la key y actualiza su cuota y su tasa con la respuesta."""
+        self.release(key)
+        key.rate_limiter.observe(status_code, headers)
+
+        now = datetime.now(timezone.utc)
+        quota = key.quota
+        limit = _parse_int(headers.get("X-RateLimit-Limit"))
+        remaining = _parse_int(headers.get("X-RateLimit-Remaining"))
+        reset = _parse_int(headers.get("X-RateLimit-Reset"))
+        if limit is not None:
+            quota.limit = limit
+        if remaining is not None:
+            # Lo informado por la API, menos lo reservado por las demás peticiones en curso
+            quota.remaining = max(0, remaining - key.reserved)
+        if reset is not None:
+            quota.reset_at = datetime.fromtimestamp(reset, tz=timezone.utc)
+        quota.updated_at = now
+        self._dirty = True
+
+        quota_exceeded = status_code == 429 and "QUOTA_EXCEEDED" in headers.get("X-ELS-Status", "").upper()
+        if quota_exceeded or (remaining is not None and remaining <= 0):
+            resume_at = quota.reset_at if quota.reset_at is not None and quota.reset_at > now else None
+            quota.paused_until = resume_at or now + self.DEFAULT_EXHAUSTED_PAUSE
+            quota.remaining = 0
+            logger.warning(
+                f"API key {quota.key_id} sin cuota: en pausa hasta {quota.paused_until.isoformat()} "
+                f"({len([k for k in self._keys if not k.is_paused(now)])} keys disponibles)"
+            )
+        elif quota.paused_until is not None and not key.is_paused(now):
+            quota.paused_until = None
+
+    async def load(self) -> None:
+        """Recupera el estado guardado de las keys (al arrancar)."""
+        if self._store is None or not self._keys:
+            return
+        saved = await asyncio.to_thread(self._store.load, [key.quota.key_id for key in self._keys])
+        now = datetime.now(timezone.utc)
+        for key in self._keys:
+            quota = saved.get(key.quota.key_id)
+            if quota is None:
+                continue
+            if quota.reset_at is not None and quota.reset_at <= now:
+                # La cuota ya se reinició: se conoce el total, no lo restante
+                quota.remaining = None
+                quota.paused_until = None
+            key.quota = quota
+        paused = [key.quota.key_id for key in self._keys if key.is_paused(now)]
+        logger.info(f"Pool de {len(self._keys)} API keys cargado ({len(paused)} en pausa)")
+
+    async def flush(self) -> None:
+        """Guarda el estado de las keys si cambió desde la última vez."""
+        if self._store is None or not self._dirty:
+            return
+        self._dirty = False
+        try:
+            await asyncio.to_thread(self._store.save, [key.quota for key in self._keys])
+        except Exception as e:
+            self._dirty = True
+            logger.error(f"Error al guardar la cuota de las API keys: {e}")
+
+    async def persist_periodically(self, interval_seconds: float) -> None:
+        """Guarda el estado cada `interval_seconds` (tarea de fondo del lifespan)."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await self.flush()
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except ValueError:
+        return None
@@ -0,0 +1,147 @@
+""" Cliente HTTP compartido para las APIs externas (Scopus). """
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from httpx import AsyncClient, Limits, RequestError, Response, Timeout
+
+from .api_key_pool import ApiKeyPool
+from .rate_limiter import AdaptiveRateLimiter, backoff_delay, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+
+def create_http_client(
+    max_connections: int = 20,
+    max_keepalive_connections: int = 20,
+    keepalive_expiry: float = 30.0,
+    http2: bool = False,
+    timeout: Timeout = Timeout(60.0, connect=10.0)
+) -> AsyncClient:
+    """
+    Crea el cliente con pool de conexiones del proceso.
+
+    Las conexiones se reutilizan entre peticiones (keep-alive), así que sólo
+    la primera petición a cada host paga el handshake TCP/TLS.
+
+    Args:
+        max_connections: Conexiones simultáneas máximas (las demás peticiones esperan turno)
+        max_keepalive_connections: Conexiones inactivas que se conservan abiertas
+        keepalive_expiry: Segundos que una conexión inactiva permanece abierta
+        http2: Usar HTTP/2 si el servidor lo admite (requiere el paquete `h2`)
+        timeout: Timeout por defecto; cada petición puede indicar el suyo
+    """
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 solicitado pero el paquete 'h2' no está instalado; se usará HTTP/1.1")
+            http2 = False
+
+    return AsyncClient(
+        limits=Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        ),
+        http2=http2,
+        timeout=timeout
+    )
+
+
+@asynccontextmanager
+async def borrow_http_client(client: Optional[AsyncClient], timeout: Timeout) -> AsyncIterator[AsyncClient]:
+    """
+    Entrega el cliente compartido si existe; si no (scripts, uso fuera de la
+    API), abre uno temporal que se cierra al salir.
+    """
+    if client is not None:
+        yield client
+        return
+    async with AsyncClient(timeout=timeout) as temporary_client:
+        yield temporary_client
+
+
+async def get_with_retries(
+    client: AsyncClient,
+    url: str,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    retries: int = 3,
+    key_pool: Optional[ApiKeyPool] = None,
+    **kwargs
+) -> Response:
+    """
+    GET que respeta el limitador de tasa compartido y reintenta los errores
+    transitorios (red, 429, 5xx) con espera exponencial con jitter.
+
+    Con `key_pool`, cada intento usa la key que elige el pool (con su propio
+    limitador, en lugar de `rate_limiter`); si la key se queda sin cuota, se
+    reintenta de inmediato con otra.
+
+    Args:
+        rate_limiter: Limitador del proceso (ver Container); None = sin límite
+        retries: Reintentos tras el primer intento
+        key_pool: Pool de API keys (ver Container); None = la key va en `headers`
+        **kwargs: Se pasan a `client.get` (headers, params, timeout)
+
+    Returns:
+        La respuesta, ya verificada con `raise_for_status`
+
+    Raises:
+        HTTPStatusError / RequestError: Si el error no es transitorio o se agotan los reintentos
+        ApiKeysExhaustedError: Si todas las keys del pool están sin cuota
+    """
+    # Sin limitador: sin límite de tasa, pero con la misma espera entre reintentos
+    limiter = rate_limiter
+    attempt = 0
+    while True:
+        pooled_key = None
+        if key_pool is not None:
+            pooled_key = key_pool.select()
+            limiter = pooled_key.rate_limiter
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), key_pool.header_name: pooled_key.api_key}
+        try:
+            if limiter is not None:
+                await limiter.acquire()
+        except BaseException:
+            # Cancelada mientras esperaba turno: la petición no se envió
+            if pooled_key is not None:
+                key_pool.release(pooled_key)
+            raise
+        if pooled_key is not None and pooled_key.is_paused():
+            # La key se quedó sin cuota mientras se esperaba turno: se elige otra
+            key_pool.release(pooled_key)
+            continue
+        try:
+            response = await client.get(url, **kwargs)
+        except RequestError as e:
+            if pooled_key is not None:
+                key_pool.release(pooled_key)
+            if attempt >= retries:
+                raise
+            reason, retry_after = type(e).__name__, None
+        except BaseException:
+            if pooled_key is not None:
+                key_pool.release(pooled_key)
+            raise
+        else:
+            if pooled_key is not None:
+                key_pool.observe(pooled_key, response.status_code, response.headers)
+            elif limiter is not None:
+                limiter.observe(response.status_code, response.headers)
+            if response.status_code != 429 and response.status_code < 500 or attempt >= retries:
+                response.raise_for_status()
+                return response
+            reason, retry_after = f"HTTP {response.status_code}", parse_retry_after(response.headers.get("Retry-After"))
+            if pooled_key is not None and pooled_key.is_paused():
+                # Key sin cuota: el siguiente intento usa otra, sin esperar
+                attempt += 1
+                logger.warning(f"GET {url} falló ({reason}, key sin cuota); reintento {attempt}/{retries} con otra key")
+                continue
+
+        delay = limiter.backoff_delay(attempt, retry_after) if limiter is not None else backoff_delay(attempt, retry_after)
+        attempt += 1
+        logger.warning(f"GET {url} falló ({reason}); reintento {attempt}/{retries} en {delay:.1f}s")
+        await asyncio.sleep(delay)
@@ -0,0 +1,115 @@
+"""
+Métricas en proceso: contadores e histogramas de latencia.
+
+Pensadas para rutas calientes: registrar una observación es sumar en una
+lista bajo un lock sin contención; los percentiles se calculan sólo al
+consultar el resumen. Los valores se acumulan desde el arranque del proceso
+(o desde el último `reset`) y son propios de cada worker.
+"""
+import bisect
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence, Tuple
+
+# Límites superiores de los buckets, en milisegundos (escala ~logarítmica)
+DEFAULT_BUCKETS_MS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000
+)
+
+
+class LatencyHistogram:
+    """Histograma de latencias con buckets fijos (no es seguro entre hilos por sí solo)."""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self._buckets_ms = tuple(buckets_ms)
+        self._bounds = tuple(bound / 1000 for bound in self._buckets_ms)
+        # Un bucket extra para lo que supera el último límite
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self._counts[bisect.bisect_left(self._bounds, seconds)] += 1
+        self._count += 1
+        self._total += seconds
+        if seconds > self._max:
+            self._max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """Percentil aproximado en milisegundos (límite superior de su bucket)."""
+        if self._count == 0:
+            return 0.0
+        rank = fraction * self._count
+        accumulated = 0
+        for bound_ms, count in zip(self._buckets_ms, self._counts):
+            accumulated += count
+            if accumulated >= rank:
+                return bound_ms
+        return self._max * 1000
+
+    def snapshot(self) -> Dict:
+        buckets = {f"le_{bound_ms:g}ms": count for bound_ms, count in zip(self._buckets_ms, self._counts)}
+        buckets["inf"] = self._counts[-1]
+        return {
+            "count": self._count,
+            "mean_ms": (self._total / self._count * 1000) if self._count else 0.0,
+            "max_ms": self._max * 1000,
+            "p50_ms": self.percentile(0.5),
+            "p90_ms": self.percentile(0.9),
+            "p99_ms": self.percentile(0.99),
+            "buckets": buckets,
+        }
+
+
+class MetricsRecorder:
+    """Contadores e histogramas de latencia con nombre, seguros entre hilos."""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self._buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._since = datetime.now(timezone.utc)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def record(self, name: str, seconds: float) -> None:
+        """Cuenta un evento y registra su latencia bajo el mismo nombre."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + 1
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram(self._buckets_ms)
+            histogram.observe(seconds)
+
+    def merge(self, counters: Dict[str, int], durations: Dict[str, List[float]]) -> None:
+        """
+        Agrega de una vez lo acumulado localmente (p. ej. en una consulta por
+        lotes): toma el lock una sola vez en lugar de una por evento.
+        """
+        with self._lock:
+            for name, amount in counters.items():
+                self._counters[name] = self._counters.get(name, 0) + amount
+            for name, observations in durations.items():
+                histogram = self._histograms.get(name)
+                if histogram is None:
+                    histogram = self._histograms[name] = LatencyHistogram(self._buckets_ms)
+                for seconds in observations:
+                    histogram.observe(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+            self._since = datetime.now(timezone.utc)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "since": self._since,
+                "counters": dict(self._counters),
+                "latency": {name: histogram.snapshot() for name, histogram in self._histograms.items()},
+            }
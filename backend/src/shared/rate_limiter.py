@@ -0,0 +1,160 @@
+"""
+Limitador de tasa adaptativo para APIs externas (Scopus).
+
+Cubeta de tokens compartida por todo el proceso: cada petición toma un token
+y, si no hay, espera su turno (en orden de llegada) en lugar de fallar. La
+tasa se ajusta con lo que informan las respuestas:
+
+- `X-RateLimit-Remaining` / `X-RateLimit-Reset`: si el reinicio está cerca
+  (hasta `max_pause`), la cuota restante se reparte hasta entonces, de modo
+  que no se agote antes de tiempo.
+- 429 (`Retry-After`): pausa global hasta la hora indicada y la tasa se
+  reduce a la mitad; cada respuesta correcta la vuelve a subir poco a poco.
+"""
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Segundos de espera de un `Retry-After` (segundos o fecha HTTP), o None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(
+    attempt: int,
+    retry_after: Optional[float] = None,
+    base: float = 0.5,
+    maximum: float = 30.0,
+    max_pause: float = 60.0
+) -> float:
+    """
+    Espera antes del reintento `attempt` (desde 0): exponencial con jitter
+    completo, y nunca menor que el `Retry-After` indicado por la API (hasta
+    `max_pause`).
+    """
+    delay = random.uniform(0, min(maximum, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, max_pause))
+    return delay
+
+
+class AdaptiveRateLimiter:
+    """Cubeta de tokens con tasa aprendida de las cabeceras de respuesta."""
+
+    def __init__(
+        self,
+        max_rate: float = 9.0,
+        burst: int = 9,
+        min_rate: float = 0.5,
+        rate_increase: float = 0.5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        max_pause: float = 60.0
+    ):
+        """
+        Args:
+            max_rate: Peticiones por segundo como máximo (límite de la API key)
+            burst: Tokens acumulables (peticiones seguidas sin esperar)
+            min_rate: Tasa mínima a la que se reduce tras varios 429
+            rate_increase: Aumento de la tasa (pet/s) por cada respuesta correcta
+            backoff_base: Espera base (s) del reintento exponencial con jitter
+            backoff_max: Espera máxima (s) de un reintento
+            max_pause: Pausa global máxima (s) por `Retry-After` o cuota agotada
+        """
+        self._max_rate = max_rate
+        self._burst = max(1, burst)
+        self._min_rate = min(min_rate, max_rate)
+        self._rate_increase = rate_increase
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._max_pause = max_pause
+
+        self._rate = max_rate
+        # Tasa que permite la cuota restante hasta su reinicio (None = sin información)
+        self._quota_rate: Optional[float] = None
+        self._tokens = float(self._burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+        self._throttled = 0
+
+    @property
+    def rate(self) -> float:
+        """Tasa vigente en peticiones por segundo."""
+        if self._quota_rate is None:
+            return self._rate
+        return max(self._min_rate, min(self._rate, self._quota_rate))
+
+    async def acquire(self) -> None:
+        """Espera a que haya un token disponible (en orden de llegada)."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                rate = self.rate
+                self._tokens = min(self._burst, self._tokens + (now - self._updated_at) * rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / rate)
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Ajusta la tasa con el estado y las cabeceras de una respuesta."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is not None and reset is not None:
+            try:
+                remaining_requests = int(remaining)
+                seconds_to_reset = max(float(reset) - time.time(), 1.0)
+            except ValueError:
+                pass
+            else:
+                # Sólo ventanas cortas: repartir una cuota semanal dejaría la tasa al
+                # mínimo y esperar su reinicio bloquearía el proceso (una cuota larga
+                # agotada la gestiona ApiKeyPool pausando la key)
+                if seconds_to_reset <= self._max_pause:
+                    self._quota_rate = remaining_requests / seconds_to_reset
+                    if remaining_requests <= 0:
+                        self._pause(seconds_to_reset, "cuota agotada")
+                else:
+                    self._quota_rate = None
+
+        if status_code == 429:
+            self._throttled += 1
+            self._rate = max(self._min_rate, self._rate / 2)
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            self._pause(retry_after if retry_after is not None else self.backoff_delay(0), "429")
+        elif status_code < 400:
+            self._rate = min(self._max_rate, self._rate + self._rate_increase)
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """`backoff_delay` con la configuración de este limitador."""
+        return backoff_delay(attempt, retry_after, self._backoff_base, self._backoff_max, self._max_pause)
+
+    def _pause(self, seconds: float, reason: str) -> None:
+        seconds = min(seconds, self._max_pause)
+        paused_until = time.monotonic() + seconds
+        if paused_until > self._paused_until:
+            self._paused_until = paused_until
+            # Sin ráfaga acumulada al reanudar
+            self._tokens = 0.0
+            self._updated_at = paused_until
+            logger.warning(f"La API limitó las peticiones ({reason}): pausa de {seconds:.1f}s, tasa {self.rate:.2f} pet/s")
@@ -1,12 +1,22 @@
 """ Cliente para la API de Scopus. """
 
-from typing import Dict, Any, List
-from httpx import Timeout, AsyncClient
+from typing import Dict, Any, List, Optional
+from httpx import Timeout, AsyncClient, HTTPStatusError, Response
+
+from .http_client import borrow_http_client, get_with_retries
+from .api_key_pool import ApiKeyPool
+from .rate_limiter import AdaptiveRateLimiter
 
 class ScopusApiClient:
     """Cliente para la API de Scopus."""
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str = "",
+        http_client: Optional[AsyncClient] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        key_pool: Optional[ApiKeyPool] = None
+    ):
         self._api_key = api_key
         self._base_url = "https://api.elsevier.com"
         self._headers = {
@@ -15,6 +25,23 @@ class ScopusApiClient:
         }
         # Aumentar timeout para autores con muchas publicaciones
         self._timeout = Timeout(120.0, connect=10.0)
+        # Cliente con pool compartido por el proceso (ver Container); None = uno por llamada
+        self._http_client = http_client
+        # Limitador de tasa compartido por todas las llamadas a Scopus (ver Container)
+        self._rate_limiter = rate_limiter
+        # Pool de API keys (ver Container): cada petición usa la key con más cuota
+        # y el limitador de esa key; None = `api_key` con `rate_limiter`
+        self._key_pool = key_pool
+
+    async def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Response:
+        """GET limitado y con reintentos ante errores transitorios."""
+        async with borrow_http_client(self._http_client, self._timeout) as client:
+            return await get_with_retries(
+                client, url,
+                rate_limiter=self._rate_limiter,
+                key_pool=self._key_pool,
+                headers=self._headers, params=params, timeout=self._timeout
+            )
 
     async def get_publications_by_author(self, author_id: str) -> Dict[str, Any]:
         """Busca publicaciones de un autor en Scopus."""
@@ -26,18 +53,14 @@ class ScopusApiClient:
             "start": start,
             "count": count
         }
-        async with AsyncClient(timeout=self._timeout) as client:
-            response = await client.get(url, headers=self._headers, params=params)
-            response.raise_for_status()
-            return response.json()
+        response = await self._get(url, params)
+        return response.json()
 
     async def get_publication_details(self, scopus_id: str) -> Dict[str, Any]:
         """Obtiene detalles completos de una publicación."""
         url = f"{self._base_url}/content/abstract/scopus_id/{scopus_id}"
-        async with AsyncClient(timeout=self._timeout) as client:
-            response = await client.get(url, headers=self._headers)
-            response.raise_for_status()
-            return response.json()
+        response = await self._get(url)
+        return response.json()
 
     async def get_author_details(self, author_id: str) -> Dict[str, Any]:
         """
@@ -48,10 +71,8 @@ class ScopusApiClient:
         params = {
             "view": "ENHANCED"
         }
-        async with AsyncClient(timeout=self._timeout) as client:
-            response = await client.get(url, headers=self._headers, params=params)
-            response.raise_for_status()
-            return response.json()
+        response = await self._get(url, params)
+        return response.json()
 
     async def get_author_subject_areas(self, scopus_author_id: str) -> List[str]:
         """
@@ -64,28 +85,28 @@ class ScopusApiClient:
         }
         
         try:
-            async with AsyncClient(timeout=self._timeout) as client:
-                response = await client.get(url, headers=self._headers, params=params)
-                
-                if response.status_code == 404:
+            try:
+                response = await self._get(url, params)
+            except HTTPStatusError as e:
+                if e.response.status_code == 404:
                     return []
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                # Navegación segura en el JSON de Scopus
-                author_profile = data.get("author-retrieval-response", [])
-                if isinstance(author_profile, list): author_profile = author_profile[0]
-                
-                subject_areas_raw = author_profile.get("subject-areas", {}).get("subject-area", [])
-                
-                # Scopus devuelve un dict si es solo una área, o una lista si son varias
-                if isinstance(subject_areas_raw, dict):
-                    subject_areas_raw = [subject_areas_raw]
-                
-                # Extraemos el nombre legible (campo "$")
-                areas = [area.get("$", "").strip() for area in subject_areas_raw if area.get("$")]
-                return areas
+                raise
+
+            data = response.json()
+            
+            # Navegación segura en el JSON de Scopus
+            author_profile = data.get("author-retrieval-response", [])
+            if isinstance(author_profile, list): author_profile = author_profile[0]
+            
+            subject_areas_raw = author_profile.get("subject-areas", {}).get("subject-area", [])
+            
+            # Scopus devuelve un dict si es solo una área, o una lista si son varias
+            if isinstance(subject_areas_raw, dict):
+                subject_areas_raw = [subject_areas_raw]
+            
+            # Extraemos el nombre legible (campo "$")
+            areas = [area.get("$", "").strip() for area in subject_areas_raw if area.get("$")]
+            return areas
                 
         except Exception as e:
             print(f"Error recuperando áreas para {scopus_author_id}: {e}")
@@ -0,0 +1,44 @@
+"""
+Agrupación de llamadas idénticas en curso ("single-flight").
+
+Si llega una llamada con la misma clave que otra que todavía no terminó, no
+se repite: espera el mismo resultado (o la misma excepción). Al terminar, la
+clave se libera y la siguiente llamada vuelve a ejecutarse.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Llamadas en curso por clave, compartidas dentro del proceso."""
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Ejecuta `call()` o se une a la ejecución en curso con la misma clave.
+
+        La ejecución continúa aunque se cancele quien la inició, para no
+        dejar sin resultado a los demás.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        else:
+            logger.debug(f"Uniéndose a la llamada en curso {key}")
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # La excepción ya se entregó a quienes esperaban (o nadie la espera)
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,59 @@
+"""
+Caché en memoria con caducidad (TTL) y tamaño máximo.
+
+Capa de lectura rápida delante de cachés persistentes: cada worker tiene la
+suya y sus entradas caducan pronto, de modo que los cambios hechos por otro
+worker (p. ej. una actualización forzada) se ven tras, como mucho, el TTL.
+"""
+import time
+from collections import OrderedDict
+from typing import Dict, Generic, Hashable, Iterable, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Diccionario con caducidad por entrada; al llenarse descarta la menos usada."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10000):
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        # clave -> (instante de caducidad en reloj monótono, valor); orden = uso (LRU)
+        self._entries: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, keys: Iterable[K]) -> Dict[K, V]:
+        """Valores vigentes de las claves pedidas (las caducadas se descartan)."""
+        now = time.monotonic()
+        found: Dict[K, V] = {}
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                continue
+            self._entries.move_to_end(key)
+            found[key] = value
+        return found
+
+    def set_many(self, values: Dict[K, V]) -> None:
+        if self._ttl <= 0:
+            return
+        expires_at = time.monotonic() + self._ttl
+        for key, value in values.items():
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, keys: Iterable[K]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,23 @@
+"""
+Fixtures compartidas de las pruebas del backend.
+
+Las pruebas se ejecutan desde `backend/` (`python -m pytest`), igual que la
+API, así que los módulos se importan como `src....`. Sus dependencias están
+en `requirements-dev.txt`.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from tests.sjr_data import write_sjr_csv  # noqa: E402
+
+
+@pytest.fixture
+def sjr_csv(tmp_path: Path) -> Path:
+    """CSV de SJR sintético pequeño (unas 2.000 filas)."""
+    return write_sjr_csv(tmp_path / "sjr.csv", n_journals=300)
@@ -0,0 +1,142 @@
+"""Datos SJR sintéticos para las pruebas y los benchmarks (`benchmarks/`)."""
+import csv
+import random
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# (clave, año) -> (áreas, categorías), por Sourceid y por nombre, más el año máximo
+SJRCache = Dict[Tuple[str, int], Tuple[List[str], List[str]]]
+SJRCaches = Tuple[SJRCache, SJRCache, int]
+
+SJR_HEADER = ["Rank", "Sourceid", "Title", "Type", "Categories", "Areas", "year"]
+AREAS = ["Computer Science", "Engineering", "Medicine", "Physics and Astronomy", "Chemistry"]
+TITLE_WORDS = ["journal", "of", "the", "review", "acta", "revista", "física", "&", "science", "letters", "Ñandú"]
+
+
+def write_sjr_csv(path: Path, n_journals: int, years=range(2015, 2024), seed: int = 1) -> Path:
+    """
+    Escribe un CSV de SJR sintético con el formato del archivo real (';' como
+    separador) y sus casos difíciles: revistas sin Sourceid o sin título,
+    categorías sin cuartil o repetidas, ranks vacíos o empatados y filas
+    duplicadas de una misma revista y año.
+    """
+    rng = random.Random(seed)
+    categories = [f"Category {i}" for i in range(max(10, n_journals // 20))] + ["Física & Química", "Odd (thing)"]
+    journals = []
+    for j in range(n_journals):
+        title = " ".join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(2, 5))) + f" {j}"
+        if j % 97 == 0:
+            title = ""
+        source_id = str(10000 + j) if j % 53 else ""
+        journals.append((source_id, title, rng.sample(categories, rng.randint(0, 4)), rng.sample(AREAS, rng.randint(0, 3))))
+
+    rows = []
+    for year in years:
+        for source_id, title, journal_categories, journal_areas in journals:
+            if rng.random() < 0.2:
+                continue
+            parts = []
+            for category in journal_categories:
+                kind = rng.random()
+                if kind < 0.75:
+                    parts.append(f"{category} (Q{rng.randint(1, 4)})")
+                elif kind < 0.85:
+                    parts.append(category)
+                else:
+                    parts.append(f"{category} ( Q1 )")
+            if parts and rng.random() < 0.05:
+                parts.append(parts[0])
+            rank = str(rng.randint(1, max(2, n_journals // 4))) if rng.random() > 0.02 else ""
+            areas = "; ".join(journal_areas) + ("; " if rng.random() < 0.1 else "")
+            rows.append([rank, source_id, title, "journal", "; ".join(parts), areas, str(year)])
+        rows.append(["5", "10001", "duplicated row", "journal", "Category 1 (Q1)", "Medicine", str(year)])
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(SJR_HEADER)
+        writer.writerows(rows)
+    return path
+
+
+def legacy_sjr_caches(csv_path: str, normalize: Callable[[str], str]) -> SJRCaches:
+    """
+    Lector original del CSV (fila por fila con `iterrows`), conservado como
+    referencia: devuelve los antiguos `_sourceid_cache`, `_name_cache` y el
+    año máximo.
+    """
+    # Importación diferida: el resto del módulo no necesita pandas
+    import pandas as pd
+
+    df = pd.read_csv(csv_path, sep=';', decimal=',', dtype=str)
+    df.columns = [c.strip() for c in df.columns]
+    col_map = {c.lower(): c for c in df.columns}
+    sourceid_col_name = col_map.get('sourceid')
+    rank_col = 'Rank' if 'Rank' in df.columns or 'SJR Rank' not in df.columns else 'SJR Rank'
+
+    df[rank_col] = pd.to_numeric(df[rank_col], errors='coerce').fillna(float('inf'))
+    df['year'] = pd.to_numeric(df['year'], errors='coerce').fillna(0).astype(int)
+    df['Title_norm'] = df['Title'].apply(normalize)
+    if sourceid_col_name:
+        df['Sourceid_Final'] = df[sourceid_col_name].fillna('').astype(str).str.strip()
+    else:
+        df['Sourceid_Final'] = ''
+    max_year = int(df['year'].max()) if not df.empty else 0
+
+    universes: Dict[Tuple[int, str], List[float]] = defaultdict(list)
+    processed = []
+    for _, row in df.iterrows():
+        year = int(row.get('year', 0))
+        rank = float(row.get(rank_col, float('inf')))
+        categories = _legacy_categories(str(row.get('Categories', '')))
+        processed.append((
+            row['Title_norm'], year, rank, _legacy_areas(str(row.get('Areas', ''))),
+            categories, str(row.get('Sourceid_Final', '')).strip()
+        ))
+        for name, _ in categories:
+            universes[(year, name)].append(rank)
+    for universe in universes.values():
+        universe.sort()
+
+    by_sourceid, by_name = {}, {}
+    for title_norm, year, rank, areas, categories, sourceid in processed:
+        final_categories = []
+        for name, quartile in categories:
+            display = f"{name} ({quartile})" if quartile else name
+            if quartile == 'Q1':
+                universe = universes.get((year, name), [])
+                if universe and rank in universe:
+                    percent_top = (universe.index(rank) + 1) / len(universe) * 100.0
+                    if percent_top <= 10.0:
+                        display += f"[Categoría dentro del 10% superior ({percent_top:.1f})]"
+            final_categories.append(display)
+        if sourceid:
+            by_sourceid[(sourceid, year)] = (areas, final_categories)
+        if title_norm:
+            by_name[(title_norm, year)] = (areas, final_categories)
+    return by_sourceid, by_name, max_year
+
+
+def _legacy_categories(categories_str: str) -> List[Tuple[str, str]]:
+    if not categories_str or categories_str == 'nan':
+        return []
+    results = []
+    for part in categories_str.split(';'):
+        part = part.strip()
+        if not part:
+            continue
+        quartile, name = "", part
+        if part.endswith(')'):
+            last_open = part.rfind('(')
+            if last_open != -1:
+                candidate = part[last_open + 1:-1].strip()
+                if candidate.startswith('Q') and len(candidate) <= 3:
+                    quartile, name = candidate, part[:last_open].strip()
+        results.append((name, quartile))
+    return results
+
+
+def _legacy_areas(areas_str: str) -> List[str]:
+    if not areas_str or areas_str == 'nan':
+        return []
+    return [part.strip() for part in areas_str.split(';') if part.strip()]
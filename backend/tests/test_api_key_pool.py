@@ -0,0 +1,143 @@
+"""
+Reparto de peticiones entre API keys de Scopus (ApiKeyPool).
+"""
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from src.shared.api_key_pool import ApiKeyPool, ApiKeysExhaustedError
+from src.shared.http_client import get_with_retries
+from src.shared.rate_limiter import AdaptiveRateLimiter
+
+QUOTA_EXCEEDED = {"X-ELS-Status": "QUOTA_EXCEEDED - Quota Exceeded"}
+
+
+def _pool(*api_keys: str) -> ApiKeyPool:
+    return ApiKeyPool(api_keys, rate_limiter_factory=lambda: AdaptiveRateLimiter(max_rate=1000, burst=1000))
+
+
+def _quota_headers(remaining: int, reset_in: timedelta = timedelta(days=7)) -> dict:
+    reset = datetime.now(timezone.utc) + reset_in
+    return {"X-RateLimit-Limit": "20000", "X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(int(reset.timestamp()))}
+
+
+def _key(pool: ApiKeyPool, api_key: str):
+    return next(key for key in pool._keys if key.api_key == api_key)
+
+
+def _observe(pool: ApiKeyPool, api_key: str, remaining: int) -> None:
+    key = _key(pool, api_key)
+    key.in_flight += 1
+    pool.observe(key, 200, _quota_headers(remaining))
+
+
+def test_selection_follows_the_remaining_budget():
+    pool = _pool("a", "b")
+    _observe(pool, "a", 100)
+    _observe(pool, "b", 300)
+
+    # Peticiones simultáneas (sin liberar): la key con 3 veces más cuota recibe 3 veces más
+    selected = Counter(pool.select().api_key for _ in range(8))
+    assert selected == {"b": 6, "a": 2}
+
+
+def test_unknown_keys_share_concurrent_requests():
+    pool = _pool("a", "b", "c")
+    assert {pool.select().api_key for _ in range(3)} == {"a", "b", "c"}
+
+
+def test_selection_reserves_quota_until_the_response():
+    pool = _pool("a")
+    _observe(pool, "a", 10)
+
+    first, second = pool.select(), pool.select()
+    assert first.quota.remaining == 8 and first.reserved == 2
+
+    # Sin respuesta (error de red, cancelación): se devuelve lo reservado
+    pool.release(second)
+    assert first.quota.remaining == 9 and first.reserved == 1 and first.in_flight == 1
+
+    # La API ya descontó la petición respondida; no la que sigue en curso
+    third = pool.select()
+    pool.observe(first, 200, _quota_headers(9))
+    assert first.quota.remaining == 8 and third.reserved == 1
+
+
+def test_quota_exceeded_pauses_the_key_until_reset():
+    pool = _pool("a", "b")
+    key = pool.select()
+    reset = datetime.now(timezone.utc) + timedelta(hours=5)
+    pool.observe(key, 429, {**QUOTA_EXCEEDED, "X-RateLimit-Reset": str(int(reset.timestamp()))})
+
+    assert key.is_paused()
+    assert key.quota.paused_until == datetime.fromtimestamp(int(reset.timestamp()), tz=timezone.utc)
+    assert key.quota.remaining == 0
+    other = "b" if key.api_key == "a" else "a"
+    assert all(pool.select().api_key == other for _ in range(3))
+
+
+def test_quota_exceeded_without_reset_uses_the_default_pause():
+    pool = _pool("a")
+    key = pool.select()
+    before = datetime.now(timezone.utc)
+    pool.observe(key, 429, QUOTA_EXCEEDED)
+
+    assert key.quota.paused_until >= before + ApiKeyPool.DEFAULT_EXHAUSTED_PAUSE
+
+
+def test_paused_key_resumes_after_its_reset():
+    pool = _pool("a")
+    key = pool.select()
+    pool.observe(key, 429, QUOTA_EXCEEDED)
+    key.quota.paused_until = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+    assert pool.select() is key
+    pool.observe(key, 200, _quota_headers(500))
+    assert key.quota.paused_until is None and key.quota.remaining == 500
+
+
+def test_exhausted_pool_raises_with_the_earliest_resume():
+    pool = _pool("a", "b")
+    resets = {"a": timedelta(hours=3), "b": timedelta(hours=1)}
+    for api_key, reset_in in resets.items():
+        key = _key(pool, api_key)
+        key.in_flight += 1
+        pool.observe(key, 200, _quota_headers(0, reset_in))
+
+    with pytest.raises(ApiKeysExhaustedError) as error:
+        pool.select()
+    assert error.value.resume_at == _key(pool, "b").quota.paused_until
+
+
+def test_empty_pool_raises():
+    with pytest.raises(ApiKeysExhaustedError):
+        _pool("", " ").select()
+
+
+def test_get_with_retries_moves_to_another_key_on_quota_exceeded():
+    used = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        used.append(request.headers["X-ELS-APIKey"])
+        if request.headers["X-ELS-APIKey"] == "a":
+            return httpx.Response(429, headers=QUOTA_EXCEEDED)
+        return httpx.Response(200, headers=_quota_headers(50))
+
+    pool = _pool("a", "b")
+    # La key "a" parece la de más cuota: es la primera en usarse
+    _observe(pool, "a", 1000)
+    _observe(pool, "b", 100)
+
+    async def get():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await get_with_retries(client, "https://api.test/search", key_pool=pool)
+
+    response = asyncio.run(get())
+
+    assert response.status_code == 200
+    assert used == ["a", "b"]
+    assert _key(pool, "a").is_paused()
+    assert all(key.in_flight == 0 and key.reserved == 0 for key in pool._keys)
@@ -0,0 +1,136 @@
+"""
+Consultas por lotes a Author Retrieval (ScopusAuthorSubjectAreaRepository)
+contra una API simulada (`httpx.MockTransport`), y caché de áreas temáticas
+de SubjectAreaService.
+"""
+import asyncio
+from typing import Dict, List, Set
+
+import httpx
+
+from src.modules.publications.application.subject_area_service import SubjectAreaService
+from src.modules.publications.domain.author_subject_area_cache_repository import IAuthorSubjectAreaCacheRepository
+from src.modules.publications.infrastructure.scopus_author_subject_area_repository import (
+    AUTHOR_RETRIEVAL_MAX_IDS, ScopusAuthorSubjectAreaRepository
+)
+from src.shared.rate_limiter import AdaptiveRateLimiter
+from src.shared.ttl_cache import TTLCache
+
+# Áreas de cada perfil de la API simulada, según el resto del ID módulo 3
+AREAS_BY_REMAINDER = {0: ["COMP"], 1: ["ENGI", "MEDI"], 2: []}
+
+
+def _retrieval(scopus_id: str) -> Dict:
+    abbrevs = AREAS_BY_REMAINDER[int(scopus_id) % 3]
+    return {
+        "coredata": {"dc:identifier": f"AUTHOR_ID:{scopus_id}"},
+        "subject-areas": {"subject-area": [{"@abbrev": abbrev, "$": abbrev} for abbrev in abbrevs]},
+    }
+
+
+def _fetch(scopus_ids: List[str], requested: List[List[str]]) -> Dict[str, List[str]]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        ids = request.url.params["author_id"].split(",")
+        requested.append(ids)
+        # La API no garantiza el orden de los perfiles de la respuesta
+        retrievals = [_retrieval(scopus_id) for scopus_id in reversed(ids)]
+        return httpx.Response(200, json={"author-retrieval-response-list": {"author-retrieval-response": retrievals}})
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            repository = ScopusAuthorSubjectAreaRepository(
+                "key", http_client=client, rate_limiter=AdaptiveRateLimiter(max_rate=1000, burst=1000)
+            )
+            return await repository.get_subject_areas_by_scopus_ids(scopus_ids)
+    return asyncio.run(fetch())
+
+
+def test_batches_are_capped_and_split_by_identifier():
+    scopus_ids = [str(57000000000 + i) for i in range(60)]
+    requested = []
+    areas_by_id = _fetch(scopus_ids + scopus_ids[:5], requested)
+
+    # Sin repetir IDs y a lo sumo 25 por petición
+    assert sorted(len(ids) for ids in requested) == [10, AUTHOR_RETRIEVAL_MAX_IDS, AUTHOR_RETRIEVAL_MAX_IDS]
+    assert sorted(sid for ids in requested for sid in ids) == sorted(scopus_ids)
+    assert areas_by_id["57000000000"] == ["Computer Science"]
+    assert areas_by_id["57000000001"] == ["Engineering", "Medicine"]
+    assert areas_by_id["57000000002"] == []
+    assert set(areas_by_id) == set(scopus_ids)
+
+
+def test_single_author_response_is_not_a_list():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"author-retrieval-response-list": {
+            "author-retrieval-response": _retrieval("57000000001")
+        }})
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            repository = ScopusAuthorSubjectAreaRepository("key", http_client=client)
+            return await repository._fetch_chunk(["57000000001"])
+
+    assert asyncio.run(fetch()) == {"57000000001": ["Engineering", "Medicine"]}
+
+
+class _MemoryCacheRepository(IAuthorSubjectAreaCacheRepository):
+    def __init__(self):
+        self.rows: Dict[str, List[str]] = {}
+
+    async def get_fresh(self, scopus_ids: List[str], max_age_hours: int) -> Dict[str, List[str]]:
+        return {sid: self.rows[sid] for sid in scopus_ids if sid in self.rows}
+
+    async def save_many(self, areas_by_scopus_id: Dict[str, List[str]]) -> int:
+        self.rows.update(areas_by_scopus_id)
+        return len(areas_by_scopus_id)
+
+
+def _service_scenario(failing: Set[str]):
+    """Servicio con caché en BD simulada y en memoria sobre la API simulada; `failing` responde 500."""
+    requested: List[str] = []
+    cache_repo = _MemoryCacheRepository()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        ids = request.url.params.get("author_id") or request.url.path.rsplit("/", 1)[-1]
+        requested.extend(ids.split(","))
+        if failing & set(ids.split(",")):
+            return httpx.Response(500)
+        if "author_id" in request.url.params:
+            retrievals = [_retrieval(scopus_id) for scopus_id in ids.split(",")]
+            return httpx.Response(200, json={"author-retrieval-response-list": {"author-retrieval-response": retrievals}})
+        return httpx.Response(200, json={"author-retrieval-response": [_retrieval(ids)]})
+
+    async def run(calls: List[List[str]]) -> List[Dict[str, List[str]]]:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            limiter = AdaptiveRateLimiter(max_rate=1000, burst=1000, backoff_base=0.001)
+            repository = ScopusAuthorSubjectAreaRepository("key", http_client=client, rate_limiter=limiter, batch_size=2)
+            service = SubjectAreaService(
+                repository, scopus_account_repo=None, cache_repo=cache_repo, memory_cache=TTLCache(ttl_seconds=60)
+            )
+            return [await service._fetch_subject_areas_many(scopus_ids) for scopus_ids in calls]
+
+    return run, requested, cache_repo
+
+
+def test_profile_without_areas_is_cached():
+    run, requested, cache_repo = _service_scenario(failing=set())
+    first, second = asyncio.run(run([["57000000002"], ["57000000002"]]))
+
+    assert first == second == {"57000000002": []}
+    assert cache_repo.rows == {"57000000002": []}
+    assert requested == ["57000000002"]
+
+
+def test_api_errors_are_not_cached():
+    run, requested, cache_repo = _service_scenario(failing={"57000000003"})
+    # Lotes de 2: falla sólo el lote con 57000000003
+    first, second = asyncio.run(run([
+        ["57000000000", "57000000001", "57000000002", "57000000003"],
+        ["57000000000", "57000000001", "57000000002", "57000000003"],
+    ]))
+
+    assert first == second == {"57000000000": ["Computer Science"], "57000000001": ["Engineering", "Medicine"]}
+    assert set(cache_repo.rows) == {"57000000000", "57000000001"}
+    # El lote que falló se vuelve a pedir (con sus reintentos) en la segunda consulta; el que respondió, no
+    assert requested.count("57000000000") == requested.count("57000000001") == 1
+    assert requested.count("57000000002") == requested.count("57000000003") == 2 * 4
@@ -0,0 +1,165 @@
+"""
+Actualizaciones de caché simultáneas de una misma cuenta (single-flight).
+
+Los repositorios son implementaciones en memoria con sólo los métodos que usa
+PublicationService; la descarga de Scopus se detiene en un `asyncio.Event`
+para que las llamadas se superpongan de forma determinista.
+"""
+import asyncio
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+
+import pytest
+
+from src.modules.publications.application.publication_service import PublicationService
+from src.modules.publications.domain.publication import Publication
+from src.modules.publications.domain.publication_cache_repository import CacheRefreshState
+from src.modules.publications.infrastructure.sjr_file_repository import SJRFileRepository
+from src.modules.scopus_accounts.domain.scopus_account import ScopusAccount
+from src.shared.single_flight import SingleFlight
+
+SCOPUS_ID = "57000000001"
+
+
+class _GatedScopus:
+    """Búsqueda de Scopus que responde cuando se abre `release`."""
+
+    def __init__(self, error: Optional[Exception] = None):
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self._error = error
+
+    async def iter_publications_by_scopus_id(self, scopus_author_id: str, loaded_after=None):
+        self.calls += 1
+        self.started.set()
+        await self.release.wait()
+        if self._error is not None:
+            raise self._error
+        yield [{"dc:identifier": f"SCOPUS_ID:{i}", "prism:coverDate": "2020-01-01"} for i in range(3)]
+
+
+class _MemoryCache:
+    def __init__(self, name: str, log: List[str]):
+        self._name = name
+        self._log = log
+        self.rows: Dict[str, Publication] = {}
+        self.states: Dict[UUID, CacheRefreshState] = {}
+
+    async def is_cache_valid(self, scopus_account_id: UUID, max_age_hours: int = 24) -> bool:
+        return False
+
+    async def get_refresh_state(self, scopus_account_id: UUID) -> Optional[CacheRefreshState]:
+        self._log.append(self._name)
+        return self.states.get(scopus_account_id)
+
+    async def save_publications(self, publications: List[Publication], scopus_account_id: UUID) -> int:
+        self._log.append(self._name)
+        self.rows.update((publication.scopus_id, publication) for publication in publications)
+        return len(publications)
+
+    async def delete_missing(self, scopus_account_id: UUID, keep_scopus_ids: List[str]) -> int:
+        return 0
+
+    async def mark_refreshed(self, scopus_account_id: UUID, refreshed_at: datetime, full: bool) -> None:
+        self.states[scopus_account_id] = CacheRefreshState(scopus_account_id, refreshed_at, refreshed_at)
+
+
+class _Accounts:
+    def __init__(self, account: ScopusAccount):
+        self._account = account
+
+    async def get_by_author(self, author_id: UUID) -> List[ScopusAccount]:
+        return [self._account]
+
+
+class _Scenario:
+    """Servicio por petición (con la caché de la petición) y la caché propia de la ejecución compartida."""
+
+    def __init__(self, scopus: _GatedScopus):
+        self.scopus = scopus
+        self.account = ScopusAccount(uuid.uuid4(), SCOPUS_ID, uuid.uuid4())
+        self.cache_log: List[str] = []
+        self.shared_cache = _MemoryCache("shared", self.cache_log)
+        self.closed_shared_caches = 0
+        self._sjr = SJRFileRepository("", autoload=False)
+        # Las descargas en curso se comparten entre servicios, como en el Container
+        self._single_flight = SingleFlight()
+
+    @contextmanager
+    def _open_shared_cache(self):
+        try:
+            yield self.shared_cache
+        finally:
+            self.closed_shared_caches += 1
+
+    def service(self, request: str) -> PublicationService:
+        return PublicationService(
+            self.scopus, _MemoryCache(request, self.cache_log), self._sjr, _Accounts(self.account),
+            single_flight=self._single_flight,
+            shared_cache_repo=self._open_shared_cache
+        )
+
+    async def request(self, name: str):
+        return await self.service(name).get_publications_by_author(self.account.author_id)
+
+
+def test_concurrent_requests_share_one_fetch():
+    async def run():
+        scenario = _Scenario(_GatedScopus())
+        requests = [asyncio.create_task(scenario.request(f"request-{i}")) for i in range(5)]
+        await scenario.scopus.started.wait()
+        await asyncio.sleep(0)
+        scenario.scopus.release.set()
+        return scenario, await asyncio.gather(*requests)
+
+    scenario, responses = asyncio.run(run())
+
+    assert scenario.scopus.calls == 1
+    assert all(response.total_publications == 3 for response in responses)
+    # La ejecución compartida escribe con su propia caché, nunca con la de una petición
+    assert set(scenario.cache_log) == {"shared"}
+    assert len(scenario.shared_cache.rows) == 3
+    assert scenario.closed_shared_caches == 1
+
+
+def test_exception_reaches_every_waiter():
+    async def run():
+        scenario = _Scenario(_GatedScopus(error=RuntimeError("Scopus no disponible")))
+        requests = [asyncio.create_task(scenario.request(f"request-{i}")) for i in range(3)]
+        await scenario.scopus.started.wait()
+        await asyncio.sleep(0)
+        scenario.scopus.release.set()
+        return scenario, await asyncio.gather(*requests, return_exceptions=True)
+
+    scenario, results = asyncio.run(run())
+
+    assert scenario.scopus.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert scenario.closed_shared_caches == 1
+
+
+def test_cancelling_the_initiator_does_not_cancel_joiners():
+    async def run():
+        scenario = _Scenario(_GatedScopus())
+        initiator = asyncio.create_task(scenario.request("initiator"))
+        await scenario.scopus.started.wait()
+        joiner = asyncio.create_task(scenario.request("joiner"))
+        await asyncio.sleep(0)
+
+        initiator.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await initiator
+        scenario.scopus.release.set()
+        return scenario, await joiner
+
+    scenario, response = asyncio.run(run())
+
+    assert scenario.scopus.calls == 1
+    assert response.total_publications == 3
+    # Se guardó en la caché propia aunque la petición que la inició ya no existe
+    assert len(scenario.shared_cache.rows) == 3
+    assert "initiator" not in scenario.cache_log
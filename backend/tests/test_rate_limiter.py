@@ -0,0 +1,134 @@
+"""
+Limitador de tasa adaptativo y reintentos de `get_with_retries`.
+
+El reloj es simulado: `time` y `asyncio.sleep` del módulo del limitador
+avanzan un reloj falso, así que las esperas son exactas e instantáneas.
+"""
+import asyncio
+import types
+from typing import List
+
+import httpx
+import pytest
+
+from src.shared import http_client, rate_limiter
+from src.shared.http_client import get_with_retries
+from src.shared.rate_limiter import AdaptiveRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+        self.sleeps: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    monkeypatch.setattr(rate_limiter, "asyncio", types.SimpleNamespace(Lock=asyncio.Lock, sleep=clock.sleep))
+    monkeypatch.setattr(http_client, "asyncio", types.SimpleNamespace(sleep=clock.sleep))
+    return clock
+
+
+def _acquire(limiter: AdaptiveRateLimiter, times: int) -> None:
+    async def acquire():
+        for _ in range(times):
+            await limiter.acquire()
+    asyncio.run(acquire())
+
+
+def test_token_bucket_allows_a_burst_then_the_rate(clock: FakeClock):
+    limiter = AdaptiveRateLimiter(max_rate=2.0, burst=3)
+    started = clock.now
+    _acquire(limiter, 7)
+
+    # 3 de la ráfaga y 4 más a 2 pet/s
+    assert clock.now - started == pytest.approx(2.0)
+    assert clock.sleeps == pytest.approx([0.5] * 4)
+
+
+def test_429_halves_the_rate_and_pauses_until_retry_after(clock: FakeClock):
+    limiter = AdaptiveRateLimiter(max_rate=8.0, burst=8, rate_increase=0.5)
+    limiter.observe(429, {"Retry-After": "5"})
+    assert limiter.rate == 4.0
+
+    started = clock.now
+    _acquire(limiter, 1)
+    # Pausa del Retry-After y, sin ráfaga acumulada, un token a la nueva tasa
+    assert clock.now - started == pytest.approx(5.0 + 1 / 4.0)
+
+    limiter.observe(200, {})
+    assert limiter.rate == 4.5
+
+
+def test_rate_follows_the_quota_headers(clock: FakeClock):
+    limiter = AdaptiveRateLimiter(max_rate=9.0, min_rate=0.5, max_pause=60.0)
+
+    # 10 peticiones en los 20 s que faltan para el reinicio
+    limiter.observe(200, {"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": str(clock.time() + 20)})
+    assert limiter.rate == pytest.approx(0.5)
+    limiter.observe(200, {"X-RateLimit-Remaining": "100", "X-RateLimit-Reset": str(clock.time() + 20)})
+    assert limiter.rate == pytest.approx(5.0)
+
+    # Una cuota semanal no se reparte (la gestiona el pool de keys)
+    limiter.observe(200, {"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": str(clock.time() + 7 * 86400)})
+    assert limiter.rate == 9.0
+
+    # Cuota agotada con reinicio cercano: pausa hasta el reinicio
+    limiter.observe(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(clock.time() + 10)})
+    started = clock.now
+    _acquire(limiter, 1)
+    assert clock.now - started >= 10.0
+
+
+def _get(transport: httpx.MockTransport, limiter=None, retries: int = 3) -> httpx.Response:
+    async def get():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await get_with_retries(client, "https://api.test/search", rate_limiter=limiter, retries=retries)
+    return asyncio.run(get())
+
+
+def test_get_with_retries_waits_for_retry_after_and_slows_down(clock: FakeClock):
+    responses = [httpx.Response(429, headers={"Retry-After": "3"}), httpx.Response(200)]
+    limiter = AdaptiveRateLimiter(max_rate=8.0, burst=8, rate_increase=0.5)
+    started = clock.now
+
+    response = _get(httpx.MockTransport(lambda request: responses.pop(0)), limiter)
+
+    assert response.status_code == 200
+    assert clock.now - started >= 3.0
+    # Mitad por el 429 y un aumento por la respuesta correcta
+    assert limiter.rate == 4.5
+
+
+def test_get_with_retries_without_limiter_only_backs_off(clock: FakeClock, monkeypatch):
+    def no_limiter(*args, **kwargs):
+        raise AssertionError("Sin limitador no se crea uno")
+
+    monkeypatch.setattr(rate_limiter.AdaptiveRateLimiter, "__init__", no_limiter)
+    responses = [httpx.Response(503), httpx.Response(503), httpx.Response(200)]
+
+    response = _get(httpx.MockTransport(lambda request: responses.pop(0)))
+
+    assert response.status_code == 200
+    # Dos esperas de reintento (exponenciales con jitter: hasta 0.5 s y 1 s)
+    assert len(clock.sleeps) == 2
+    assert clock.sleeps[0] <= 0.5 and clock.sleeps[1] <= 1.0
+
+
+def test_get_with_retries_raises_after_the_last_retry(clock: FakeClock):
+    transport = httpx.MockTransport(lambda request: httpx.Response(503))
+    with pytest.raises(httpx.HTTPStatusError):
+        _get(transport, AdaptiveRateLimiter(), retries=2)
+    assert len(clock.sleeps) == 2
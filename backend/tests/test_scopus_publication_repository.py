@@ -0,0 +1,157 @@
+"""
+Búsqueda de Scopus de ScopusPublicationRepository contra una API simulada
+(`httpx.MockTransport`): proyección de campos y paginación.
+"""
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+import httpx
+import pytest
+
+from src.modules.publications.infrastructure.scopus_publication_repository import ScopusPublicationRepository
+from src.shared.rate_limiter import AdaptiveRateLimiter
+
+EPN_AFFILIATION_ID = "60072054"
+
+
+def _entry(i: int, afid: Optional[str] = EPN_AFFILIATION_ID) -> Dict:
+    author = {"authid": "57000000001"}
+    if afid is not None:
+        author["afid"] = [{"$": afid}]
+    return {"dc:identifier": f"SCOPUS_ID:{i}", "dc:title": f"T{i}", "author": [author]}
+
+
+def _search_response(entries: List[Dict], total: int) -> httpx.Response:
+    return httpx.Response(200, json={"search-results": {
+        "opensearch:totalResults": str(total),
+        "entry": entries or [{"error": "Result set was empty"}],
+    }})
+
+
+def _repository(handler: Callable[[httpx.Request], httpx.Response], **kwargs) -> ScopusPublicationRepository:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    # Sin esperas reales entre reintentos
+    limiter = AdaptiveRateLimiter(max_rate=1000, burst=1000, backoff_base=0.001)
+    return ScopusPublicationRepository("key", http_client=client, rate_limiter=limiter, **kwargs)
+
+
+def _fetch_all(repository: ScopusPublicationRepository, scopus_id: str = "57000000001") -> List[Dict]:
+    async def fetch():
+        try:
+            return await repository.get_publications_by_scopus_id(scopus_id)
+        finally:
+            await repository._http_client.aclose()
+    return asyncio.run(fetch())
+
+
+def test_projection_without_author_affiliations_falls_back_per_instance():
+    projected_requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        projected = "field" in request.url.params
+        projected_requests.append(projected)
+        # La API no devuelve `afid` por autor con `field=`
+        return _search_response([_entry(i, afid=None if projected else EPN_AFFILIATION_ID) for i in range(3)], 3)
+
+    repository = _repository(handler, field_projection=True)
+    entries = _fetch_all(repository)
+
+    assert [entry["author"][0]["afid"] for entry in entries] == [[{"$": EPN_AFFILIATION_ID}]] * 3
+    assert repository._projection_works is False
+    # Otra instancia vuelve a intentar la proyección
+    other = _repository(handler, field_projection=True)
+    projected_requests.clear()
+    _fetch_all(other)
+    assert projected_requests[0] is True
+
+
+def test_unaffiliated_page_keeps_projection():
+    def handler(request: httpx.Request) -> httpx.Response:
+        # Publicaciones sin filiación: tampoco hay `afid` en el registro completo
+        return _search_response([_entry(i, afid=None) for i in range(3)], 3)
+
+    repository = _repository(handler, field_projection=True)
+    assert len(_fetch_all(repository)) == 3
+    assert repository._projection_works is not False
+
+
+def _offset_api(
+    total: int,
+    failures: Dict[int, int],
+    requested: List[int]
+) -> Callable[[httpx.Request], httpx.Response]:
+    """Búsqueda paginada por `start`; la página que empieza en `start` responde 503 `failures[start]` veces."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        # La primera página se pide con `cursor=*`
+        start = int(request.url.params.get("start", 0))
+        requested.append(start)
+        if failures.get(start, 0) > 0:
+            failures[start] -= 1
+            return httpx.Response(503)
+        return _search_response([_entry(i) for i in range(start, min(start + 25, total))], total)
+    return handler
+
+
+def test_offset_pages_are_reassembled_in_order_and_retried_per_page():
+    # La página 50 llega después de las siguientes (dos reintentos)
+    requested = []
+    repository = _repository(_offset_api(110, {50: 2}, requested), max_concurrent_pages=4, page_retries=3)
+    entries = _fetch_all(repository)
+
+    assert [entry["dc:identifier"] for entry in entries] == [f"SCOPUS_ID:{i}" for i in range(110)]
+    # Sólo se repite la página que falló
+    assert sorted(requested) == [0, 25, 50, 50, 50, 75, 100]
+
+
+def test_offset_page_that_exhausts_its_retries_fails_the_query():
+    requested = []
+    repository = _repository(_offset_api(110, {75: 10}, requested), max_concurrent_pages=4, page_retries=2)
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        _fetch_all(repository)
+
+    assert error.value.response.status_code == 503
+    assert requested.count(75) == 3
+
+
+def _cursor_api(total: int, requests: List[Dict[str, str]]) -> Callable[[httpx.Request], httpx.Response]:
+    """Búsqueda paginada por `start` o por cursor (`@next` = "c<posición>")."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        requests.append(params)
+        cursor = params.get("cursor")
+        if cursor is None:
+            start = int(params.get("start", 0))
+        else:
+            start = 0 if cursor == "*" else int(cursor[1:])
+        response = _search_response([_entry(i) for i in range(start, min(start + 25, total))], total)
+        if cursor is not None:
+            following = min(start + 25, total)
+            body = response.json()
+            body["search-results"]["cursor"] = {
+                "@current": cursor,
+                "@next": f"c{following}" if following < total else cursor,
+            }
+            response = httpx.Response(200, json=body)
+        return response
+    return handler
+
+
+def test_large_result_continues_from_the_first_page_cursor():
+    requests = []
+    repository = _repository(_cursor_api(130, requests), cursor_threshold=100)
+    entries = _fetch_all(repository)
+
+    assert [entry["dc:identifier"] for entry in entries] == [f"SCOPUS_ID:{i}" for i in range(130)]
+    # Una llamada por página: la primera no se repite al pasar a cursor
+    assert [request.get("cursor") for request in requests] == ["*", "c25", "c50", "c75", "c100", "c125"]
+    assert not any("start" in request for request in requests)
+
+
+def test_small_result_switches_to_parallel_offsets_after_the_first_page():
+    requests = []
+    repository = _repository(_cursor_api(60, requests), cursor_threshold=100)
+    entries = _fetch_all(repository)
+
+    assert len(entries) == 60
+    assert requests[0].get("cursor") == "*"
+    assert sorted(int(request["start"]) for request in requests[1:]) == [25, 50]
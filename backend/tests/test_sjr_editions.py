@@ -0,0 +1,55 @@
+"""
+Registro de varias ediciones SJR (SJREditionRegistry): años por edición y
+ediciones publicadas tras cada recarga.
+"""
+from pathlib import Path
+
+from src.modules.publications.infrastructure.sjr_edition_registry import SJREdition, SJREditionRegistry
+from tests.sjr_data import write_sjr_csv
+
+
+def _registry(tmp_path: Path) -> SJREditionRegistry:
+    historic = write_sjr_csv(tmp_path / "historic.csv", n_journals=120, years=range(2015, 2021))
+    latest = write_sjr_csv(tmp_path / "latest.csv", n_journals=120, years=range(2019, 2023), seed=2)
+    return SJREditionRegistry(
+        [SJREdition("historic", str(historic)), SJREdition("latest", str(latest))], use_snapshot=False
+    )
+
+
+def test_each_year_comes_from_the_newest_edition(tmp_path):
+    registry = _registry(tmp_path)
+
+    assert registry.get_edition_for_year(2016) == "historic"
+    assert registry.get_edition_for_year(2019) == "latest"
+    assert registry.get_edition_for_year(2030) == "latest"
+    journal = registry.get_journal_by_sourceid("10001")
+    assert journal.years == list(range(2015, 2023))
+
+
+def test_reload_does_not_accumulate_editions(tmp_path):
+    registry = _registry(tmp_path)
+    historic, latest = registry.editions
+
+    assert registry.reload(latest.csv_path)
+    assert registry.editions == [historic, latest]
+
+    # Un CSV nuevo reemplaza a la edición más nueva, también al recargar otra vez
+    for name in ("2023", "2024"):
+        csv_path = str(write_sjr_csv(tmp_path / f"{name}.csv", n_journals=50, years=[int(name)]))
+        assert registry.reload(csv_path)
+        assert [edition.csv_path for edition in registry.editions] == [historic.csv_path, csv_path]
+        assert registry.csv_path == csv_path
+        assert registry.get_max_available_year() == int(name)
+
+    # Agregar una edición es explícito
+    added = SJREdition("2025", str(write_sjr_csv(tmp_path / "2025.csv", n_journals=50, years=[2025])))
+    assert registry.reload(editions=registry.editions + [added])
+    assert len(registry.editions) == 3 and registry.get_edition_for_year(2025) == "2025"
+
+
+def test_failed_reload_keeps_the_editions(tmp_path):
+    registry = _registry(tmp_path)
+    editions = registry.editions
+
+    assert not registry.reload(str(tmp_path / "missing.csv"))
+    assert registry.editions == editions
@@ -0,0 +1,92 @@
+"""
+Equivalencia de los lectores del CSV de SJR.
+
+Los lectores columnar (pandas), en streaming y el snapshot binario deben
+producir exactamente las mismas entradas que el lector original fila por
+fila (`iterrows`), reproducido aquí como referencia.
+"""
+import os
+
+import pytest
+
+from src.modules.publications.infrastructure.sjr_file_repository import (
+    CSV_PARSER_PANDAS,
+    CSV_PARSER_STREAM,
+    SJRFileRepository,
+)
+from src.modules.publications.infrastructure.sjr_snapshot import snapshot_path
+from tests.sjr_data import SJRCaches, legacy_sjr_caches
+
+# Casos límite del formato: BOM, columnas con espacios, NA, comillas y saltos
+# de línea dentro de un campo, años y ranks no numéricos, filas cortas
+EDGE_CSV = (
+    "﻿Rank ;Sourceid;Title;year;Areas;Categories;extra\n"
+    "1;100;\"Journal of; Things\";2020;\"Medicine; Biology ;\";\"Cardio (Q1); Neuro (Q2);Misc\";x\n"
+    "NA;101;NA;2020;NA;\"Cardio (Q1)\";\n"
+    "3;  102 ;Ciencia & Tecnología;2021.7;Medicine;\"Cardio (Q1);Cardio (Q1); Weird (Q12) ; Paren (x) (Q3)\";\n"
+    " 4 ;;Ciencia & Tecnología;2021;;;\n"
+    "\n"
+    "5;103;\"Multi\nline\";abc;;\"Cardio (Q1)\";\n"
+    "1_000;104;Short row;2020\n"
+    "inf;105;Inf rank;2020;;\"Cardio (Q1)\";\n"
+    "1e1;106;  ;2020;;\"Cardio (Q1)\";\n"
+    "2;107;\"Quoted \"\"name\"\"\";2020;null;\"Neuro (Q2)\";\n"
+)
+
+
+def _caches(repository: SJRFileRepository) -> SJRCaches:
+    return (
+        dict(repository.iter_entries('sourceid')),
+        dict(repository.iter_entries('name')),
+        repository.get_max_available_year(),
+    )
+
+
+@pytest.fixture(params=["synthetic", "edge"])
+def csv_path(request, sjr_csv, tmp_path) -> str:
+    if request.param == "synthetic":
+        return str(sjr_csv)
+    path = tmp_path / "edge.csv"
+    path.write_text(EDGE_CSV, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("csv_parser", [CSV_PARSER_PANDAS, CSV_PARSER_STREAM])
+def test_parser_matches_legacy_loader(csv_path, csv_parser):
+    repository = SJRFileRepository(csv_path, use_snapshot=False, csv_parser=csv_parser)
+    assert repository.is_ready
+
+    expected = legacy_sjr_caches(csv_path, repository.normalize_journal_name)
+    assert _caches(repository) == expected
+
+
+def test_snapshot_matches_csv(csv_path):
+    built = SJRFileRepository(csv_path, use_snapshot=True)
+    assert built.is_ready
+
+    from_snapshot = SJRFileRepository(csv_path, use_snapshot=True, csv_parser=CSV_PARSER_STREAM)
+    assert from_snapshot.is_ready
+
+    assert _caches(from_snapshot) == _caches(built)
+    assert from_snapshot.export_indexes()['journal_titles'] == built.export_indexes()['journal_titles']
+    assert from_snapshot.export_indexes()['sourceid_titles'] == built.export_indexes()['sourceid_titles']
+
+
+def test_parsers_build_identical_indexes(sjr_csv):
+    by_pandas = SJRFileRepository(str(sjr_csv), use_snapshot=False, csv_parser=CSV_PARSER_PANDAS)
+    by_stream = SJRFileRepository(str(sjr_csv), use_snapshot=False, csv_parser=CSV_PARSER_STREAM)
+
+    for key in ('sourceid_index', 'name_index', 'max_year', 'years', 'journal_titles', 'sourceid_titles'):
+        assert by_pandas.export_indexes()[key] == by_stream.export_indexes()[key], key
+
+
+def test_stale_snapshot_is_rebuilt(sjr_csv):
+    SJRFileRepository(str(sjr_csv), use_snapshot=True)
+    assert os.path.exists(snapshot_path(str(sjr_csv)))
+
+    with open(sjr_csv, "a", encoding="utf-8") as f:
+        f.write("1;99999;Added Journal;journal;Added (Q1);Medicine;2030\n")
+
+    repository = SJRFileRepository(str(sjr_csv), use_snapshot=True)
+    assert repository.get_max_available_year() == 2030
+    assert repository.get_journal_data("99999", 2030)[:2] == (["Medicine"], ["Added (Q1)"])
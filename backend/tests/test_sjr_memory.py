@@ -0,0 +1,86 @@
+"""
+Pruebas de regresión de memoria del repositorio SJR.
+
+El repositorio se carga una vez por proceso (ver Container); estas pruebas
+verifican que no retiene instancias descartadas ni índices anteriores a una
+recarga, y que las filas quedan internadas.
+"""
+import gc
+import tracemalloc
+import weakref
+
+from src.modules.publications.infrastructure.sjr_file_repository import SJRFileRepository
+
+
+def _exercise(repository: SJRFileRepository) -> None:
+    for year in (2015, 2020, 2023):
+        repository.get_journal_data("10001", year, "duplicated row")
+        repository.get_journal_data(None, year, "Revista de Física 12")
+    repository.get_journal_data_many([("10002", 2020, "x"), (None, 2021, "journal of the review")])
+    repository.normalize_journal_name("Journal of Física & Química")
+
+
+def test_discarded_repository_is_collected(sjr_csv):
+    # Antes, `@lru_cache` sobre el método enlazado retenía cada instancia y sus índices
+    repository = SJRFileRepository(str(sjr_csv), use_snapshot=False)
+    assert repository.is_ready
+    _exercise(repository)
+
+    ref = weakref.ref(repository)
+    del repository
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_reload_releases_previous_indexes(sjr_csv):
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        repository = SJRFileRepository(str(sjr_csv), use_snapshot=False)
+        _exercise(repository)
+        gc.collect()
+        loaded = tracemalloc.get_traced_memory()[0]
+
+        for _ in range(5):
+            assert repository.reload()
+            _exercise(repository)
+        gc.collect()
+        reloaded = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    index_size = loaded - baseline
+    # Cinco recargas no deben acumular índices: como mucho, media copia de holgura
+    assert reloaded - loaded < index_size / 2
+
+
+def test_rows_are_interned_and_shared_between_indexes(sjr_csv):
+    repository = SJRFileRepository(str(sjr_csv), use_snapshot=False)
+    indexes = repository.export_indexes()
+
+    rows = indexes['rows']
+    assert len(set(rows)) == len(rows)
+    assert len(set(indexes['area_names'])) == len(indexes['area_names'])
+    assert len(set(indexes['category_labels'])) == len(indexes['category_labels'])
+
+    # Una revista con Sourceid y título apunta a la misma fila desde ambos índices
+    title = indexes['sourceid_titles']['10002']
+    by_sourceid = indexes['sourceid_index']['10002']
+    by_name = indexes['name_index'][title]
+    shared_years = set(by_sourceid[0]) & set(by_name[0])
+    assert shared_years
+    for year in shared_years:
+        assert by_sourceid[1][by_sourceid[0].index(year)] == by_name[1][by_name[0].index(year)]
+
+
+def test_lookups_return_independent_lists(sjr_csv):
+    repository = SJRFileRepository(str(sjr_csv), use_snapshot=False)
+    year = repository.get_max_available_year()
+
+    areas, categories, _ = repository.get_journal_data("10001", year)
+    areas.append("mutado")
+    categories.clear()
+
+    assert "mutado" not in repository.get_journal_data("10001", year)[0]
+    assert repository.get_journal_data("10001", year)[1]
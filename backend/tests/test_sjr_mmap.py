@@ -0,0 +1,45 @@
+"""
+Búsqueda de revistas con el índice SJR mapeable (`GET /sjr/journals`).
+
+El índice debe responder lo mismo que el repositorio en memoria, y obtener los
+años de cada revista con una sola búsqueda en el índice, no una por año.
+"""
+from src.modules.publications.infrastructure import sjr_mmap_repository
+from src.modules.publications.infrastructure.sjr_file_repository import SJRFileRepository
+from src.modules.publications.infrastructure.sjr_mmap_repository import SJRMmapRepository
+from tests.sjr_data import write_sjr_csv
+
+QUERIES = ["journal", "revista", "review 1", "física", "duplicated row", "zzz"]
+
+
+def test_search_matches_the_memory_repository(sjr_csv):
+    memory = SJRFileRepository(str(sjr_csv), use_snapshot=False)
+    mapped = SJRMmapRepository(str(sjr_csv), use_snapshot=False)
+
+    for query in QUERIES:
+        for publication_year in (None, 2016, 2030):
+            assert mapped.search_journals(query, 20, publication_year) == \
+                memory.search_journals(query, 20, publication_year)
+
+    for source_id in ("10001", "10002", "10120", " 10007 ", "99999"):
+        assert mapped.get_journal_by_sourceid(source_id) == memory.get_journal_by_sourceid(source_id)
+
+
+def test_journal_years_take_one_lookup(tmp_path, monkeypatch):
+    # Muchos años por revista: antes se hacía una búsqueda por año y por resultado
+    csv_path = write_sjr_csv(tmp_path / "sjr.csv", n_journals=200, years=range(1999, 2025))
+    mapped = SJRMmapRepository(str(csv_path), use_snapshot=False)
+    lookups = []
+    find = sjr_mmap_repository._KeyTable.find
+
+    def counting_find(table, encoded_key):
+        lookups.append(encoded_key)
+        return find(table, encoded_key)
+
+    monkeypatch.setattr(sjr_mmap_repository._KeyTable, "find", counting_find)
+    journals = mapped.search_journals("journal", limit=10)
+
+    assert len(journals) == 10
+    assert any(len(journal.years) > 20 for journal in journals)
+    # Años y datos del año más reciente: dos búsquedas por revista
+    assert len(lookups) == 2 * len(journals)
@@ -0,0 +1,58 @@
+"""
+Recarga en caliente del SJR con varios workers.
+
+Cada `SJRReloader` hace de un worker: todos vigilan el mismo CSV y el mismo
+directorio de datos. El lock de construcción es un `flock`, que también
+excluye a dos archivos abiertos en el mismo proceso.
+"""
+import asyncio
+from functools import partial
+from pathlib import Path
+
+from src.modules.publications.infrastructure.sjr_file_repository import SJRFileRepository
+from src.modules.publications.infrastructure.sjr_reloader import SJRReloader
+from tests.sjr_data import write_sjr_csv
+
+
+def _worker(csv_path: Path, data_dir: Path, builds: list, worker: int) -> SJRReloader:
+    reloader = SJRReloader(
+        SJRFileRepository(str(csv_path), use_snapshot=False),
+        data_dir=data_dir,
+        prebuild_factory=partial(SJRFileRepository, autoload=False)
+    )
+
+    async def prebuild(path: str) -> bool:
+        # En lugar del proceso aparte: registra quién construye y tarda un poco
+        builds.append(worker)
+        await asyncio.sleep(0.3)
+        return True
+
+    reloader._prebuild_in_subprocess = prebuild
+    return reloader
+
+
+def test_only_one_worker_builds_a_changed_csv(sjr_csv: Path):
+    async def scenario():
+        builds = []
+        reloaders = [_worker(sjr_csv, sjr_csv.parent, builds, worker) for worker in range(3)]
+        tasks = [asyncio.create_task(reloader.watch(0.05)) for reloader in reloaders]
+        try:
+            await asyncio.sleep(0.1)
+            write_sjr_csv(sjr_csv, n_journals=320, seed=2)
+            for _ in range(100):
+                if all(reloader.status()["last_reload_at"] for reloader in reloaders):
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return builds, reloaders
+
+    builds, reloaders = asyncio.run(scenario())
+
+    assert len(builds) == 1
+    # Los demás siguieron la marca del que construyó
+    assert all(reloader.status()["last_reload_at"] for reloader in reloaders)
+    expected = dict(SJRFileRepository(str(sjr_csv), use_snapshot=False).iter_entries('sourceid'))
+    assert all(dict(reloader._repository.iter_entries('sourceid')) == expected for reloader in reloaders)
@@ -22,6 +22,7 @@ export interface Publication {
     subject_areas: string[];
     categories_with_quartiles: string[];
     sjr_year_used: number | null;
+    sjr_edition?: string | null;
 }
 
 /**
@@ -153,6 +153,7 @@ const ReportGenerator: React.FC<ReportGeneratorProps> = ({
             subject_areas: p.subject_areas,
             categories_with_quartiles: p.categories_with_quartiles,
             sjr_year_used: p.sjr_year_used,
+            sjr_edition: p.sjr_edition,
           }));
 
           const metadataRequest: SaveReportMetadataRequest = {
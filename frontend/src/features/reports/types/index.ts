@@ -56,6 +56,7 @@ export interface PublicationSnapshot {
     subject_areas?: string[];
     categories_with_quartiles?: string[];
     sjr_year_used?: number | null;
+    sjr_edition?: string | null;
 }
 
 /**